@@ -1,6 +1,15 @@
 # academic_core/admin.py
-from django.contrib import admin
-from .models import Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment
+import io
+
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from .imports import import_students
+from .models import (Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment,
+                     ClassSession, Attendance, Invoice, InvoiceLine, OutboxMessage)
 
 @admin.register(Teacher)
 class TeacherAdmin(admin.ModelAdmin):
@@ -26,11 +35,49 @@ class SubjectAssignmentAdmin(admin.ModelAdmin):
     search_fields = ('assign_id', 'subject__name', 'teacher__first_name', 'teacher__last_name')
     list_filter = ('start_date', 'end_date')
 
+class StudentImportForm(forms.Form):
+    csv_file = forms.FileField(label='CSV file')
+    dry_run = forms.BooleanField(required=False, help_text='Validate only, do not write.')
+    skip_invalid = forms.BooleanField(required=False, help_text='Import valid students even if other rows fail.')
+
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = ('reg_no','first_name','last_name','current_class','phone','email','is_active')
     search_fields = ('reg_no','first_name','last_name','email')
     list_filter = ('current_class','is_active')
+    change_list_template = 'admin/academic_core/student/change_list.html'
+
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view), name='academic_core_student_import'),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        """Bulk CSV upload (see academic_core/imports.py for the column layout)."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        result = None
+        form = StudentImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = io.TextIOWrapper(form.cleaned_data['csv_file'].file, encoding='utf-8-sig', newline='')
+            result = import_students(
+                upload, dry_run=form.cleaned_data['dry_run'], skip_invalid=form.cleaned_data['skip_invalid'],
+            )
+            if result.written:
+                self.message_user(request, f"Imported {result.students} student(s), {result.guardians} guardian(s).")
+            elif not result.errors:
+                self.message_user(request, f"{result.students} student(s) valid, nothing written (dry run).")
+            else:
+                self.message_user(request, f"Nothing imported: {len(result.errors)} error(s).", messages.ERROR)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import students from CSV',
+            'form': form,
+            'result': result,
+        }
+        return TemplateResponse(request, 'admin/academic_core/student/import.html', context)
 
 @admin.register(Guardian)
 class GuardianAdmin(admin.ModelAdmin):
@@ -43,3 +90,36 @@ class EnrollmentAdmin(admin.ModelAdmin):
     search_fields = ('student__reg_no','tuition_class__class_id')
     list_filter = ('active','tuition_class')
 
+@admin.register(ClassSession)
+class ClassSessionAdmin(admin.ModelAdmin):
+    list_display = ('tuition_class','date','start_time','topic','is_closed')
+    search_fields = ('tuition_class__class_id','topic')
+    list_filter = ('is_closed','date')
+    raw_id_fields = ('tuition_class',)
+
+@admin.register(Attendance)
+class AttendanceAdmin(admin.ModelAdmin):
+    list_display = ('session','student','status','marked_at','marked_by')
+    search_fields = ('student__reg_no',)
+    list_filter = ('status',)
+    raw_id_fields = ('session','student','marked_by')
+
+class InvoiceLineInline(admin.TabularInline):
+    model = InvoiceLine
+    extra = 0
+    raw_id_fields = ('enrollment','tuition_class')
+
+@admin.register(Invoice)
+class InvoiceAdmin(admin.ModelAdmin):
+    list_display = ('student','period','due_date','total','status')
+    search_fields = ('student__reg_no',)
+    list_filter = ('status','period')
+    raw_id_fields = ('student',)
+    inlines = [InvoiceLineInline]
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('event','status','attempts','available_at','created_at','sent_at')
+    search_fields = ('event','dedupe_key')
+    list_filter = ('status','event')
+    readonly_fields = ('created_at','sent_at')
@@ -9,5 +9,6 @@ class AcademicCoreConfig(AppConfig):
         # import signals to ensure they are registered
         try:
             import academic_core.signals  # noqa
+            import academic_core.receivers  # noqa
         except Exception:
             pass
@@ -0,0 +1,249 @@
+# academic_core/async_views.py
+"""
+Async read API for dashboards and polling clients (served best under ASGI,
+core/asgi.py, e.g. `uvicorn core.asgi:application`):
+
+    GET /api/async/students/            ?class= ?is_active= ?after= ?page_size= ?count=1
+    GET /api/async/students/<pk>/
+    GET /api/async/classes/             ?active= ?teacher=
+    GET /api/async/classes/<pk>/
+    GET /api/async/enrollments/         ?student= ?tuition_class= ?active=
+    GET /api/async/dashboard/stats/
+    GET /api/async/events/              ?class= (repeatable); text/event-stream, see feed.py
+
+Rows are read with the async ORM (aiterator / acount / aget) and rendered
+by the same compiled plans as the sync list fast path (fastpath.py), so
+each item is byte-identical to /api/v1/ and ?fields= / ?omit= / ?expand=
+work the same. Under ASGI a request waiting on the database is a suspended
+coroutine, not one of a fixed pool of WSGI worker threads, so one process
+serves many more concurrent connections when queries are slow (Django still
+runs each ORM call on a short-lived per-request thread; see load_test_api).
+
+Lists are keyset-paged on the primary key: {"next": url|null, "results": [...]},
+plus "count" with ?count=1. ETag / 304 works as on the sync API.
+"""
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import replace_query_param
+
+from . import conditional, dashboard, fastpath, feed, metrics
+from .fieldsets import related_paths
+from .models import Enrollment, Student, TuitionClass
+from .querybudget import query_budget
+from .serializers import EnrollmentSerializer, StudentSerializer, TuitionClassSerializer
+
+Endpoint = namedtuple('Endpoint', 'model serializer_class filters')
+
+_TRUE, _FALSE = ('1', 'true', 'yes'), ('0', 'false', 'no')
+
+
+def _boolean(value):
+    value = value.lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ValueError('expected true or false')
+
+
+# ?param -> (lookup, parser)
+STUDENTS = Endpoint(Student, StudentSerializer, {
+    'class': ('current_class_id', int),
+    'is_active': ('is_active', _boolean),
+})
+CLASSES = Endpoint(TuitionClass, TuitionClassSerializer, {
+    'active': ('active', _boolean),
+    'teacher': ('class_teacher_id', int),
+})
+ENROLLMENTS = Endpoint(Enrollment, EnrollmentSerializer, {
+    'student': ('student_id', int),
+    'tuition_class': ('tuition_class_id', int),
+    'active': ('active', _boolean),
+})
+
+
+def _invalid(param, value):
+    return ValueError(f"Invalid value for '{param}': {value!r}")
+
+
+def _number(request, param, default, minimum=0):
+    value = request.GET.get(param)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise _invalid(param, value)
+    if number < minimum:
+        raise _invalid(param, value)
+    return number
+
+
+def _page_size(request):
+    default = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 50
+    return min(_number(request, 'page_size', default, minimum=1), getattr(settings, 'API_MAX_PAGE_SIZE', 500))
+
+
+def _filters(request, endpoint):
+    lookups = {}
+    for param, (lookup, parse) in endpoint.filters.items():
+        value = request.GET.get(param)
+        if value not in (None, ''):
+            try:
+                lookups[lookup] = parse(value)
+            except ValueError:
+                raise _invalid(param, value)
+    return lookups
+
+
+def _json(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def _conditional_models(serializer):
+    models = conditional.models_for_serializer(serializer)
+    return models if models.issubset(conditional.TRACKED_MODELS) else None
+
+
+def _serialize(serializer, instances):
+    """The regular serializer, for field sets the fast path cannot compile (worker thread)."""
+    return type(serializer)(instances, many=True, context=serializer.context).data
+
+
+def _planned(serializer, queryset):
+    select, prefetch = related_paths(serializer)
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select:
+        queryset = queryset.select_related(*sorted(select))
+    if prefetch:
+        queryset = queryset.prefetch_related(*sorted(prefetch))
+    return queryset
+
+
+async def _render(serializer, queryset, limit=None):
+    """(rows as the serializer would render them, primary keys) for `queryset[:limit]`."""
+    plan = fastpath.compile(serializer)
+    if plan is None:
+        queryset = _planned(serializer, queryset)
+        if limit is not None:
+            queryset = queryset[:limit]
+        instances = await sync_to_async(list)(queryset)
+        with metrics.timer('serialize'):
+            data = await sync_to_async(_serialize)(serializer, instances)
+        return data, [obj.pk for obj in instances]
+
+    values = plan.values(queryset, extra=('pk',))
+    if limit is not None:
+        values = values[:limit]
+    rows = [row async for row in values.aiterator()]
+    with metrics.timer('serialize'):
+        data = await plan.arender(rows)
+    return data, [row['pk'] for row in rows]
+
+
+async def _list(request, endpoint):
+    try:
+        lookups = _filters(request, endpoint)
+        size = _page_size(request)
+        after = _number(request, 'after', 0)
+    except ValueError as exc:
+        return _json({'detail': str(exc)}, status=400)
+
+    serializer = endpoint.serializer_class(context={'request': request})
+    response, etag, last_modified = await conditional.anot_modified(request, _conditional_models(serializer))
+    if response is not None:
+        return response
+
+    queryset = endpoint.model._default_manager.filter(**lookups).order_by('pk')
+    body = {}
+    if request.GET.get('count') in _TRUE:
+        body['count'] = await queryset.acount()
+    # one row more than the page tells whether there is a next one
+    data, pks = await _render(serializer, queryset.filter(pk__gt=after), limit=size + 1)
+    more = len(data) > size
+    body['next'] = replace_query_param(request.build_absolute_uri(), 'after', pks[size - 1]) if more else None
+    body['results'] = data[:size]
+    return conditional.set_validators(_json(body), etag, last_modified)
+
+
+async def _detail(request, endpoint, pk):
+    serializer = endpoint.serializer_class(context={'request': request})
+    response, etag, last_modified = await conditional.anot_modified(request, _conditional_models(serializer))
+    if response is not None:
+        return response
+
+    plan = fastpath.compile(serializer)
+    queryset = endpoint.model._default_manager.filter(pk=pk)
+    if plan is not None:
+        try:
+            rows = [await plan.values(queryset, extra=('pk',)).aget()]
+        except endpoint.model.DoesNotExist:
+            rows = []
+        data = await plan.arender(rows)
+    else:
+        data, _ = await _render(serializer, queryset)
+    if not data:
+        return _json({'detail': f'No {endpoint.model._meta.object_name} matches the given query.'}, status=404)
+    return conditional.set_validators(_json(data[0]), etag, last_modified)
+
+
+# -----------------------
+# Views
+# -----------------------
+# budgets as on the sync API: session + user + table versions + the page (+ nested lists)
+@query_budget(6)
+async def student_list(request):
+    return await _list(request, STUDENTS)
+
+
+@query_budget(5)
+async def student_detail(request, pk):
+    return await _detail(request, STUDENTS, pk)
+
+
+@query_budget(5)
+async def class_list(request):
+    return await _list(request, CLASSES)
+
+
+@query_budget(4)
+async def class_detail(request, pk):
+    return await _detail(request, CLASSES, pk)
+
+
+@query_budget(6)
+async def enrollment_list(request):
+    return await _list(request, ENROLLMENTS)
+
+
+@query_budget(4)
+async def dashboard_stats(request):
+    """Async twin of templates_views.dashboard_stats."""
+    stats = await dashboard.astats()
+    return JsonResponse({**stats, 'charts': dashboard.chart_data(stats)})
+
+
+async def event_stream(request):
+    """Server-Sent Events feed of changes (feed.py), optionally for some classes only."""
+    if not isinstance(request, ASGIRequest):
+        # a WSGI worker would buffer the endless stream
+        return _json({'detail': 'The event stream is served under ASGI (core/asgi.py) only.'}, status=501)
+    try:
+        classes = frozenset(int(value) for value in request.GET.getlist('class') if value) or None
+    except ValueError:
+        return _json({'detail': "Invalid value for 'class'."}, status=400)
+
+    if feed.broker.full():
+        response = _json({'detail': 'Too many open event streams; retry later.'}, status=503)
+        response['Retry-After'] = '30'
+        return response
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    response = StreamingHttpResponse(feed.stream(classes, last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: pass frames through unbuffered
+    return response
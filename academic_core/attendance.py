@@ -0,0 +1,116 @@
+# academic_core/attendance.py
+"""
+Card-marking service.
+
+Scans arrive in batches (a card reader buffers taps and posts them together),
+so everything here is set-based: one lookup for students, one for
+enrollments, one upsert for the attendance rows and one outbox event per batch.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance, Enrollment, Student
+from .outbox import enqueue
+from .conditional import bump
+from . import caching
+
+
+def record_scans(session, scans, marked_by=None):
+    """
+    Upsert attendance for a batch of card scans.
+
+    `scans` is an iterable of dicts: {'reg_no', 'status'?, 'scanned_at'?}.
+    Repeated taps of the same card within a batch keep the earliest scan; a
+    later batch overwrites the student's row (so a corrected status can be
+    re-sent). Returns
+    (recorded_student_ids, rejected) where rejected is a list of
+    {'reg_no', 'error'} dicts for unknown or not-enrolled cards.
+    """
+    now = timezone.now()
+    by_reg_no = {}
+    for scan in scans:
+        reg_no = scan['reg_no']
+        scanned_at = scan.get('scanned_at') or now
+        prev = by_reg_no.get(reg_no)
+        if prev is None or scanned_at < prev['scanned_at']:
+            by_reg_no[reg_no] = {'status': scan.get('status') or 'present', 'scanned_at': scanned_at}
+
+    if not by_reg_no:
+        return [], []
+
+    student_ids = dict(
+        Student.objects.filter(reg_no__in=by_reg_no.keys()).values_list('reg_no', 'pk')
+    )
+    enrolled = set(
+        Enrollment.objects.filter(
+            tuition_class_id=session.tuition_class_id,
+            active=True,
+            student_id__in=student_ids.values(),
+        ).values_list('student_id', flat=True)
+    )
+
+    rows = []
+    rejected = []
+    for reg_no, scan in by_reg_no.items():
+        student_id = student_ids.get(reg_no)
+        if student_id is None:
+            rejected.append({'reg_no': reg_no, 'error': 'unknown student'})
+        elif student_id not in enrolled:
+            rejected.append({'reg_no': reg_no, 'error': 'not enrolled in this class'})
+        else:
+            rows.append(Attendance(
+                session=session,
+                student_id=student_id,
+                status=scan['status'],
+                marked_at=scan['scanned_at'],
+                marked_by=marked_by,
+            ))
+
+    recorded = [row.student_id for row in rows]
+    if rows:
+        with transaction.atomic():
+            Attendance.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['session', 'student'],
+                update_fields=['status', 'marked_at', 'marked_by'],
+            )
+            enqueue('attendance_recorded', session_id=session.pk, student_ids=recorded)
+            bump(Attendance)
+            caching.invalidate(Attendance)
+    return recorded, rejected
+
+
+def close_session(session, marked_by=None):
+    """
+    Close a session: every actively enrolled student without a mark is
+    recorded as absent in one insert, and a single attendance_alert is queued
+    for the batch. Returns the ids of students marked absent.
+    """
+    marked = Attendance.objects.filter(session=session).values('student_id')
+    absent_ids = list(
+        Enrollment.objects.filter(tuition_class_id=session.tuition_class_id, active=True)
+        .exclude(student_id__in=marked)
+        .values_list('student_id', flat=True)
+        .distinct()
+    )
+    now = timezone.now()
+    with transaction.atomic():
+        Attendance.objects.bulk_create(
+            [Attendance(session=session, student_id=sid, status='absent', marked_at=now, marked_by=marked_by)
+             for sid in absent_ids],
+            ignore_conflicts=True,
+        )
+        bump(Attendance)
+        caching.invalidate(Attendance)
+        session.is_closed = True
+        session.save(update_fields=['is_closed'])
+        if absent_ids:
+            enqueue(
+                'attendance_alert',
+                dedupe_key=f'attendance_alert:{session.pk}',
+                session_id=session.pk,
+                student_ids=absent_ids,
+                status='absent',
+            )
+    return absent_ids
@@ -0,0 +1,229 @@
+# academic_core/benchmarks.py
+"""
+Repeatable request benchmarks for the hot paths, run in-process through the
+Django test client against whatever database is configured (normally one
+filled by seed_synthetic_school):
+
+- the student list page (plain, filtered, searched, the last page) and detail page
+- every /api/v1/* list endpoint, and /api/v1/search/
+- teacher and class delete-with-reassign, student create with guardians
+
+Each case is run `warmup` times untimed, then `repeat` times; the result
+keeps min / median / p95 / max wall time, the query count and response
+size. The whole run is one transaction that is rolled back at the end, and
+every write case runs in a savepoint rolled back after each repetition, so
+the database is unchanged and runs are comparable. Commit cost (fsync) is
+therefore not part of the write timings.
+
+Results are plain dicts, saved as JSON by run_benchmarks --json and
+compared with compare().
+"""
+import fnmatch
+import statistics
+import subprocess
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from .models import (
+    Attendance, ClassSession, Enrollment, Guardian, Student, Subject, SubjectAssignment, Teacher, TuitionClass,
+)
+from .querybudget import QueryRecorder
+
+Case = namedtuple('Case', 'name method path data expect')
+
+API_LISTS = ('teachers', 'classes', 'subjects', 'subject-assignments', 'students', 'guardians',
+             'enrollments', 'sessions', 'attendance')
+
+COUNTED_MODELS = (Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment,
+                  ClassSession, Attendance)
+
+
+class BenchmarkError(RuntimeError):
+    pass
+
+
+def _middle(qs):
+    """The row halfway through `qs` by pk: a stable pick for a given dataset."""
+    count = qs.count()
+    return qs.order_by('pk')[count // 2] if count else None
+
+
+def _student_create_data(tuition_class):
+    data = {
+        'reg_no': '', 'first_name': 'Bench', 'last_name': 'Mark', 'joined_date': '2026-01-05',
+        'gender': 'female', 'current_class': tuition_class.pk if tuition_class else '',
+        'phone': '0771234567', 'is_active': 'on',
+        'guardians-TOTAL_FORMS': '2', 'guardians-INITIAL_FORMS': '0',
+        'guardians-MIN_NUM_FORMS': '0', 'guardians-MAX_NUM_FORMS': '1000',
+    }
+    for i, (name, relationship) in enumerate((('Nimali Mark', 'mother'), ('Sunil Mark', 'father'))):
+        data.update({
+            f'guardians-{i}-name': name, f'guardians-{i}-relationship': relationship,
+            f'guardians-{i}-phone': f'07712345{i}0', f'guardians-{i}-is_primary': 'on' if i == 0 else '',
+        })
+    return data
+
+
+def default_cases():
+    """The standard suite, with sample rows picked deterministically from the current data."""
+    student = _middle(Student.objects.all())
+    active_class = _middle(TuitionClass.objects.filter(active=True))
+    if student is None or active_class is None:
+        raise BenchmarkError('No students / classes to benchmark; run seed_synthetic_school first.')
+
+    student_list = reverse('academic_core:student_list')
+    cases = [
+        Case('student_list', 'get', student_list, None, 200),
+        Case('student_list_filtered', 'get', f'{student_list}?class={active_class.pk}&is_active=True', None, 200),
+        Case('student_list_search', 'get', f"{student_list}?{urlencode({'q': student.last_name[:4]})}", None, 200),
+        Case('student_list_sorted_last_page', 'get', f'{student_list}?sort=name&page=last', None, 200),
+        Case('student_detail', 'get', reverse('academic_core:student_detail', args=[student.pk]), None, 200),
+    ]
+    cases += [Case(f'api_{name.replace("-", "_")}_list', 'get', f'/api/v1/{name}/', None, 200) for name in API_LISTS]
+    cases += [
+        Case('search_name', 'get',
+             '/api/v1/search/?' + urlencode({'q': f'{student.first_name} {student.last_name[:3]}'}), None, 200),
+        Case('search_reg_no', 'get', '/api/v1/search/?' + urlencode({'q': student.reg_no}), None, 200),
+    ]
+
+    # writes: the busiest teacher, and the sampled class, moved onto another row. Assignments
+    # only go to a teacher sharing no subject (unique_subject_teacher); otherwise they cascade.
+    teacher = Teacher.objects.annotate(n=Count('tuition_classes')).order_by('-n', 'pk').first()
+    others = Teacher.objects.exclude(pk=teacher.pk).order_by('pk') if teacher else Teacher.objects.none()
+    target = others.first()
+    if target:
+        data = {'reassign_classes_to': target.pk}
+        free = others.exclude(assignments__subject__in=teacher.assignments.values('subject')).first()
+        if free:
+            data['reassign_assignments_to'] = free.pk
+        cases.append(Case('teacher_delete_reassign', 'post',
+                          reverse('academic_core:teacher_delete', args=[teacher.pk]), data, 302))
+    target_class = TuitionClass.objects.exclude(pk=active_class.pk).order_by('pk').first()
+    if target_class:
+        cases.append(Case('class_delete_reassign', 'post',
+                          reverse('academic_core:class_delete', args=[active_class.pk]),
+                          {'reassign_to': target_class.pk}, 302))
+    cases.append(Case('student_create_with_guardians', 'post', reverse('academic_core:student_create'),
+                      _student_create_data(active_class), 302))
+    return cases
+
+
+def select(cases, patterns):
+    """Cases whose name matches any of the shell-style `patterns` (all when empty)."""
+    if not patterns:
+        return cases
+    return [c for c in cases if any(fnmatch.fnmatch(c.name, p) for p in patterns)]
+
+
+# -----------------------
+# Running
+# -----------------------
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _request(client, case):
+    if case.method == 'post':
+        # a savepoint per write, rolled back so the next repetition sees the same data
+        with transaction.atomic():
+            response = client.post(case.path, case.data)
+            transaction.set_rollback(True)
+        return response
+    return client.get(case.path)
+
+
+def run_case(client, case, repeat, warmup, cold=False):
+    for _ in range(warmup):
+        _request(client, case)
+    walls, queries = [], []
+    for _ in range(repeat):
+        if cold:
+            cache.clear()
+        with QueryRecorder() as recorder:
+            started = time.perf_counter()
+            response = _request(client, case)
+            walls.append(time.perf_counter() - started)
+        queries.append(len(recorder.queries))
+        if response.status_code != case.expect:
+            raise BenchmarkError(f'{case.name}: {case.method.upper()} {case.path} returned '
+                                 f'{response.status_code}, expected {case.expect}')
+    walls.sort()
+    return {
+        'method': case.method.upper(),
+        'path': case.path,
+        'status': response.status_code,
+        'min_ms': walls[0] * 1000,
+        'median_ms': statistics.median(walls) * 1000,
+        'p95_ms': _percentile(walls, 0.95) * 1000,
+        'max_ms': walls[-1] * 1000,
+        'queries': max(queries),
+        'bytes': len(response.content),
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                             capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(cases=None, repeat=10, warmup=2, cold=False, label='', progress=None):
+    """
+    Run `cases` (default_cases() by default) as an admin user; returns the
+    JSON-able result. `progress(name, result)` is called after each case.
+    """
+    report = progress or (lambda name, result: None)
+    results = {}
+    started = datetime.now(timezone.utc)
+    # 'testserver' is the test client's host; query budgets off as in production.
+    # The user, its session and all writes are rolled back.
+    with override_settings(ALLOWED_HOSTS=['testserver'], QUERY_BUDGET_MODE='off'), transaction.atomic():
+        if cases is None:
+            cases = default_cases()
+        User = get_user_model()
+        admin = User.objects.create_user('benchmark-admin', password=None, role=User.ROLE_ADMIN)
+        client = Client()
+        client.force_login(admin)
+        counts = {model._meta.model_name: model.objects.count() for model in COUNTED_MODELS}
+        for case in cases:
+            results[case.name] = run_case(client, case, repeat, warmup, cold)
+            report(case.name, results[case.name])
+        transaction.set_rollback(True)
+
+    return {
+        'label': label,
+        'commit': _git_commit(),
+        'started_at': started.isoformat(timespec='seconds'),
+        'vendor': connection.vendor,
+        'repeat': repeat,
+        'warmup': warmup,
+        'cold_cache': cold,
+        'counts': counts,
+        'cases': results,
+    }
+
+
+def compare(current, baseline):
+    """[(case, baseline median, current median, ratio, baseline queries, current queries)] for shared cases."""
+    rows = []
+    for name, now in current['cases'].items():
+        before = baseline.get('cases', {}).get(name)
+        if before is None:
+            continue
+        ratio = now['median_ms'] / before['median_ms'] if before['median_ms'] else None
+        rows.append((name, before['median_ms'], now['median_ms'], ratio, before['queries'], now['queries']))
+    return rows
@@ -0,0 +1,183 @@
+# academic_core/billing.py
+"""
+Fee billing engine.
+
+Charges for a month are computed in a few set-based passes:
+  1. one query for every billable enrollment together with its class fee rules
+  2. one aggregate query for attended sessions (per_session classes)
+  3. Decimal arithmetic in Python over those rows
+  4. bulk upsert of Invoice headers + bulk insert of InvoiceLine rows
+
+Re-running a period is safe: open invoices for the period are rebuilt,
+paid / void invoices are left untouched. Enrollments are picked by their
+dates, not today's flags, so closing an enrollment (promote_students) or
+deactivating a student later does not change an earlier month's charges.
+Deactivating a student closes their open enrollments (signals.py), so the
+months after they left are not billed.
+
+Fee rules (TuitionClass.fee_type):
+- per_session : per_session_fee x sessions attended (present/late) in the month
+- monthly     : monthly_fee once per month
+- term        : monthly_fee field holds the term amount, billed in the months
+                listed in settings.BILLING_TERM_START_MONTHS
+Enrollment.fee_override replaces the unit price for any fee type.
+"""
+import calendar
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Attendance, Enrollment, Invoice, InvoiceLine
+from . import caching
+from .outbox import enqueue, payload_key
+
+CENT = Decimal('0.01')
+
+Charge = namedtuple('Charge', [
+    'student_id', 'enrollment_id', 'tuition_class_id', 'class_code',
+    'fee_type', 'quantity', 'unit_price', 'amount',
+])
+
+
+def month_bounds(period):
+    """Return (first_day, last_day) of the month containing `period`."""
+    start = period.replace(day=1)
+    end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    return start, end
+
+
+def _term_start_months():
+    return set(getattr(settings, 'BILLING_TERM_START_MONTHS', (1, 5, 9)))
+
+
+def compute_charges(period):
+    """
+    Compute (without writing) every charge for the month containing `period`.
+    Returns a list of Charge tuples; zero-amount charges are dropped.
+    """
+    start, end = month_bounds(period)
+
+    rows = (
+        # an inactive enrollment without an end_date has no known span: not billed
+        Enrollment.objects.filter(start_date__lte=end)
+        .filter(Q(end_date__gte=start) | Q(end_date__isnull=True, active=True))
+        .values_list(
+            'pk', 'student_id', 'tuition_class_id', 'fee_override',
+            'tuition_class__class_id', 'tuition_class__fee_type',
+            'tuition_class__per_session_fee', 'tuition_class__monthly_fee',
+        )
+        .order_by('student_id', 'tuition_class_id')
+    )
+
+    attended = {
+        (r['session__tuition_class_id'], r['student_id']): r['n']
+        for r in Attendance.objects.filter(
+            session__date__range=(start, end), status__in=('present', 'late')
+        ).values('session__tuition_class_id', 'student_id').annotate(n=Count('pk')).order_by()
+    }
+
+    term_month = start.month in _term_start_months()
+    charges = []
+    for (enrollment_id, student_id, class_pk, override, class_code,
+         fee_type, per_session_fee, monthly_fee) in rows:
+        if fee_type == 'per_session':
+            quantity = attended.get((class_pk, student_id), 0)
+            unit = per_session_fee
+        elif fee_type == 'monthly':
+            quantity = 1
+            unit = monthly_fee
+        elif fee_type == 'term':
+            quantity = 1 if term_month else 0
+            unit = monthly_fee
+        else:
+            continue
+        if override is not None:
+            unit = override
+        amount = (unit * quantity).quantize(CENT, rounding=ROUND_HALF_UP)
+        if amount <= 0:
+            continue
+        charges.append(Charge(student_id, enrollment_id, class_pk, class_code,
+                              fee_type, quantity, unit, amount))
+    return charges
+
+
+def _describe(charge):
+    if charge.fee_type == 'per_session':
+        return f"{charge.class_code} - {charge.quantity} session(s)"
+    if charge.fee_type == 'term':
+        return f"{charge.class_code} - term fee"
+    return f"{charge.class_code} - monthly fee"
+
+
+def generate_invoices(period, dry_run=False, batch_size=1000):
+    """
+    Build (or rebuild) the open invoices for the month containing `period`.
+    Returns a summary dict: period, invoices, lines, total, skipped_locked.
+    One fee_due event is queued for the whole run (deduplicated, so an
+    identical re-run does not notify twice).
+    """
+    start, _ = month_bounds(period)
+    due_date = start + timedelta(days=getattr(settings, 'BILLING_DUE_DAYS', 10))
+
+    with transaction.atomic():
+        locked = set(
+            Invoice.objects.filter(period=start).exclude(status='open')
+            .values_list('student_id', flat=True)
+        )
+        charges = [c for c in compute_charges(start) if c.student_id not in locked]
+
+        totals = defaultdict(Decimal)
+        for c in charges:
+            totals[c.student_id] += c.amount
+
+        summary = {
+            'period': start,
+            'invoices': len(totals),
+            'lines': len(charges),
+            'total': sum(totals.values(), Decimal('0.00')),
+            'skipped_locked': len(locked),
+        }
+        if dry_run:
+            return summary
+
+        # rebuild: drop lines of open invoices, and open invoices that no longer bill anything
+        InvoiceLine.objects.filter(invoice__period=start, invoice__status='open').delete()
+        existing = Invoice.objects.filter(period=start, status='open').values_list('student_id', 'pk')
+        stale = [pk for student_id, pk in existing if student_id not in totals]
+        for i in range(0, len(stale), batch_size):
+            Invoice.objects.filter(pk__in=stale[i:i + batch_size]).delete()
+
+        Invoice.objects.bulk_create(
+            [Invoice(student_id=sid, period=start, due_date=due_date, total=total)
+             for sid, total in totals.items()],
+            update_conflicts=True,
+            unique_fields=['student', 'period'],
+            update_fields=['total', 'due_date'],
+            batch_size=batch_size,
+        )
+        invoice_ids = dict(
+            Invoice.objects.filter(period=start, status='open').values_list('student_id', 'pk')
+        )
+        InvoiceLine.objects.bulk_create(
+            [InvoiceLine(
+                invoice_id=invoice_ids[c.student_id],
+                enrollment_id=c.enrollment_id,
+                tuition_class_id=c.tuition_class_id,
+                description=_describe(c),
+                fee_type=c.fee_type,
+                quantity=c.quantity,
+                unit_price=c.unit_price,
+                amount=c.amount,
+            ) for c in charges],
+            batch_size=batch_size,
+        )
+        caching.invalidate(Invoice, InvoiceLine)
+
+        if invoice_ids:
+            payload = {'period': start, 'due_date': due_date, 'invoice_ids': sorted(invoice_ids.values())}
+            enqueue('fee_due', dedupe_key=payload_key('fee_due', **payload), **payload)
+    return summary
@@ -0,0 +1,255 @@
+# academic_core/bulk.py
+"""
+Batch create / update / delete for the DRF API (BulkMixin):
+
+    POST   /api/v1/<resource>/bulk/   [{...}, ...]            -> 201 {"results": [...]}
+    PATCH  /api/v1/<resource>/bulk/   [{"id": 1, ...}, ...]   -> 200 {"results": [...]}
+    DELETE /api/v1/<resource>/bulk/   [1, 2, ...]             -> 200 {"deleted": 2}
+
+A batch is validated in one pass, like imports.py: each item against the
+viewset's flat bulk serializer (foreign keys as ids, no per-item queries),
+then every referenced row with one in_bulk() per related model, the rows
+being updated / deleted with one more, and unique_together with one query
+per constraint. Creates and updates are written with bulk_create /
+bulk_update in a single transaction, so a batch costs a fixed number of
+queries whatever its size. Deletes go through queryset.delete() in one
+transaction, so cascades and post_delete receivers run as for single deletes.
+
+Nothing is written if any item is invalid: the 400 response lists
+{"index", "errors"} for each bad item, errors shaped as on the single-object
+endpoints. With ?skip_invalid=1 the valid items are written and the invalid
+ones reported next to the results. At most API_BULK_MAX_ITEMS per request.
+
+bulk_create / bulk_update skip post_save, so table versions, cache
+generations, the search index and the live feed are refreshed here.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from . import caching, feed, search
+from .conditional import bump
+from .models import Guardian
+
+NOT_FOUND = 'Not found.'
+MISSING_ID = 'This field is required.'
+DOES_NOT_EXIST = 'Invalid pk "{pk}" - object does not exist.'
+
+
+def _max_items():
+    return getattr(settings, 'API_BULK_MAX_ITEMS', 500)
+
+
+def _truthy(value):
+    return (value or '').lower() in ('1', 'true', 'yes')
+
+
+def _check_batch(items):
+    """None if `items` is an acceptable batch, else the 400 message."""
+    if not isinstance(items, list):
+        return 'Expected a list of items.'
+    if not items:
+        return 'Expected a non-empty list of items.'
+    if len(items) > _max_items():
+        return f'At most {_max_items()} items per request.'
+    return None
+
+
+def _item_id(item):
+    value = item.get('id') if isinstance(item, dict) else item
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+class Batch:
+    """Per-item validation state: the objects to write and the errors, both by index."""
+
+    def __init__(self):
+        self.objects = {}
+        self.errors = {}
+
+    def fail(self, index, errors):
+        self.objects.pop(index, None)
+        self.errors.setdefault(index, {}).update(errors)
+
+    def error_list(self):
+        return [{'index': i, 'errors': self.errors[i]} for i in sorted(self.errors)]
+
+
+def _resolve_relations(batch, relations, validated):
+    """Check every referenced id exists, with one in_bulk() per related model."""
+    for field_name, (attname, model) in relations.items():
+        ids = {data[attname] for data in validated.values() if attname in data}
+        found = model._default_manager.in_bulk(ids) if ids else {}
+        for index, data in validated.items():
+            pk = data.get(attname)
+            if attname in data and pk not in found:
+                batch.fail(index, {field_name: [DOES_NOT_EXIST.format(pk=pk)]})
+
+
+def _unique_key(obj, fields):
+    return tuple(field.to_python(getattr(obj, field.attname)) for field in fields)
+
+
+def _check_unique(batch, model):
+    """unique_together within the batch and against the table (one query per constraint)."""
+    for names in model._meta.unique_together:
+        fields = [model._meta.get_field(name) for name in names]
+        keys = {index: _unique_key(obj, fields) for index, obj in batch.objects.items()}
+        if not keys:
+            continue
+        existing = set(
+            model._default_manager
+            .filter(**{f'{f.attname}__in': {key[i] for key in keys.values()} for i, f in enumerate(fields)})
+            .exclude(pk__in=[obj.pk for obj in batch.objects.values() if obj.pk is not None])
+            .values_list(*[f.attname for f in fields])
+        )
+        existing = {tuple(f.to_python(v) for f, v in zip(fields, row)) for row in existing}
+        message = f"The fields {', '.join(names)} must make a unique set."
+        seen = set()
+        for index in sorted(keys):
+            if keys[index] in existing or keys[index] in seen:
+                batch.fail(index, {'non_field_errors': [message]})
+            seen.add(keys[index])
+
+
+def _refresh(model, objects, event):
+    bump(model)
+    caching.invalidate(model)
+    if model is Guardian:
+        search.index_students({obj.student_id for obj in objects})
+    if model in feed.MODEL_EVENTS:
+        for obj in objects:
+            feed.model_changed(obj, event)
+
+
+class BulkMixin:
+    """
+    Adds the bulk/ action (see module docstring). Set `bulk_serializer_class`
+    (flat, FK ids through `source='<fk>_id'`); its foreign keys are found from
+    the model and resolved in bulk.
+    """
+    bulk_serializer_class = None
+
+    def _bulk_relations(self):
+        """{serializer field: (attname, related model)} for the FK fields of the bulk serializer."""
+        model = self.bulk_serializer_class.Meta.model
+        relations = {}
+        for name, field in self.bulk_serializer_class().fields.items():
+            if field.read_only or not field.source.endswith('_id'):
+                continue
+            model_field = model._meta.get_field(field.source[:-3])
+            if model_field.is_relation:
+                relations[name] = (field.source, model_field.related_model)
+        return relations
+
+    def _bulk_response(self, batch, written, status_code):
+        if batch.errors and not written:
+            return Response({'errors': batch.error_list()}, status=status.HTTP_400_BAD_REQUEST)
+        body = {'results': self.bulk_serializer_class(written, many=True).data}
+        if batch.errors:
+            body['errors'] = batch.error_list()
+        return Response(body, status=status_code)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        problem = _check_batch(request.data)
+        if problem:
+            return Response({'detail': problem}, status=status.HTTP_400_BAD_REQUEST)
+        handler = {'post': self.bulk_create, 'patch': self.bulk_update, 'delete': self.bulk_destroy}
+        return handler[request.method.lower()](request.data, _truthy(request.query_params.get('skip_invalid')))
+
+    def _validate_items(self, batch, items, instances=None):
+        """Validated data by index; with `instances`, items are partial updates of those rows."""
+        validated = {}
+        for index, item in enumerate(items):
+            if instances is not None and _item_id(item) is None:
+                batch.fail(index, {'id': [MISSING_ID]})
+                continue
+            if instances is not None and _item_id(item) not in instances:
+                batch.fail(index, {'id': [NOT_FOUND]})
+                continue
+            serializer = self.bulk_serializer_class(data=item, partial=instances is not None)
+            if serializer.is_valid():
+                validated[index] = serializer.validated_data
+            else:
+                batch.fail(index, serializer.errors)
+        _resolve_relations(batch, self._bulk_relations(), validated)
+        return {index: data for index, data in validated.items() if index not in batch.errors}
+
+    def bulk_create(self, items, skip_invalid=False):
+        model = self.bulk_serializer_class.Meta.model
+        batch = Batch()
+        for index, data in self._validate_items(batch, items).items():
+            batch.objects[index] = model(**data)
+        _check_unique(batch, model)
+        if batch.errors and not skip_invalid:
+            return self._bulk_response(batch, [], status.HTTP_201_CREATED)
+
+        objects = [batch.objects[i] for i in sorted(batch.objects)]
+        if objects:
+            with transaction.atomic():
+                model._default_manager.bulk_create(objects)
+                _refresh(model, objects, 'created')
+        return self._bulk_response(batch, objects, status.HTTP_201_CREATED)
+
+    def bulk_update(self, items, skip_invalid=False):
+        model = self.bulk_serializer_class.Meta.model
+        batch = Batch()
+        instances = model._default_manager.in_bulk({_item_id(item) for item in items} - {None})
+        validated = self._validate_items(batch, items, instances)
+        updated = set()
+        changed = set()
+        for index, data in validated.items():
+            pk = _item_id(items[index])
+            if pk in updated:
+                batch.fail(index, {'id': ['Given more than once.']})
+                continue
+            updated.add(pk)
+            obj = instances[pk]
+            for attname, value in data.items():
+                setattr(obj, attname, value)
+            changed.update(data)
+            batch.objects[index] = obj
+        _check_unique(batch, model)
+        if batch.errors and not skip_invalid:
+            return self._bulk_response(batch, [], status.HTTP_200_OK)
+
+        objects = [batch.objects[i] for i in sorted(batch.objects)]
+        # bulk_update skips auto_now
+        now = timezone.now()
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                changed.add(field.attname)
+                for obj in objects:
+                    setattr(obj, field.attname, now)
+        if objects and changed:
+            with transaction.atomic():
+                model._default_manager.bulk_update(objects, sorted(changed))
+                _refresh(model, objects, 'updated')
+        return self._bulk_response(batch, objects, status.HTTP_200_OK)
+
+    def bulk_destroy(self, items, skip_invalid=False):
+        model = self.bulk_serializer_class.Meta.model
+        batch = Batch()
+        found = model._default_manager.in_bulk({_item_id(item) for item in items} - {None})
+        pks = []
+        for index, item in enumerate(items):
+            pk = _item_id(item)
+            if pk is None:
+                batch.fail(index, {'id': ['A valid integer is required.']})
+            elif pk not in found:
+                batch.fail(index, {'id': [NOT_FOUND]})
+            elif pk not in pks:
+                pks.append(pk)
+        if batch.errors and (not skip_invalid or not pks):
+            return Response({'errors': batch.error_list()}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic(), search.batched_removals():
+            _, per_model = model._default_manager.filter(pk__in=pks).delete()
+        body = {'deleted': per_model.get(model._meta.label, 0)}
+        if batch.errors:
+            body['errors'] = batch.error_list()
+        return Response(body, status=status.HTTP_200_OK)
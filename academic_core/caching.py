@@ -0,0 +1,170 @@
+# academic_core/caching.py
+"""
+Cache helpers on top of the default Django cache (settings.CACHES).
+
+Keys are versioned per model instead of being deleted one by one: every
+model has a generation number in the cache, and a key built from a set of
+models embeds their current generations. Bumping a model's generation
+(invalidate()) makes every key that depends on it unreachable at once; the
+stale entries simply age out.
+
+    key = versioned_key('class-options', TuitionClass, Teacher)
+
+    @cached_queryset(TuitionClass)
+    def active_classes():
+        return TuitionClass.objects.filter(active=True)   # cached as a list
+
+    @cached_fragment(Student, Enrollment)
+    def roster_html(class_pk):
+        return render_to_string(...)
+
+In templates: {% load caching %}{% cache_version 'academic_core.Student' as v %}
+{% cache 600 roster cls.pk v %}...{% endcache %}
+
+signals.py calls invalidate() for every academic_core model on
+post_save / post_delete; code writing with bulk_create / queryset.update()
+calls it itself. Generations live in the cache, so with the per-process
+'locmem' backend an invalidation is only seen by the worker that made it:
+multi-worker deployments should use the shared 'file' or 'db' backend
+(DJANGO_CACHE_BACKEND, see core/settings.py).
+"""
+import functools
+import hashlib
+import time
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+
+KEY_PREFIX = 'academic_core'
+
+
+def _label(model):
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    return model._meta.label_lower
+
+
+def _version_key(label):
+    return f'{KEY_PREFIX}:gen:{label}'
+
+
+def _fresh_generation():
+    # a lost generation (eviction, cache restart) must never restart at a
+    # number an older entry was stored under, so start from the clock
+    return time.time_ns() // 1000
+
+
+# -----------------------
+# Generations
+# -----------------------
+def versions(*models):
+    """{label: generation} for `models`, in one cache round trip."""
+    labels = sorted({_label(m) for m in models})
+    keys = {_version_key(label): label for label in labels}
+    found = cache.get_many(list(keys))
+    missing = {key: _fresh_generation() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {label: found[key] for key, label in keys.items()}
+
+
+async def aversions(*models):
+    """versions() for async views (cache.aget_many / aset_many)."""
+    labels = sorted({_label(m) for m in models})
+    keys = {_version_key(label): label for label in labels}
+    found = await cache.aget_many(list(keys))
+    missing = {key: _fresh_generation() for key in keys if key not in found}
+    if missing:
+        await cache.aset_many(missing, None)
+        found.update(missing)
+    return {label: found[key] for key, label in keys.items()}
+
+
+def _invalidate_now(labels):
+    for label in labels:
+        key = _version_key(label)
+        try:
+            cache.incr(key)
+        except ValueError:  # not in the cache
+            cache.set(key, _fresh_generation(), None)
+
+
+def invalidate(*models):
+    """Retire every cached value built from `models` once the transaction commits."""
+    labels = sorted({_label(m) for m in models})
+    transaction.on_commit(lambda: _invalidate_now(labels))
+
+
+def _key(name, generations, parts):
+    generation = '.'.join(str(v) for _, v in sorted(generations.items()))
+    key = f'{KEY_PREFIX}:{name}:{generation}'
+    if parts:
+        key += ':' + hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+    return key
+
+
+def versioned_key(name, *models, parts=()):
+    """Cache key for `name` (+ `parts`) that changes whenever one of `models` is written."""
+    return _key(name, versions(*models), parts)
+
+
+def get_or_set(name, models, compute, parts=(), timeout=None):
+    """cache.get_or_set() under a versioned key; `timeout` None uses the CACHES default."""
+    key = versioned_key(name, *models, parts=parts)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        if timeout is None:
+            cache.set(key, value)
+        else:
+            cache.set(key, value, timeout)
+    return value
+
+
+async def aget_or_set(name, models, compute, parts=(), timeout=None):
+    """get_or_set() for async views; `compute` is a coroutine function."""
+    key = _key(name, await aversions(*models), parts)
+    value = await cache.aget(key)
+    if value is None:
+        value = await compute()
+        if timeout is None:
+            await cache.aset(key, value)
+        else:
+            await cache.aset(key, value, timeout)
+    return value
+
+
+# -----------------------
+# Decorators
+# -----------------------
+def _cached(models, timeout, name, convert):
+    def decorator(func):
+        key_name = name or f'{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_or_set(
+                key_name, models,
+                lambda: convert(func(*args, **kwargs)),
+                parts=(args, sorted(kwargs.items())),
+                timeout=timeout,
+            )
+        wrapper.cache_key = lambda *args, **kwargs: versioned_key(
+            key_name, *models, parts=(args, sorted(kwargs.items())))
+        return wrapper
+    return decorator
+
+
+def cached_queryset(*models, timeout=None, name=None):
+    """
+    Cache the rows of the queryset (or any iterable) the function returns as
+    a list. Arguments are part of the key, so they must have a stable repr().
+    """
+    return _cached(models, timeout, name, list)
+
+
+def cached_fragment(*models, timeout=None, name=None):
+    """Cache the rendered string the function returns."""
+    return _cached(models, timeout, name, str)
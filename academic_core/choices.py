@@ -0,0 +1,123 @@
+# academic_core/choices.py
+"""
+Cached choice lists for ModelChoiceField dropdowns.
+
+A default ModelChoiceField queries and instantiates every row each time
+its <select> is rendered. A ChoiceProvider keeps the (pk, label) tuples in
+the cache under a key versioned on its models (caching.py), so a form
+renders its dropdowns without touching the database until one of those
+tables is written:
+
+    class StudentForm(CachedChoicesMixin, forms.ModelForm):
+        cached_choice_fields = {'current_class': CLASS_CHOICES}
+
+Labels are str(obj), exactly what ModelChoiceField shows. Validation is
+unchanged: a submitted pk is still looked up in the field's queryset.
+Sets too large for one <select> (students) use StudentAutocompleteWidget,
+which renders only the selected row and searches /api/v1/search/ as you type.
+"""
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+from django.urls import reverse
+
+from . import caching
+from .models import Student, Subject, Teacher, TuitionClass
+
+
+class ChoiceProvider:
+    """
+    (pk, label) tuples for `queryset`, cached until one of `models` changes
+    (default: the queryset's model; add any model the labels read).
+    """
+
+    def __init__(self, name, queryset, models=None):
+        self.name = name
+        self.queryset = queryset
+        self.models = tuple(models or (queryset.model,))
+
+    def _load(self):
+        return [(obj.pk, str(obj)) for obj in self.queryset.all()]
+
+    def choices(self):
+        return caching.get_or_set(f'choices:{self.name}', self.models, self._load)
+
+
+TEACHER_CHOICES = ChoiceProvider('teachers', Teacher.objects.all())
+CLASS_CHOICES = ChoiceProvider('classes', TuitionClass.objects.all())
+SUBJECT_CHOICES = ChoiceProvider('subjects', Subject.objects.all())
+USER_CHOICES = ChoiceProvider('users', get_user_model().objects.order_by('username'))
+
+
+class CachedChoiceIterator(ModelChoiceIterator):
+    """ModelChoiceIterator that reads a ChoiceProvider instead of the queryset."""
+
+    def __init__(self, field, provider):
+        super().__init__(field)
+        self.provider = provider
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from self.provider.choices()
+
+    def __len__(self):
+        return len(self.provider.choices()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.provider.choices())
+
+
+class CachedChoicesMixin:
+    """
+    ModelForm mixin: `cached_choice_fields` maps a ModelChoiceField name to
+    the ChoiceProvider that renders its options.
+    """
+    cached_choice_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, provider in self.cached_choice_fields.items():
+            field = self.fields.get(name)
+            if field is None:
+                continue
+            field.iterator = lambda f, provider=provider: CachedChoiceIterator(f, provider)
+            field.widget.choices = field.choices
+
+
+# -----------------------
+# Autocomplete
+# -----------------------
+class StudentAutocompleteWidget(forms.Widget):
+    """
+    Hidden pk input plus a search box backed by the search API
+    (static/js/autocomplete.js). Rendering costs at most one query, for the
+    label of the selected student.
+    """
+    template_name = 'academic_core/widgets/autocomplete.html'
+
+    class Media:
+        js = ('js/autocomplete.js',)
+
+    def __init__(self, attrs=None, kind='student'):
+        super().__init__(attrs)
+        self.kind = kind
+
+    def selected_label(self, value):
+        if value in (None, ''):
+            return ''
+        try:
+            student = Student.objects.filter(pk=value).only('reg_no', 'first_name', 'last_name').first()
+        except (ValueError, TypeError, ValidationError):
+            return ''
+        return str(student) if student else ''
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget'].update({
+            'label': self.selected_label(value),
+            'search_url': reverse('academic_core:api_search'),
+            'kind': self.kind,
+        })
+        return context
@@ -0,0 +1,219 @@
+# academic_core/conditional.py
+"""
+HTTP conditional GET (ETag / Last-Modified -> 304) for the API and pages.
+
+Every tracked model has a TableVersion row whose counter is bumped after
+each committed write: by post_save / post_delete signals (signals.py), and by an
+explicit bump() in code that writes with bulk_create / queryset.update().
+A response's validators are derived from the versions of the tables it
+reads, so "has anything changed?" costs one small query and a 304 skips the
+queryset and the serializer / template entirely.
+
+    - ETag: hash of the table versions + full path + Accept + user
+      (+ the CSRF secret on pages, whose forms embed a token for it)
+    - Last-Modified: newest TableVersion.updated_at of those tables
+
+Bumps run on transaction commit so a reader can never see a new version
+paired with old data.
+"""
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import serializers
+
+from .fieldsets import related_paths
+from .models import (
+    Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment,
+    ClassSession, Attendance, TableVersion,
+)
+
+TRACKED_MODELS = (Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment,
+                  ClassSession, Attendance)
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+# -----------------------
+# Version counters
+# -----------------------
+def _bump_now(labels):
+    now = timezone.now()
+    for label in labels:
+        updated = TableVersion.objects.filter(table=label).update(version=F('version') + 1, updated_at=now)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    TableVersion.objects.create(table=label, version=1, updated_at=now)
+            except IntegrityError:
+                TableVersion.objects.filter(table=label).update(version=F('version') + 1, updated_at=now)
+
+
+def bump(*models):
+    """Mark the tables of `models` as changed once the current transaction commits."""
+    labels = sorted({_label(m) for m in models})
+    transaction.on_commit(lambda: _bump_now(labels))
+
+
+def _versions_query(labels):
+    return TableVersion.objects.filter(table__in=labels).values_list('table', 'version', 'updated_at')
+
+
+def _missing_rows(missing, now):
+    return [TableVersion(table=t, updated_at=now) for t in missing]
+
+
+def versions(models):
+    """{label: (version, updated_at)} for `models` in one query (missing rows are created)."""
+    labels = {_label(m) for m in models}
+    found = {table: (version, updated_at) for table, version, updated_at in _versions_query(labels)}
+    missing = labels - set(found)
+    if missing:
+        now = timezone.now()
+        TableVersion.objects.bulk_create(_missing_rows(missing, now), ignore_conflicts=True)
+        found.update((t, (0, now)) for t in missing)
+    return found
+
+
+async def aversions(models):
+    """versions() for async views."""
+    labels = {_label(m) for m in models}
+    found = {table: (version, updated_at) async for table, version, updated_at in _versions_query(labels)}
+    missing = labels - set(found)
+    if missing:
+        now = timezone.now()
+        await TableVersion.objects.abulk_create(_missing_rows(missing, now), ignore_conflicts=True)
+        found.update((t, (0, now)) for t in missing)
+    return found
+
+
+# -----------------------
+# Validators / 304s
+# -----------------------
+def _validators(request, state, user, *extra):
+    key = '|'.join([
+        ','.join(f'{label}:{v}' for label, (v, _) in sorted(state.items())),
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+        str(user.pk) if user is not None and user.is_authenticated else '-',
+        *extra,
+    ])
+    etag = 'W/"%s"' % hashlib.sha1(key.encode()).hexdigest()[:24]
+    last_modified = int(max(updated_at for _, updated_at in state.values()).timestamp())
+    return etag, last_modified
+
+
+def validators(request, models, *extra):
+    """
+    (etag, last_modified timestamp) for a GET of request.path reading
+    `models`; `extra` strings are hashed into the ETag as well.
+    """
+    return _validators(request, versions(models), getattr(request, 'user', None), *extra)
+
+
+def _conditional_response(request, etag, last_modified):
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response, etag, last_modified
+
+
+def not_modified(request, models, *extra):
+    """
+    Returns (response, etag, last_modified): a 304 response when the
+    client's copy is current, else None plus the validators to set.
+    """
+    if request.method not in ('GET', 'HEAD') or not models:
+        return None, None, None
+    return _conditional_response(request, *validators(request, models, *extra))
+
+
+async def anot_modified(request, models):
+    """not_modified() for async views; the user comes from request.auser()."""
+    if request.method not in ('GET', 'HEAD') or not models:
+        return None, None, None
+    user = await request.auser() if hasattr(request, 'auser') else None
+    return _conditional_response(request, *_validators(request, await aversions(models), user))
+
+
+def set_validators(response, etag, last_modified):
+    if etag is None or response.status_code not in (200, 304):
+        return response
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    # always revalidate; the 304 round trip is what saves the bandwidth
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Accept', 'Cookie'))
+    return response
+
+
+def models_for_serializer(serializer):
+    """The serializer's model plus every model its (pruned) nested fields read."""
+    model = serializer.Meta.model
+    found = {model}
+    select, prefetch = related_paths(serializer)
+    for path in select | prefetch:
+        current = model
+        for part in path.split('__'):
+            current = current._meta.get_field(part).related_model
+            found.add(current)
+    return found
+
+
+# -----------------------
+# View mixins
+# -----------------------
+class ConditionalGetMixin:
+    """
+    Viewset mixin: ETag / Last-Modified on list and retrieve; 304 before the
+    queryset or serializer runs when the client's copy is current.
+    """
+
+    def _conditional_models(self):
+        serializer = self.get_serializer()
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return None
+        models = models_for_serializer(serializer)
+        if not models.issubset(TRACKED_MODELS):
+            return None
+        return models
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        response, etag, last_modified = not_modified(request, self._conditional_models())
+        if response is not None:
+            return response
+        return set_validators(handler(request, *args, **kwargs), etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalPageMixin:
+    """
+    Template view mixin: same as ConditionalGetMixin for ListView / DetailView.
+    `conditional_models` lists every model the page shows. Pages carrying a
+    flash message are never answered with 304. Pages render CSRF forms
+    (logout in base.html, delete buttons), so the CSRF secret is part of the
+    ETag: after it rotates (login) the cached copy's tokens are stale.
+    """
+    conditional_models = ()
+
+    def get(self, request, *args, **kwargs):
+        if len(get_messages(request)):
+            return super().get(request, *args, **kwargs)
+        get_token(request)  # the secret the page's tokens will be built from
+        response, etag, last_modified = not_modified(request, self.conditional_models,
+                                                     request.META['CSRF_COOKIE'])
+        if response is not None:
+            return response
+        return set_validators(super().get(request, *args, **kwargs), etag, last_modified)
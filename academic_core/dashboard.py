@@ -0,0 +1,143 @@
+# academic_core/dashboard.py
+"""
+Dashboard statistics for the home page and its Chart.js widgets.
+
+The figures are computed in four aggregate queries and cached (caching.py)
+under a key versioned on the models they read, so any write to those
+tables retires it:
+
+- students / teachers / classes : total, active, inactive
+- per class                     : active students (current_class) against capacity
+- enrollments_this_month        : enrollments starting in the current month
+
+The key also carries the month, so "this month" rolls over on its own.
+DASHBOARD_CACHE_TIMEOUT bounds staleness from writes that skip the
+invalidation hooks (raw SQL).
+
+astats() / acompute() are the async ORM versions for the async API
+(async_views.py); they share the cache key with stats().
+"""
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import caching
+from .models import Enrollment, Student, Teacher, TuitionClass
+
+# models whose writes change the figures
+SOURCE_MODELS = (Student, Teacher, TuitionClass, Enrollment)
+
+
+def _timeout():
+    return getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 3600)
+
+
+def _split(total, active):
+    return {'total': total, 'active': active, 'inactive': total - active}
+
+
+def _utilisation(students, capacity):
+    """Percentage of seats taken, one decimal; None for a zero-capacity class."""
+    return round(students * 100 / capacity, 1) if capacity else None
+
+
+def _aggregate_args():
+    return {'total': Count('pk'), 'active': Count('pk', filter=Q(is_active=True))}
+
+
+def _classes():
+    return TuitionClass.objects.order_by('class_id').annotate(
+        students_count=Count('students', filter=Q(students__is_active=True))
+    ).values('class_id', 'name', 'active', 'capacity', 'students_count')
+
+
+def _enrollments_this_month(today):
+    return Enrollment.objects.filter(start_date__gte=today.replace(day=1), start_date__lte=today)
+
+
+def _assemble(today, students, teachers, classes, enrollments_this_month):
+    per_class = []
+    seats = filled = 0
+    for c in classes:
+        per_class.append({
+            'class_id': c['class_id'],
+            'name': c['name'],
+            'active': c['active'],
+            'students': c['students_count'],
+            'capacity': c['capacity'],
+            'utilisation': _utilisation(c['students_count'], c['capacity']),
+        })
+        if c['active']:
+            seats += c['capacity']
+            filled += c['students_count']
+
+    return {
+        'generated_at': timezone.now().isoformat(),
+        'month': f'{today:%Y-%m}',
+        'students': _split(students['total'], students['active']),
+        'teachers': _split(teachers['total'], teachers['active']),
+        'classes': _split(len(per_class), sum(1 for c in per_class if c['active'])),
+        'capacity': {'seats': seats, 'filled': filled, 'utilisation': _utilisation(filled, seats)},
+        'enrollments_this_month': enrollments_this_month,
+        'per_class': per_class,
+    }
+
+
+def compute(today=None):
+    """Build the statistics dict from the database (no cache)."""
+    today = today or timezone.localdate()
+    return _assemble(
+        today,
+        Student.objects.aggregate(**_aggregate_args()),
+        Teacher.objects.aggregate(**_aggregate_args()),
+        _classes(),
+        _enrollments_this_month(today).count(),
+    )
+
+
+async def acompute(today=None):
+    """compute() with the async ORM (aaggregate / aiterator / acount)."""
+    today = today or timezone.localdate()
+    return _assemble(
+        today,
+        await Student.objects.aaggregate(**_aggregate_args()),
+        await Teacher.objects.aaggregate(**_aggregate_args()),
+        [c async for c in _classes().aiterator()],
+        await _enrollments_this_month(today).acount(),
+    )
+
+
+def stats():
+    """Cached statistics; recomputed after any write to SOURCE_MODELS."""
+    today = timezone.localdate()
+    return caching.get_or_set('dashboard', SOURCE_MODELS, lambda: compute(today),
+                              parts=(f'{today:%Y-%m}',), timeout=_timeout())
+
+
+async def astats():
+    """stats() for async views: same cache entry, read and filled without blocking."""
+    today = timezone.localdate()
+    return await caching.aget_or_set('dashboard', SOURCE_MODELS, lambda: acompute(today),
+                                     parts=(f'{today:%Y-%m}',), timeout=_timeout())
+
+
+def chart_data(data):
+    """Chart.js (v2) `data` objects for the dashboard widgets."""
+    active_classes = [c for c in data['per_class'] if c['active']]
+    return {
+        'students_per_class': {
+            'labels': [c['class_id'] for c in active_classes],
+            'datasets': [
+                {'label': 'Students', 'data': [c['students'] for c in active_classes]},
+                {'label': 'Capacity', 'data': [c['capacity'] for c in active_classes]},
+            ],
+        },
+        'student_status': {
+            'labels': ['Active', 'Inactive'],
+            'datasets': [{'data': [data['students']['active'], data['students']['inactive']]}],
+        },
+        'class_utilisation': {
+            'labels': [c['class_id'] for c in active_classes],
+            'datasets': [{'label': 'Utilisation %', 'data': [c['utilisation'] for c in active_classes]}],
+        },
+    }
@@ -0,0 +1,246 @@
+# academic_core/exports.py
+"""
+Streaming CSV / XLSX export of students, guardians, enrollments and classes.
+
+Rows come from `.values_list(...).iterator(chunk_size=...)` and are encoded
+as they are produced, so memory stays flat whatever the row count. XLSX is
+written as a streamed zip (inline strings, no shared-string table), so no
+spreadsheet library is needed either.
+"""
+import csv
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from .models import Student, Guardian, Enrollment, TuitionClass
+
+# name -> (base queryset, {column: ORM path}, {filter param: ORM lookup})
+EXPORTS = {
+    'students': (
+        Student.objects.all(),
+        {
+            'reg_no': 'reg_no',
+            'first_name': 'first_name',
+            'last_name': 'last_name',
+            'dob': 'dob',
+            'joined_date': 'joined_date',
+            'nic': 'nic',
+            'school': 'school',
+            'gender': 'gender',
+            'class_id': 'current_class__class_id',
+            'class_name': 'current_class__name',
+            'address': 'address',
+            'phone': 'phone',
+            'whatsapp': 'whatsapp',
+            'email': 'email',
+            'is_active': 'is_active',
+        },
+        {'class': 'current_class__class_id', 'active': 'is_active'},
+    ),
+    'guardians': (
+        Guardian.objects.all(),
+        {
+            'reg_no': 'student__reg_no',
+            'student_first_name': 'student__first_name',
+            'student_last_name': 'student__last_name',
+            'name': 'name',
+            'relationship': 'relationship',
+            'phone': 'phone',
+            'whatsapp': 'whatsapp',
+            'email': 'email',
+            'is_primary': 'is_primary',
+        },
+        {'class': 'student__current_class__class_id', 'active': 'student__is_active'},
+    ),
+    'enrollments': (
+        Enrollment.objects.all(),
+        {
+            'reg_no': 'student__reg_no',
+            'first_name': 'student__first_name',
+            'last_name': 'student__last_name',
+            'class_id': 'tuition_class__class_id',
+            'class_name': 'tuition_class__name',
+            'start_date': 'start_date',
+            'end_date': 'end_date',
+            'active': 'active',
+            'fee_override': 'fee_override',
+        },
+        {'class': 'tuition_class__class_id', 'active': 'active'},
+    ),
+    'classes': (
+        TuitionClass.objects.all(),
+        {
+            'class_id': 'class_id',
+            'name': 'name',
+            'class_mode': 'class_mode',
+            'fee_type': 'fee_type',
+            'per_session_fee': 'per_session_fee',
+            'monthly_fee': 'monthly_fee',
+            'teacher_first_name': 'class_teacher__first_name',
+            'teacher_last_name': 'class_teacher__last_name',
+            'capacity': 'capacity',
+            'active': 'active',
+        },
+        {'class': 'class_id', 'active': 'active'},
+    ),
+}
+
+_TRUE = ('1', 'true', 'yes', 'on')
+
+
+class ExportError(ValueError):
+    pass
+
+
+def export_rows(name, columns=None, filters=None, chunk_size=2000):
+    """
+    Return (header, rows) for export `name`. `columns` restricts / orders the
+    output columns; `filters` maps filter params ('class', 'active') to values.
+    Raises ExportError for unknown exports, columns or filters.
+    """
+    if name not in EXPORTS:
+        raise ExportError(f"Unknown export '{name}'. Choose from: {', '.join(EXPORTS)}")
+    queryset, available, filter_map = EXPORTS[name]
+
+    columns = list(columns or available)
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ExportError(f"Unknown column(s) for {name}: {', '.join(unknown)}")
+
+    qs = queryset
+    for param, value in (filters or {}).items():
+        if value in (None, ''):
+            continue
+        if param not in filter_map:
+            raise ExportError(f"Unknown filter '{param}' for {name}")
+        lookup = filter_map[param]
+        if param == 'active':
+            value = str(value).lower() in _TRUE
+        qs = qs.filter(**{lookup: value})
+
+    ordering = queryset.model._meta.ordering or ['pk']
+    rows = qs.order_by(*ordering).values_list(*[available[c] for c in columns]).iterator(chunk_size=chunk_size)
+    return columns, rows
+
+
+# -----------------------
+# CSV
+# -----------------------
+class _Echo:
+    """File-like object whose write() just returns the line (csv.writer + generator)."""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(header, rows):
+    writer = csv.writer(_Echo())
+    yield '\ufeff'  # BOM so Excel opens UTF-8 (Sinhala / Tamil names) correctly
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(['' if v is None else v for v in row])
+
+
+# -----------------------
+# XLSX
+# -----------------------
+_ILLEGAL_XML = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+class _ChunkBuffer:
+    """Unseekable sink for ZipFile; drain() hands back what was written so far."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c><v>{value}</v></c>'
+    text = _ILLEGAL_XML.sub('', str(value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def _row(values):
+    return '<row>' + ''.join(_cell(v) for v in values) + '</row>'
+
+
+def xlsx_stream(header, rows, sheet_name='Export', flush_every=500):
+    buf = _ChunkBuffer()
+    with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _ROOT_RELS)
+        zf.writestr('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name[:31])))
+        zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_row(header).encode())
+            for i, row in enumerate(rows, 1):
+                sheet.write(_row(row).encode())
+                if i % flush_every == 0:
+                    chunk = buf.drain()
+                    if chunk:
+                        yield chunk
+            sheet.write(b'</sheetData></worksheet>')
+    yield buf.drain()
+
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', csv_stream),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', xlsx_stream),
+}
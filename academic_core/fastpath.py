@@ -0,0 +1,270 @@
+# academic_core/fastpath.py
+"""
+Fast read path for API list actions.
+
+A list page normally instantiates a model object per row (plus one per
+nested relation) and runs every DRF field's get_attribute/to_representation
+on it. For read-only lists that is mostly overhead: this module compiles the
+(already ?fields=-pruned) serializer once per request into
+
+  - the `.values()` paths it needs (one query, joins included)
+  - one extra query per nested list (e.g. student guardians), grouped in Python
+  - a builder that turns each values() dict into the same dict the serializer
+    would have produced, key order included, so the JSON is byte-identical
+
+Only fields whose output can be reproduced exactly are compiled; anything
+else (SerializerMethodField, source='*', properties, m2m ...) makes compile()
+return None and the view falls back to the regular serializer. Writes always
+use the serializers. Set API_FAST_LIST = False to switch the path off.
+
+Plan.arender() is the same for the async read API (async_views.py).
+"""
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from . import metrics
+
+_IDENTITY_FIELDS = (serializers.CharField, serializers.EmailField, serializers.BooleanField,
+                    serializers.IntegerField)
+
+# step kinds
+_VALUE, _FILE, _NESTED, _MANY = range(4)
+
+
+class Unsupported(Exception):
+    pass
+
+
+def _model_field(model, name):
+    if name == 'pk':
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise Unsupported(f'{model.__name__}.{name}')
+
+
+def _walk(model, parts):
+    """Follow forward FKs along `parts[:-1]`; return (model, final model field)."""
+    for part in parts[:-1]:
+        field = _model_field(model, part)
+        if not (field.many_to_one or (field.one_to_one and not field.auto_created)):
+            raise Unsupported(part)
+        if field.null:
+            # DRF skips the key when an intermediate object is None; keep that to the serializer
+            raise Unsupported(part)
+        model = field.related_model
+    return model, _model_field(model, parts[-1])
+
+
+def _converter(field):
+    """None when the values() value is already what to_representation returns."""
+    if type(field) in _IDENTITY_FIELDS:
+        return None
+    if type(field) is serializers.ChoiceField and all(isinstance(k, str) for k in field.choices):
+        return None
+    return field.to_representation
+
+
+class Plan:
+    def __init__(self, model):
+        self.model = model
+        self.paths = []
+        self.steps = []
+        self.manys = []
+
+    def _path(self, path):
+        if path not in self.paths:
+            self.paths.append(path)
+        return path
+
+    def values(self, queryset, extra=()):
+        qs = queryset.select_related(None).prefetch_related(None)
+        return qs.values(*self.paths, *[p for p in extra if p not in self.paths])
+
+    def _many_values(self, rows):
+        """(store key, fk, child plan, values() queryset or None) per nested list."""
+        for owner_path, fk, child in self.manys:
+            owner_ids = {row[owner_path] for row in rows} - {None}
+            qs = None
+            if owner_ids:
+                qs = child.values(child.model._default_manager.filter(**{f'{fk}__in': owner_ids}), extra=(fk,))
+            yield (owner_path, fk), fk, child, qs
+
+    @staticmethod
+    def _grouped(fk, child_rows, rendered):
+        grouped = defaultdict(list)
+        for row, data in zip(child_rows, rendered):
+            grouped[row[fk]].append(data)
+        return grouped
+
+    @property
+    def has_files(self):
+        """True if rendering may touch storage (photo derivatives)."""
+        return (any(kind == _FILE or (kind == _NESTED and arg.has_files) for _, kind, _, arg in self.steps)
+                or any(child.has_files for _, _, child in self.manys))
+
+    def render(self, rows):
+        """values() dicts -> serializer-shaped dicts."""
+        store = {}
+        for key, fk, child, qs in self._many_values(rows):
+            child_rows = list(qs) if qs is not None else []
+            store[key] = self._grouped(fk, child_rows, child.render(child_rows))
+        return self._build_all(rows, store)
+
+    def _build_all(self, rows, store):
+        return [self.build(row, store) for row in rows]
+
+    async def arender(self, rows):
+        """
+        render() for async views: nested lists are read with the async ORM.
+        Photo derivatives may read / write storage, so plans with file
+        fields build their rows on the request's sync worker thread.
+        """
+        store = {}
+        for key, fk, child, qs in self._many_values(rows):
+            child_rows = [row async for row in qs.aiterator()] if qs is not None else []
+            store[key] = self._grouped(fk, child_rows, await child.arender(child_rows))
+        if self.has_files:
+            return await sync_to_async(self._build_all)(rows, store)
+        return self._build_all(rows, store)
+
+    def build(self, row, store):
+        out = {}
+        for name, kind, path, arg in self.steps:
+            value = row[path]
+            if kind == _VALUE:
+                out[name] = value if arg is None or value is None else arg(value)
+            elif kind == _FILE:
+                model_field, to_representation = arg
+                out[name] = to_representation(FieldFile(None, model_field, value))
+            elif kind == _NESTED:
+                out[name] = None if value is None else arg.build(row, store)
+            else:
+                fk, child = arg
+                items = store[path, fk].get(value, [])
+                out[name] = items if child is not None else [item['pk'] for item in items]
+        return out
+
+
+def _pk_only_plan(model):
+    plan = Plan(model)
+    plan.steps.append(('pk', _VALUE, plan._path('pk'), None))
+    return plan
+
+
+def _compile(serializer, model, prefix, plan):
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source or name
+        if source == '*':
+            raise Unsupported(name)
+        parts = source.split('.')
+
+        if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            if len(parts) != 1:
+                raise Unsupported(name)
+            rel = _model_field(model, parts[0])
+            if not (rel.one_to_many and rel.auto_created):
+                raise Unsupported(name)
+            child = field.child if isinstance(field, serializers.ListSerializer) else None
+            if child is not None and not isinstance(child, serializers.ModelSerializer):
+                raise Unsupported(name)
+            if isinstance(field, serializers.ManyRelatedField) and (
+                    not isinstance(field.child_relation, serializers.PrimaryKeyRelatedField)
+                    or field.child_relation.pk_field is not None):
+                raise Unsupported(name)
+            if child is None:
+                child_plan = _pk_only_plan(rel.related_model)
+            else:
+                child_plan = _compile(child, rel.related_model, '', Plan(rel.related_model))
+            fk = rel.field.name
+            owner = plan._path(f'{prefix}pk')
+            plan.manys.append((owner, fk, child_plan))
+            plan.steps.append((name, _MANY, owner, (fk, child)))
+            continue
+
+        if isinstance(field, serializers.BaseSerializer):
+            if not isinstance(field, serializers.ModelSerializer):
+                raise Unsupported(name)
+            _, fk_field = _walk(model, parts)
+            if not (fk_field.many_to_one or (fk_field.one_to_one and not fk_field.auto_created)):
+                raise Unsupported(name)
+            related_model = fk_field.related_model
+            nested_prefix = prefix + '__'.join(parts) + '__'
+            nested = Plan(related_model)
+            nested.paths, nested.manys = plan.paths, plan.manys  # share the one values() query
+            _compile(field, related_model, nested_prefix, nested)
+            marker = plan._path(prefix + '__'.join(parts))
+            plan.steps.append((name, _NESTED, marker, nested))
+            continue
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            _, fk_field = _walk(model, parts)
+            if field.pk_field is not None or not fk_field.many_to_one:
+                raise Unsupported(name)
+            plan.steps.append((name, _VALUE, plan._path(prefix + '__'.join(parts)), None))
+            continue
+
+        if isinstance(field, (serializers.SerializerMethodField, serializers.HiddenField,
+                              serializers.RelatedField)):
+            raise Unsupported(name)
+
+        _, model_field = _walk(model, parts)
+        if model_field.is_relation or not model_field.concrete:
+            raise Unsupported(name)
+        path = plan._path(prefix + '__'.join(parts))
+        if isinstance(model_field, models.FileField):
+            plan.steps.append((name, _FILE, path, (model_field, field.to_representation)))
+        else:
+            plan.steps.append((name, _VALUE, path, _converter(field)))
+    return plan
+
+
+def compile(serializer):
+    """Plan for a bound ModelSerializer, or None if it cannot be reproduced exactly."""
+    if not getattr(settings, 'API_FAST_LIST', True) or not isinstance(serializer, serializers.ModelSerializer):
+        return None
+    model = serializer.Meta.model
+    try:
+        return _compile(serializer, model, '', Plan(model))
+    except Unsupported:
+        return None
+
+
+class FastListMixin:
+    """
+    Viewset mixin: serve `list` through a compiled Plan when the serializer
+    allows it. Pagination (cursor or ?page=) runs on the values() queryset;
+    the columns the cursor may order by are fetched alongside.
+    """
+
+    def _cursor_columns(self, model):
+        names = list(getattr(self, 'cursor_ordering', None) or model._meta.ordering or ())
+        ordering_fields = getattr(self, 'ordering_fields', None)
+        if isinstance(ordering_fields, (list, tuple)):
+            names += ordering_fields
+        return ['pk'] + [n.lstrip('-') for n in names]
+
+    def list(self, request, *args, **kwargs):
+        plan = compile(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = plan.values(queryset, extra=self._cursor_columns(queryset.model))
+        page = self.paginate_queryset(rows)
+        rows = list(rows if page is None else page)
+        with metrics.timer('serialize'):
+            data = plan.render(rows)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
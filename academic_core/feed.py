@@ -0,0 +1,272 @@
+# academic_core/feed.py
+"""
+Live change feed for staff dashboards, streamed as Server-Sent Events from
+GET /api/async/events/ (?class=<pk>, repeatable) under ASGI (core/asgi.py).
+
+Sources, each published once the writing transaction commits:
+
+- post_save / post_delete on Student, Enrollment and SubjectAssignment
+  (connected in signals.py): student.created / .updated / .deleted, ...
+- attendance_recorded / session_created (core/notifications.py). These are
+  queued in the outbox and sent by the notification worker, normally another
+  process, so the feed reads them from the outbox table instead: one query
+  every FEED_OUTBOX_POLL_SECONDS per process while any stream is open.
+
+Events are compact (ids and flags, no names) and name the classes they
+concern; a stream with ?class= only gets events for those classes, and
+events without a class (assignments) only reach unfiltered streams. A
+student moving class reaches both classes (previous_class_id is set).
+
+Fan-out is in memory, per process, and bounded:
+
+- the last FEED_BUFFER_SIZE events are kept for Last-Event-ID replay after
+  a reconnect; a client whose last id has left the buffer gets
+  `event: reset` and should refetch through the API
+- each stream queues at most FEED_QUEUE_SIZE events and publishing never
+  waits on a reader. A stream that falls that far behind (a client not
+  reading) has its queue dropped and gets `event: reset` instead
+- at most FEED_MAX_SUBSCRIBERS streams per process (503 beyond)
+
+Model signals only fire in the process that made the write, so writes
+served by another process (a separate WSGI worker) are not on the feed;
+serve the site from the ASGI process to get them all.
+"""
+import asyncio
+import json
+import logging
+import secrets
+import threading
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, transaction
+from django.db.models import Max
+
+from .models import ClassSession, Enrollment, OutboxMessage, Student, SubjectAssignment
+
+logger = logging.getLogger(__name__)
+
+# event ids from an earlier process are never taken for ids in this one
+EPOCH = secrets.token_hex(4)
+
+Event = namedtuple('Event', 'seq type classes frame')
+
+# queued for a stream whose queue overflowed
+OVERFLOW = object()
+
+OUTBOX_EVENTS = ('attendance_recorded', 'session_created')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _frame(event_type, data, event_id=None):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    head = f'id: {event_id}\n' if event_id is not None else ''
+    return f'{head}event: {event_type}\ndata: {payload}\n\n'.encode()
+
+
+def reset_frame(reason):
+    return _frame('reset', {'reason': reason})
+
+
+# -----------------------
+# Broker
+# -----------------------
+class Subscription:
+    """One open stream: its event loop, class filter (None = all) and bounded queue."""
+
+    def __init__(self, loop, classes, size):
+        self.loop = loop
+        self.classes = classes
+        self.queue = asyncio.Queue(size)
+        self.overflowed = False
+
+    def wants(self, event):
+        return self.classes is None or not self.classes.isdisjoint(event.classes)
+
+    def offer(self, event):
+        # runs on the stream's loop, so it never races the reader
+        if self.overflowed or not self.wants(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class Broker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.buffer = deque(maxlen=_setting('FEED_BUFFER_SIZE', 1000))
+        self.subscribers = set()
+        self.tail = None
+
+    def publish(self, event_type, data, classes=()):
+        """Append an event and hand it to every stream; callable from any thread."""
+        with self.lock:
+            self.seq += 1
+            event = Event(self.seq, event_type, frozenset(c for c in classes if c is not None),
+                          _frame(event_type, data, f'{EPOCH}-{self.seq}'))
+            self.buffer.append(event)
+            subscribers = list(self.subscribers)
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # its event loop is gone
+                self.unsubscribe(sub)
+        return event
+
+    def full(self):
+        return len(self.subscribers) >= _setting('FEED_MAX_SUBSCRIBERS', 1000)
+
+    def subscribe(self, classes=None):
+        """A Subscription on the running loop for events concerning `classes` (None: all)."""
+        loop = asyncio.get_running_loop()
+        sub = Subscription(loop, classes, _setting('FEED_QUEUE_SIZE', 100))
+        with self.lock:
+            self.subscribers.add(sub)
+        if self.tail is None or self.tail.done() or self.tail.get_loop() is not loop:
+            self.tail = loop.create_task(self._tail_outbox())
+        return sub
+
+    def unsubscribe(self, sub):
+        with self.lock:
+            self.subscribers.discard(sub)
+
+    def since(self, last_id, sub):
+        """Buffered events after `last_id` that `sub` wants, or None if some have been dropped."""
+        epoch, _, seq = last_id.partition('-')
+        if epoch != EPOCH or not seq.isdigit():
+            return None
+        seq = int(seq)
+        with self.lock:
+            events = list(self.buffer)
+            current = self.seq
+        if seq > current or (seq < current and (not events or events[0].seq > seq + 1)):
+            return None
+        return [e for e in events if e.seq > seq and sub.wants(e)]
+
+    async def _tail_outbox(self):
+        interval = _setting('FEED_OUTBOX_POLL_SECONDS', 1.0)
+        after = (await OutboxMessage.objects.aaggregate(last=Max('pk')))['last'] or 0
+        while self.subscribers:
+            await asyncio.sleep(interval)
+            try:
+                after = await self.poll_outbox(after)
+            except DatabaseError:
+                logger.exception('feed: reading the outbox failed')
+
+    async def poll_outbox(self, after, limit=500):
+        """Publish feed events queued in the outbox after pk `after`; returns the new cursor."""
+        rows = [row async for row in (
+            OutboxMessage.objects.filter(pk__gt=after, event__in=OUTBOX_EVENTS)
+            .order_by('pk').values('pk', 'event', 'payload')[:limit]
+        )]
+        session_ids = {row['payload'].get('session_id') for row in rows if row['event'] == 'attendance_recorded'}
+        classes = {}
+        if session_ids:
+            async for pk, class_id in ClassSession.objects.filter(pk__in=session_ids).values_list(
+                    'pk', 'tuition_class_id'):
+                classes[pk] = class_id
+
+        for row in rows:
+            payload = row['payload']
+            if row['event'] == 'attendance_recorded':
+                class_id = classes.get(payload.get('session_id'))
+                self.publish('attendance.recorded', {
+                    'session_id': payload.get('session_id'), 'class_id': class_id,
+                    'student_ids': payload.get('student_ids', []),
+                }, [class_id])
+            else:
+                self.publish('session.created', {
+                    'session_id': payload.get('session_id'), 'class_id': payload.get('class_id'),
+                    'date': payload.get('date'),
+                }, [payload.get('class_id')])
+        return rows[-1]['pk'] if rows else after
+
+
+broker = Broker()
+
+
+# -----------------------
+# Model events (signals.py)
+# -----------------------
+def _student(s):
+    data = {'id': s.pk, 'reg_no': s.reg_no, 'current_class_id': s.current_class_id,
+            'is_active': s.is_active}
+    # a move is news for the class left as well as the one joined; the class
+    # the row was loaded with is kept by Student.from_db
+    previous = getattr(s, '_loaded_values', {}).get('current_class_id', s.current_class_id)
+    if previous != s.current_class_id:
+        data['previous_class_id'] = previous
+    return data, [s.current_class_id, previous]
+
+
+def _enrollment(e):
+    return {'id': e.pk, 'student_id': e.student_id, 'tuition_class_id': e.tuition_class_id,
+            'active': e.active}, [e.tuition_class_id]
+
+
+def _assignment(a):
+    return {'id': a.pk, 'subject_id': a.subject_id, 'teacher_id': a.teacher_id}, []
+
+
+# model -> (event prefix, instance -> (data, class ids))
+MODEL_EVENTS = {
+    Student: ('student', _student),
+    Enrollment: ('enrollment', _enrollment),
+    SubjectAssignment: ('assignment', _assignment),
+}
+
+
+def model_changed(instance, action):
+    """Publish `<model>.<action>` for `instance` once the current transaction commits."""
+    prefix, describe = MODEL_EVENTS[type(instance)]
+    data, classes = describe(instance)
+    transaction.on_commit(lambda: broker.publish(f'{prefix}.{action}', data, classes))
+
+
+# -----------------------
+# Streaming
+# -----------------------
+async def stream(classes=None, last_id=None):
+    """
+    SSE frames for events concerning `classes` (None: all), replaying those
+    after `last_id` first, until the client goes away. Subscribes on first
+    iteration, so a response that is never sent holds no subscription.
+    """
+    keepalive = _setting('FEED_KEEPALIVE_SECONDS', 15)
+    sub = broker.subscribe(classes)
+    sent = 0
+    try:
+        yield b'retry: 3000\n\n'
+        if last_id:
+            missed = broker.since(last_id, sub)
+            if missed is None:
+                yield reset_frame('gap')
+            for event in missed or ():
+                sent = event.seq
+                yield event.frame
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield b': keepalive\n\n'
+                continue
+            if event is OVERFLOW:
+                sub.overflowed = False
+                yield reset_frame('overflow')
+            elif event.seq > sent:
+                # replayed events can also be queued: skip them
+                sent = event.seq
+                yield event.frame
+    finally:
+        broker.unsubscribe(sub)
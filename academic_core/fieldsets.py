@@ -0,0 +1,186 @@
+# academic_core/fieldsets.py
+"""
+Sparse fieldsets for the API: ?fields=, ?omit= and ?expand=.
+
+    ?fields=id,reg_no,first_name,last_name       only these keys
+    ?fields=id,student.reg_no                    dotted paths reach into nested objects
+    ?omit=guardians,current_class.class_teacher  drop keys (anywhere in the tree)
+    ?expand=tuition_class                        nested objects not listed collapse to their id;
+    ?expand=                                     ... so an empty expand gives a flat row
+
+Without any of the params the output is unchanged. They only apply to
+GET / HEAD / OPTIONS: a write sent with ?fields= keeps every writable field. Serializers opt in with
+SparseFieldsetSerializerMixin; viewsets with SparseFieldsetMixin derive
+select_related / prefetch_related from the fields actually being rendered,
+so a join is only made when its data is asked for.
+"""
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import permissions, serializers
+
+from . import metrics
+
+Spec = namedtuple('Spec', ['fields', 'omit', 'expand'])
+
+QUERY_PARAMS = ('fields', 'omit', 'expand')
+
+
+def parse_paths(value):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}; None stays None (param absent)."""
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in filter(None, (p.strip() for p in path.split('.'))):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def spec_from_request(request):
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    if not any(p in params for p in QUERY_PARAMS):
+        return None
+    return Spec(*(parse_paths(params.get(p)) for p in QUERY_PARAMS))
+
+
+def _collapsed(name, field):
+    """Replace a nested serializer by the primary key(s) it represents."""
+    kwargs = {'read_only': True}
+    if field.source and field.source != name:
+        kwargs['source'] = field.source
+    if isinstance(field, serializers.ListSerializer):
+        return serializers.PrimaryKeyRelatedField(many=True, **kwargs)
+    return serializers.PrimaryKeyRelatedField(**kwargs)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Prune get_fields() by the request's ?fields= / ?omit= / ?expand=. The root
+    serializer reads the request; nested serializers get their sub-spec.
+    """
+    sparse_spec = None
+
+    def _is_root(self):
+        """True for the response's serializer (or the child of its many=True list)."""
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _root_spec(self):
+        if not self._is_root():
+            return None
+        return spec_from_request(self.context.get('request'))
+
+    def to_representation(self, instance):
+        if not self._is_root():
+            return super().to_representation(instance)
+        with metrics.timer('serialize'):
+            return super().to_representation(instance)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self.sparse_spec or self._root_spec()
+        if spec is None:
+            return fields
+
+        wanted, omit, expand = spec
+        for name in list(fields):
+            if wanted is not None and name not in wanted:
+                del fields[name]
+                continue
+            if omit is not None and omit.get(name) == {}:
+                del fields[name]
+                continue
+
+            field = fields[name]
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if not isinstance(nested, SparseFieldsetSerializerMixin):
+                continue
+            sub_fields = (wanted or {}).get(name) or None
+            if expand is not None and name not in expand and not sub_fields:
+                fields[name] = _collapsed(name, field)
+                continue
+            nested.sparse_spec = Spec(
+                sub_fields,
+                (omit or {}).get(name),
+                None if expand is None else expand.get(name, {}),
+            )
+        return fields
+
+
+# -----------------------
+# Queryset planning
+# -----------------------
+def _relation(model, attr):
+    """('select' | 'prefetch', related model) for a model attribute, or None."""
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        return None
+    if not field.is_relation:
+        return None
+    if field.many_to_one or (field.one_to_one and not field.auto_created):
+        return 'select', field.related_model
+    return 'prefetch', field.related_model
+
+
+def related_paths(serializer, model=None, prefix='', prefetching=False):
+    """
+    Walk a (pruned) serializer and return (select_related, prefetch_related)
+    lookups needed to render it without per-row queries.
+    """
+    select, prefetch = set(), set()
+    model = model or serializer.Meta.model
+    for name, field in serializer.fields.items():
+        source = field.source or name
+        if source == '*':
+            continue
+        parts = source.split('.')
+        # dotted sources (e.g. 'student.reg_no') walk relations up to the last attribute
+        steps = parts if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)) \
+            else parts[:-1]
+        current, path, in_prefetch = model, prefix, prefetching
+        for step in steps:
+            relation = _relation(current, step)
+            if relation is None:
+                break
+            kind, current = relation
+            path = f'{path}{step}'
+            in_prefetch = in_prefetch or kind == 'prefetch'
+            (prefetch if in_prefetch else select).add(path)
+            path += '__'
+        else:
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if steps and isinstance(nested, serializers.ModelSerializer):
+                sub_select, sub_prefetch = related_paths(nested, current, path, in_prefetch)
+                select |= sub_select
+                prefetch |= sub_prefetch
+    # keep only the deepest lookups: select_related('a__b') already joins 'a'
+    select = {p for p in select if not any(o.startswith(p + '__') for o in select)}
+    prefetch = {p for p in prefetch if not any(o.startswith(p + '__') for o in prefetch)}
+    return select, prefetch
+
+
+class SparseFieldsetMixin:
+    """
+    Viewset mixin: replaces the queryset's select_related / prefetch_related
+    with exactly what the serializer for this request will touch.
+    """
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        serializer = self.get_serializer()
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return qs
+        select, prefetch = related_paths(serializer)
+        qs = qs.select_related(None).prefetch_related(None)
+        if select:
+            qs = qs.select_related(*sorted(select))
+        if prefetch:
+            qs = qs.prefetch_related(*sorted(prefetch))
+        return qs
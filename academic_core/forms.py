@@ -5,11 +5,17 @@ from .models import (
     Teacher, TuitionClass, Subject, SubjectAssignment,
     Student, Guardian, Enrollment
 )
+from .choices import (
+    CachedChoicesMixin, StudentAutocompleteWidget,
+    TEACHER_CHOICES, CLASS_CHOICES, SUBJECT_CHOICES, USER_CHOICES,
+)
 
 # Shared date widget
 DATE_WIDGET = DateInput(attrs={'type': 'date', 'class': 'form-control'})
 
-class TeacherForm(forms.ModelForm):
+class TeacherForm(CachedChoicesMixin, forms.ModelForm):
+    cached_choice_fields = {'user': USER_CHOICES}
+
     class Meta:
         model = Teacher
         fields = [
@@ -27,7 +33,9 @@ class TeacherForm(forms.ModelForm):
             'is_active': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
         }
 
-class TuitionClassForm(forms.ModelForm):
+class TuitionClassForm(CachedChoicesMixin, forms.ModelForm):
+    cached_choice_fields = {'class_teacher': TEACHER_CHOICES}
+
     class Meta:
         model = TuitionClass
         fields = [
@@ -57,7 +65,9 @@ class SubjectForm(forms.ModelForm):
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 2}),
         }
 
-class SubjectAssignmentForm(forms.ModelForm):
+class SubjectAssignmentForm(CachedChoicesMixin, forms.ModelForm):
+    cached_choice_fields = {'subject': SUBJECT_CHOICES, 'teacher': TEACHER_CHOICES}
+
     class Meta:
         model = SubjectAssignment
         fields = ['assign_id','subject','teacher','start_date','end_date','notes']
@@ -79,7 +89,9 @@ class SubjectAssignmentForm(forms.ModelForm):
         subject = cleaned.get('subject')
         teacher = cleaned.get('teacher')
 
-class StudentForm(forms.ModelForm):
+class StudentForm(CachedChoicesMixin, forms.ModelForm):
+    cached_choice_fields = {'current_class': CLASS_CHOICES}
+
     class Meta:
         model = Student
         fields = [
@@ -117,12 +129,15 @@ class GuardianForm(forms.ModelForm):
             'is_primary': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
         }
 
-class EnrollmentForm(forms.ModelForm):
+class EnrollmentForm(CachedChoicesMixin, forms.ModelForm):
+    cached_choice_fields = {'tuition_class': CLASS_CHOICES}
+
     class Meta:
         model = Enrollment
         fields = ['student','tuition_class','start_date','end_date','active','fee_override']
         widgets = {
-            'student': forms.Select(attrs={'class': 'form-control'}),
+            # every student in the school: search as you type instead of one huge <select>
+            'student': StudentAutocompleteWidget(attrs={'class': 'form-control'}),
             'tuition_class': forms.Select(attrs={'class': 'form-control'}),
             'start_date': DATE_WIDGET,
             'end_date': DATE_WIDGET,
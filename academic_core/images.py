@@ -0,0 +1,135 @@
+# academic_core/images.py
+"""
+Resized derivatives of profile photos (Student / Teacher).
+
+Phone-camera originals are several MB; pages and API clients should use a
+derivative instead:
+
+    derivative_url(student.profile_photo, 'small')          -> '/media/derivatives/ab/ab12...webp'
+    srcset(student.profile_photo)                           -> '... 64w, ... 160w, ... 480w'
+
+Sizes come from settings.IMAGE_DERIVATIVE_SIZES (longest edge in px, never
+upscaled). Derivatives are built with Pillow when a photo is uploaded
+(build_derivatives(), from the pre_save / post_save receivers in signals.py;
+`manage.py build_photo_derivatives` backfills older photos) and stored under
+derivatives/ in the default storage. Rendering never decodes an image:
+derivative_url() only looks the file up and falls back to the original
+when it is missing. The file name is a hash of the original's stored name
+and byte size plus the size / format / quality, so a new upload (or a
+changed setting) gets a new URL and the old files can be served with
+far-future cache headers.
+"""
+import hashlib
+import io
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIR = 'derivatives'
+
+_PIL_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+
+def sizes():
+    return getattr(settings, 'IMAGE_DERIVATIVE_SIZES', {'thumb': 64, 'small': 160, 'medium': 480})
+
+
+def default_format():
+    fmt = getattr(settings, 'IMAGE_DERIVATIVE_FORMAT', 'webp')
+    if fmt == 'webp' and not features.check('webp'):
+        return 'jpeg'
+    return fmt
+
+
+def _quality():
+    return getattr(settings, 'IMAGE_DERIVATIVE_QUALITY', 80)
+
+
+def derivative_name(name, original_size, px, fmt, quality):
+    key = hashlib.sha1(f'{name}:{original_size}:{px}:{fmt}:{quality}'.encode()).hexdigest()
+    return f'{DERIVATIVE_DIR}/{key[:2]}/{key}.{"jpg" if fmt == "jpeg" else fmt}'
+
+
+def render(fileobj, px, fmt, quality):
+    """Downscale an image file to fit `px` x `px` and encode it; returns bytes."""
+    with Image.open(fileobj) as img:
+        img = ImageOps.exif_transpose(img)  # phone photos are often stored rotated
+        img.thumbnail((px, px), Image.Resampling.LANCZOS)
+        if img.mode not in ('RGB', 'RGBA') or fmt == 'jpeg':
+            img = img.convert('RGB')
+        out = io.BytesIO()
+        img.save(out, _PIL_FORMATS[fmt], quality=quality, optimize=True)
+    return out.getvalue()
+
+
+def build_derivatives(fieldfile, fmt=None):
+    """
+    Build every configured size of an ImageField value that is not on disk
+    yet. Returns the number built; an unreadable original is logged and
+    skipped (pages then use the original).
+    """
+    if not fieldfile:
+        return 0
+    storage = default_storage
+    fmt, quality = fmt or default_format(), _quality()
+    built = 0
+    try:
+        original_size = storage.size(fieldfile.name)
+        for px in sizes().values():
+            target = derivative_name(fieldfile.name, original_size, px, fmt, quality)
+            if storage.exists(target):
+                continue
+            with storage.open(fieldfile.name, 'rb') as original:
+                data = render(original, px, fmt, quality)
+            storage.save(target, ContentFile(data))
+            built += 1
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning("Could not build derivatives of %s", fieldfile.name, exc_info=True)
+    return built
+
+
+@lru_cache(maxsize=4096)
+def _existing(name, px, fmt, quality):
+    """Storage name of a derivative that is on disk; FileNotFoundError (not cached) if it is not."""
+    target = derivative_name(name, default_storage.size(name), px, fmt, quality)
+    if not default_storage.exists(target):
+        raise FileNotFoundError(target)
+    return target
+
+
+def _derivative(fieldfile, size, fmt):
+    if size not in sizes():
+        raise ValueError(f"Unknown image size '{size}'. Choose from: {', '.join(sizes())}")
+    try:
+        return _existing(fieldfile.name, sizes()[size], fmt or default_format(), _quality())
+    except OSError:
+        return None
+
+
+def derivative_url(fieldfile, size='small', fmt=None):
+    """
+    URL of the `size` derivative of an ImageField value; '' when there is no
+    photo, the original's URL when the derivative has not been built.
+    """
+    if not fieldfile:
+        return ''
+    name = _derivative(fieldfile, size, fmt)
+    return default_storage.url(name) if name else fieldfile.url
+
+
+def srcset(fieldfile, fmt=None):
+    """`srcset` attribute value listing every configured size that has been built."""
+    if not fieldfile:
+        return ''
+    entries = []
+    for size, px in sorted(sizes().items(), key=lambda item: item[1]):
+        name = _derivative(fieldfile, size, fmt)
+        if name:
+            entries.append(f'{default_storage.url(name)} {px}w')
+    return ', '.join(entries)
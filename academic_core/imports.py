@@ -0,0 +1,194 @@
+# academic_core/imports.py
+"""
+Bulk CSV import of students with their guardians.
+
+One CSV row per guardian: the student columns come first, guardian columns
+are prefixed with `guardian_`. Repeat a reg_no on several rows to give a
+student more than one guardian (student columns are taken from the first
+row). `class_id` picks the current class. Rows with a blank reg_no are
+each a new student; their reg_nos are reserved from the 'student' ID
+series (sequences.py) in one batch when the file is written.
+
+    reg_no,first_name,last_name,class_id,...,guardian_name,guardian_relationship,guardian_phone,...
+
+The whole file is validated in memory first (same field rules as
+StudentForm / GuardianForm, without their per-row queries): one query for
+existing reg_nos, one for the class_id -> TuitionClass map. The one primary
+guardian rule from StudentCreateView is applied in Python, then everything
+is written with chunked bulk_create inside a single transaction.
+"""
+import csv
+from collections import namedtuple
+
+from django import forms
+from django.db import transaction
+from django.forms.models import fields_for_model
+
+from .models import Student, Guardian, TuitionClass
+from . import caching, search, sequences
+from .conditional import bump
+
+STUDENT_FIELDS = [
+    'reg_no', 'first_name', 'last_name', 'dob', 'joined_date', 'nic', 'school', 'gender',
+    'address', 'phone', 'whatsapp', 'email', 'is_active',
+]
+GUARDIAN_FIELDS = ['name', 'relationship', 'phone', 'whatsapp', 'email', 'is_primary']
+GUARDIAN_PREFIX = 'guardian_'
+
+_FALSE = ('', '0', 'false', 'no', 'n', 'off')
+
+RowError = namedtuple('RowError', ['line', 'reg_no', 'field', 'message'])
+ImportResult = namedtuple('ImportResult', ['students', 'guardians', 'errors', 'written'])
+
+
+def _row_form(model, field_names):
+    """Plain Form with the model's field rules (no ModelChoiceField / unique queries)."""
+    fields = fields_for_model(model, fields=field_names)
+    for name, field in fields.items():
+        if model._meta.get_field(name).has_default():
+            field.required = False  # blank cell -> model default
+    return type(f'{model.__name__}RowForm', (forms.Form,), fields)
+
+
+StudentRowForm = _row_form(Student, STUDENT_FIELDS)
+StudentRowForm.base_fields['reg_no'].required = False  # blank -> generated on import
+GuardianRowForm = _row_form(Guardian, GUARDIAN_FIELDS)
+
+
+def _clean(form_class, model, data):
+    """Validate one row; returns (cleaned kwargs, {field: [messages]})."""
+    data = {k: v.strip() for k, v in data.items() if v is not None}
+    form_data = dict(data)
+    for name, field in form_class.base_fields.items():
+        if isinstance(field, forms.BooleanField) and name in form_data:
+            form_data[name] = form_data[name].lower() not in _FALSE
+    form = form_class(data=form_data)
+    if not form.is_valid():
+        return None, form.errors
+    cleaned = {}
+    for name, value in form.cleaned_data.items():
+        if data.get(name, '') == '' and model._meta.get_field(name).has_default():
+            continue
+        cleaned[name] = value
+    return cleaned, {}
+
+
+def parse_csv(fileobj):
+    """Yield (line_no, row dict) from a text-mode CSV file."""
+    reader = csv.DictReader(fileobj)
+    for row in reader:
+        if any((v or '').strip() for v in row.values()):
+            yield reader.line_num, row
+
+
+def validate_rows(rows):
+    """
+    Validate parsed rows. Returns (students, errors) where `students` maps
+    reg_no -> (Student, [Guardian, ...]) for every student without errors.
+    """
+    rows = list(rows)
+    reg_nos = {(row.get('reg_no') or '').strip() for _, row in rows} - {''}
+    class_ids = {(row.get('class_id') or '').strip() for _, row in rows} - {''}
+
+    existing = set(Student.objects.filter(reg_no__in=reg_nos).values_list('reg_no', flat=True))
+    classes = dict(TuitionClass.objects.filter(class_id__in=class_ids).values_list('class_id', 'pk'))
+
+    students = {}
+    guardians = {}
+    errors = []
+    bad = set()
+
+    for line, row in rows:
+        # a blank reg_no starts a new student on every row; keyed by line until one is reserved
+        reg_no = (row.get('reg_no') or '').strip() or f'#{line}'
+        if reg_no not in students and reg_no not in bad:
+            student_data, student_errors = _clean(
+                StudentRowForm, Student, {f: row.get(f, '') for f in STUDENT_FIELDS}
+            )
+            for field, messages in student_errors.items():
+                errors.extend(RowError(line, reg_no, field, m) for m in messages)
+            class_id = (row.get('class_id') or '').strip()
+            if reg_no in existing:
+                errors.append(RowError(line, reg_no, 'reg_no', 'Student with this Reg no already exists.'))
+            if class_id and class_id not in classes:
+                errors.append(RowError(line, reg_no, 'class_id', f"Unknown class '{class_id}'."))
+            if student_errors or reg_no in existing or (class_id and class_id not in classes):
+                bad.add(reg_no)
+                continue
+            students[reg_no] = Student(current_class_id=classes.get(class_id), **student_data)
+            guardians[reg_no] = []
+
+        if reg_no in bad:
+            continue
+        guardian_row = {f: row.get(GUARDIAN_PREFIX + f, '') for f in GUARDIAN_FIELDS}
+        if not any((v or '').strip() for v in guardian_row.values()):
+            continue
+        guardian_row['relationship'] = (guardian_row['relationship'] or '').strip().lower()
+        guardian_data, guardian_errors = _clean(GuardianRowForm, Guardian, guardian_row)
+        if guardian_errors:
+            for field, messages in guardian_errors.items():
+                errors.extend(RowError(line, reg_no, GUARDIAN_PREFIX + field, m) for m in messages)
+            bad.add(reg_no)
+            continue
+        guardians[reg_no].append(Guardian(**guardian_data))
+
+    for reg_no in list(students):
+        if reg_no in bad:
+            del students[reg_no]
+        elif not guardians[reg_no]:
+            errors.append(RowError(None, reg_no, GUARDIAN_PREFIX + 'name', 'Please add at least one guardian.'))
+            del students[reg_no]
+
+    # exactly one primary guardian per student (first marked one wins, else the first listed)
+    for reg_no in students:
+        rows_for_student = guardians[reg_no]
+        primary = next((g for g in rows_for_student if g.is_primary), rows_for_student[0])
+        for g in rows_for_student:
+            g.is_primary = g is primary
+
+    return {reg_no: (students[reg_no], guardians[reg_no]) for reg_no in students}, errors
+
+
+def import_students(fileobj, dry_run=False, skip_invalid=False, batch_size=1000):
+    """
+    Import students + guardians from a CSV file object (text mode).
+
+    Nothing is written if any row has errors, unless `skip_invalid` is set,
+    in which case the valid students are imported and the rest reported.
+    Returns ImportResult(students, guardians, errors, written). A file that
+    is not UTF-8 is reported as a single file-level error.
+    """
+    try:
+        rows = list(parse_csv(fileobj))
+    except UnicodeDecodeError as exc:
+        message = f'The file is not UTF-8 encoded text (byte {exc.start}); save it as "CSV UTF-8" and retry.'
+        return ImportResult(0, 0, [RowError(None, '', 'file', message)], False)
+    valid, errors = validate_rows(rows)
+    n_guardians = sum(len(gs) for _, gs in valid.values())
+    if dry_run or not valid or (errors and not skip_invalid):
+        return ImportResult(len(valid), n_guardians, errors, False)
+
+    with transaction.atomic():
+        students = [s for s, _ in valid.values()]
+        unnumbered = [s for s in students if not s.reg_no]
+        for student, reg_no in zip(unnumbered, sequences.reserve('student', len(unnumbered))):
+            student.reg_no = reg_no
+        Student.objects.bulk_create(students, batch_size=batch_size)
+        new_guardians = []
+        for student, gs in valid.values():
+            for g in gs:
+                g.student_id = student.pk
+                new_guardians.append(g)
+        Guardian.objects.bulk_create(new_guardians, batch_size=batch_size)
+        # bulk_create skips post_save, so refresh the search index explicitly
+        search.index_students([s.pk for s in students], batch_size=batch_size)
+        bump(Student, Guardian)
+        caching.invalidate(Student, Guardian)
+    return ImportResult(len(students), len(new_guardians), errors, True)
+
+
+def write_error_report(errors, fileobj):
+    writer = csv.writer(fileobj)
+    writer.writerow(['line', 'reg_no', 'field', 'message'])
+    for e in errors:
+        writer.writerow(['' if e.line is None else e.line, e.reg_no, e.field, e.message])
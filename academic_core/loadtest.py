@@ -0,0 +1,262 @@
+# academic_core/loadtest.py
+"""
+Concurrent-connection load test: the async API under ASGI against the sync
+API under a threaded WSGI worker, in one process.
+
+- asgi: `concurrency` connections driven straight into Django's ASGIHandler
+  (what uvicorn / daphne call), each request in its own task
+- wsgi: the same connections queued onto a pool of `threads` workers calling
+  WSGIHandler, like `gunicorn --threads N`; connections beyond the pool wait
+- http: a running server at `url` (e.g. uvicorn core.asgi:application vs
+  gunicorn core.wsgi), over plain HTTP/1.1 sockets
+
+Each mode reports throughput, latency (queueing included) and the peak
+number of requests being handled at once. On a local SQLite file queries
+take microseconds; `db_latency` adds a sleep to every query to stand in for
+a database across the network, which is where a fixed thread pool runs out.
+"""
+import asyncio
+import io
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+HOST = 'testserver'
+
+
+class _InFlight:
+    """Counts requests currently inside the application and remembers the peak."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+
+def summarise(mode, latencies, statuses, elapsed, peak, **extra):
+    latencies = sorted(latencies) or [0.0]
+    errors = sum(1 for s in statuses if not 200 <= s < 400)
+    return {
+        'mode': mode,
+        'requests': len(statuses),
+        'errors': errors,
+        'seconds': elapsed,
+        'requests_per_sec': len(statuses) / elapsed if elapsed else 0.0,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'peak_in_flight': peak,
+        **extra,
+    }
+
+
+@contextmanager
+def simulated_db_latency(seconds):
+    """Sleep `seconds` before every query on every connection, including ones opened later."""
+    if not seconds:
+        yield
+        return
+
+    def slow(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if slow not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow)
+
+    connection_created.connect(install)
+    for conn in connections.all(initialized_only=True):
+        install(None, conn)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(install)
+        for conn in connections.all(initialized_only=True):
+            if slow in conn.execute_wrappers:
+                conn.execute_wrappers.remove(slow)
+
+
+@contextmanager
+def _app_settings():
+    # the handlers' host, no query budget bookkeeping (as in production), and no
+    # slow-request warning for every queued request
+    with override_settings(ALLOWED_HOSTS=[HOST], QUERY_BUDGET_MODE='off', METRICS_SLOW_REQUEST_MS=float('inf')):
+        yield
+
+
+def _split(path):
+    path, _, query = path.partition('?')
+    return path, query
+
+
+# -----------------------
+# ASGI
+# -----------------------
+async def _asgi_get(app, path):
+    path, query = _split(path)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'headers': [(b'host', HOST.encode())],
+        'client': ('127.0.0.1', 40000), 'server': (HOST, 80),
+    }
+    request_sent = False
+    status = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()  # the client never disconnects early
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await app(scope, receive, send)
+    return status[0] if status else 500
+
+
+async def _asgi(paths, requests, concurrency):
+    with _app_settings():
+        app = ASGIHandler()
+        in_flight = _InFlight()
+        queue = iter(range(requests))
+        latencies, statuses = [], []
+
+        async def connection():
+            for i in queue:
+                started = time.perf_counter()
+                with in_flight:
+                    statuses.append(await _asgi_get(app, paths[i % len(paths)]))
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(connection() for _ in range(concurrency)))
+        return summarise('asgi', latencies, statuses, time.perf_counter() - started, in_flight.peak,
+                         concurrency=concurrency, paths=paths)
+
+
+def run_asgi(paths, requests, concurrency):
+    return asyncio.run(_asgi(paths, requests, concurrency))
+
+
+# -----------------------
+# WSGI
+# -----------------------
+def _wsgi_get(app, path):
+    path, query = _split(path)
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'HTTP_HOST': HOST, 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1', 'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(b''), 'wsgi.errors': sys.stderr, 'wsgi.multithread': True,
+        'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    status = []
+
+    def start_response(line, headers, exc_info=None):
+        status.append(int(line.split(' ', 1)[0]))
+
+    body = app(environ, start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return status[0]
+
+
+def run_wsgi(paths, requests, concurrency, threads):
+    """`concurrency` clients submit at once; `threads` workers serve them (the rest queue)."""
+    with _app_settings():
+        app = WSGIHandler()
+        in_flight = _InFlight()
+
+        def serve(i, submitted):
+            with in_flight:
+                status = _wsgi_get(app, paths[i % len(paths)])
+            return status, time.perf_counter() - submitted
+
+        latencies, statuses = [], []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            pending = set()
+            for i in range(requests):
+                # at most `concurrency` open connections; each waits for a free worker
+                if len(pending) >= concurrency:
+                    done = next(iter(pending))
+                    done.result()
+                    pending = {f for f in pending if not f.done()}
+                future = pool.submit(serve, i, time.perf_counter())
+                future.add_done_callback(lambda f: (statuses.append(f.result()[0]),
+                                                    latencies.append(f.result()[1])))
+                pending.add(future)
+        elapsed = time.perf_counter() - started
+        return summarise('wsgi', latencies, statuses, elapsed, in_flight.peak,
+                         concurrency=concurrency, threads=threads, paths=paths)
+
+
+# -----------------------
+# HTTP (a running server)
+# -----------------------
+async def _http_get(scheme, host, port, target):
+    reader, writer = await asyncio.open_connection(host, port, ssl=scheme == 'https')
+    try:
+        writer.write(f'GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    parts = status_line.split()
+    return int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 599
+
+
+async def _http(url, paths, requests, concurrency):
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    prefix = parts.path.rstrip('/')
+    in_flight = _InFlight()
+    queue = iter(range(requests))
+    latencies, statuses = [], []
+
+    async def connection():
+        for i in queue:
+            started = time.perf_counter()
+            with in_flight:
+                try:
+                    statuses.append(await _http_get(parts.scheme, parts.hostname, port, prefix + paths[i % len(paths)]))
+                except OSError:
+                    statuses.append(599)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(concurrency)))
+    return summarise('http', latencies, statuses, time.perf_counter() - started, in_flight.peak,
+                     concurrency=concurrency, url=url, paths=paths)
+
+
+def run_http(url, paths, requests, concurrency):
+    return asyncio.run(_http(url, paths, requests, concurrency))
@@ -0,0 +1,18 @@
+# academic_core/management/commands/build_photo_derivatives.py
+from django.core.management.base import BaseCommand
+
+from academic_core import images
+from academic_core.models import Student, Teacher
+
+
+class Command(BaseCommand):
+    help = 'Build the resized derivatives of every student / teacher profile photo that lacks them'
+
+    def handle(self, *args, **options):
+        built = photos = 0
+        for model in (Student, Teacher):
+            for instance in model.objects.exclude(profile_photo='').exclude(profile_photo__isnull=True).only(
+                    'pk', 'profile_photo').iterator(chunk_size=500):
+                photos += 1
+                built += images.build_derivatives(instance.profile_photo)
+        self.stdout.write(self.style.SUCCESS(f'Photo derivatives built. photos={photos} files={built}'))
@@ -0,0 +1,166 @@
+# academic_core/management/commands/check_database.py
+import json
+import random
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import F
+
+from academic_core.models import IdSequence, Student
+
+BENCH_KEY = 'check_database:bench'
+
+# PRAGMA -> value core/database.py asks for (None: only reported)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 1,  # NORMAL
+    'busy_timeout': None,
+    'mmap_size': None,
+    'temp_store': 2,  # MEMORY
+}
+
+COMPARE_FIELDS = ('ops_per_sec', 'writes_per_sec', 'p50_ms', 'p95_ms', 'max_ms', 'errors')
+
+
+class Command(BaseCommand):
+    help = (
+        'Show the active database profile (SQLite PRAGMAs / Postgres connection settings) and, '
+        'with --bench, measure mixed read/write throughput under concurrent workers. Save runs '
+        'with --json and compare profiles with --compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bench', action='store_true', help='Run the throughput benchmark')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--write-ratio', type=float, default=0.3,
+                            help='Share of operations that are write transactions (default 0.3)')
+        parser.add_argument('--json', dest='json_path', help='Write the benchmark result to this file')
+        parser.add_argument('--compare', help='Earlier --json result to compare against')
+
+    def handle(self, *args, **options):
+        self.report_profile()
+        if not options['bench']:
+            return
+        if options['threads'] < 1 or options['seconds'] <= 0:
+            raise CommandError('--threads must be >= 1 and --seconds > 0')
+
+        result = bench(options['threads'], options['seconds'], options['write_ratio'])
+        self.report_bench(result)
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(result, fh, indent=2)
+        if options['compare']:
+            with open(options['compare']) as fh:
+                self.report_compare(result, json.load(fh))
+
+    # -----------------------
+    # Profile
+    # -----------------------
+    def report_profile(self):
+        db = settings.DATABASES['default']
+        self.stdout.write(f"vendor: {connection.vendor}  name: {db['NAME']}")
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                for pragma, expected in SQLITE_PRAGMAS.items():
+                    row = cursor.execute(f'PRAGMA {pragma}').fetchone()
+                    value = row[0] if row else None  # e.g. mmap_size on an in-memory database
+                    flag = '' if expected is None or value == expected else f'  (expected {expected})'
+                    self.stdout.write(f'  {pragma} = {value}{flag}')
+            self.stdout.write(f"  transaction_mode = {db.get('OPTIONS', {}).get('transaction_mode', 'DEFERRED')}")
+        else:
+            pool = db.get('OPTIONS', {}).get('pool')
+            self.stdout.write(f"  CONN_MAX_AGE = {db.get('CONN_MAX_AGE', 0)}  "
+                              f"CONN_HEALTH_CHECKS = {db.get('CONN_HEALTH_CHECKS', False)}  "
+                              f"pool = {pool or 'off'}")
+            with connection.cursor() as cursor:
+                cursor.execute('SHOW server_version')
+                self.stdout.write(f'  server_version = {cursor.fetchone()[0]}')
+
+    # -----------------------
+    # Output
+    # -----------------------
+    def report_bench(self, r):
+        self.stdout.write(
+            f"{r['threads']} workers x {r['seconds']}s: {r['ops']} ops "
+            f"({r['reads']} reads, {r['writes']} writes, {r['errors']} lock errors)\n"
+            f"  {r['ops_per_sec']:.0f} ops/s, {r['writes_per_sec']:.0f} writes/s, "
+            f"latency p50 {r['p50_ms']:.2f} ms / p95 {r['p95_ms']:.2f} ms / max {r['max_ms']:.2f} ms"
+        )
+
+    def report_compare(self, current, other):
+        self.stdout.write(f"{'':16}{current['vendor']:>12}{other['vendor']:>12}{'ratio':>8}")
+        for field in COMPARE_FIELDS:
+            a, b = current[field], other[field]
+            ratio = f'{a / b:.2f}' if b else '-'
+            self.stdout.write(f'{field:16}{a:>12.2f}{b:>12.2f}{ratio:>8}')
+
+
+def _worker(deadline, write_ratio, seed, results, own_connection):
+    rnd = random.Random(seed)
+    latencies, reads, writes, errors = [], 0, 0, 0
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if rnd.random() < write_ratio:
+                    # a short read-then-write transaction, like a card scan or a form post
+                    with transaction.atomic():
+                        IdSequence.objects.filter(key=BENCH_KEY).values_list('next_value', flat=True).get()
+                        IdSequence.objects.filter(key=BENCH_KEY).update(next_value=F('next_value') + 1)
+                    writes += 1
+                else:
+                    list(Student.objects.order_by('pk').values_list('pk', 'reg_no')[:50])
+                    reads += 1
+            except OperationalError:  # "database is locked" and friends
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+    finally:
+        if own_connection:
+            connections.close_all()
+        results.append((latencies, reads, writes, errors))
+
+
+def bench(threads, seconds, write_ratio):
+    """Run `threads` workers for `seconds`; returns a JSON-able summary."""
+    IdSequence.objects.update_or_create(key=BENCH_KEY, defaults={'next_value': 1})
+    results = []
+    deadline = time.perf_counter() + seconds
+    try:
+        if threads == 1:
+            _worker(deadline, write_ratio, 0, results, own_connection=False)
+        else:
+            workers = [
+                threading.Thread(target=_worker, args=(deadline, write_ratio, i, results, True))
+                for i in range(threads)
+            ]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+    finally:
+        IdSequence.objects.filter(key=BENCH_KEY).delete()
+
+    latencies = sorted(t for lat, *_ in results for t in lat) or [0.0]
+    reads = sum(r[1] for r in results)
+    writes = sum(r[2] for r in results)
+    ops = reads + writes
+    return {
+        'vendor': connection.vendor,
+        'threads': threads,
+        'seconds': seconds,
+        'write_ratio': write_ratio,
+        'ops': ops,
+        'reads': reads,
+        'writes': writes,
+        'errors': sum(r[3] for r in results),
+        'ops_per_sec': ops / seconds,
+        'writes_per_sec': writes / seconds,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
@@ -0,0 +1,49 @@
+# academic_core/management/commands/export_data.py
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academic_core import exports
+
+
+class Command(BaseCommand):
+    help = 'Stream students / guardians / enrollments / classes to CSV or XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(exports.EXPORTS))
+        parser.add_argument('--format', choices=sorted(exports.FORMATS), default='csv')
+        parser.add_argument('--columns', help='Comma separated column names (default: all)')
+        parser.add_argument('--class', dest='class_id', help='Only rows for this TuitionClass class_id')
+        parser.add_argument('--active', choices=['0', '1'], help='Only active (1) or inactive (0) rows')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+
+    def handle(self, *args, **options):
+        columns = [c for c in (options['columns'] or '').split(',') if c]
+        filters = {'class': options['class_id'], 'active': options['active']}
+        try:
+            header, rows = exports.export_rows(
+                options['name'], columns=columns, filters=filters, chunk_size=options['chunk_size']
+            )
+        except exports.ExportError as exc:
+            raise CommandError(str(exc))
+
+        _, encoder = exports.FORMATS[options['format']]
+        binary = options['format'] == 'xlsx'
+        if options['output']:
+            out = open(options['output'], 'wb') if binary else open(options['output'], 'w', newline='', encoding='utf-8')
+            write = out.write
+        elif binary:
+            write = sys.stdout.buffer.write
+        else:
+            def write(chunk):
+                # OutputWrapper would add a newline to every chunk not ending in one (the BOM)
+                self.stdout.write(chunk, ending='')
+        try:
+            for chunk in encoder(header, rows):
+                write(chunk)
+        finally:
+            if options['output']:
+                out.close()
+        if options['output']:
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
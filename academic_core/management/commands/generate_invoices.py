@@ -0,0 +1,32 @@
+# academic_core/management/commands/generate_invoices.py
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from academic_core.billing import generate_invoices
+
+
+class Command(BaseCommand):
+    help = 'Generate (or rebuild) the open invoices for a month from TuitionClass fee rules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', help='Month to bill as YYYY-MM (default: current month)')
+        parser.add_argument('--dry-run', action='store_true', help='Compute and report without writing')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['period']:
+            try:
+                period = datetime.strptime(options['period'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--period must look like YYYY-MM')
+        else:
+            period = timezone.localdate()
+
+        summary = generate_invoices(period, dry_run=options['dry_run'], batch_size=options['batch_size'])
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{summary['period']:%Y-%m}: invoices={summary['invoices']} lines={summary['lines']} "
+            f"total={summary['total']} skipped_locked={summary['skipped_locked']}"
+        ))
@@ -0,0 +1,48 @@
+# academic_core/management/commands/import_students.py
+from django.core.management.base import BaseCommand, CommandError
+
+from academic_core.imports import import_students, write_error_report
+
+
+class Command(BaseCommand):
+    help = 'Bulk import students (with guardians) from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without writing')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Import the valid students even if other rows have errors')
+        parser.add_argument('--errors', help='Write the per-row error report to this CSV file')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], encoding='utf-8-sig', newline='') as fh:
+                result = import_students(
+                    fh, dry_run=options['dry_run'], skip_invalid=options['skip_invalid'],
+                    batch_size=options['batch_size'],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        if options['errors'] and result.errors:
+            with open(options['errors'], 'w', encoding='utf-8', newline='') as fh:
+                write_error_report(result.errors, fh)
+        for e in result.errors[:50]:
+            self.stderr.write(f"line {e.line or '-'} [{e.reg_no}] {e.field}: {e.message}")
+        if len(result.errors) > 50:
+            self.stderr.write(f"... {len(result.errors) - 50} more error(s)")
+
+        if result.written:
+            self.stdout.write(self.style.SUCCESS(
+                f"Imported {result.students} student(s), {result.guardians} guardian(s); "
+                f"{len(result.errors)} error(s)"
+            ))
+        elif options['dry_run'] and not result.errors:
+            self.stdout.write(self.style.SUCCESS(
+                f"[dry-run] {result.students} student(s), {result.guardians} guardian(s) valid"
+            ))
+        else:
+            raise CommandError(
+                f"Nothing imported: {len(result.errors)} error(s), {result.students} valid student(s)"
+            )
@@ -0,0 +1,67 @@
+# academic_core/management/commands/load_test_api.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academic_core import loadtest
+
+ASGI_PATHS = ['/api/async/students/?page_size=20', '/api/async/enrollments/?page_size=20',
+              '/api/async/dashboard/stats/']
+WSGI_PATHS = ['/api/v1/students/?page_size=20', '/api/v1/enrollments/?page_size=20', '/dashboard/stats/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Open many concurrent connections against the async API under ASGI and the sync API under a '
+        'threaded WSGI worker, in this process, and report throughput, latency and how many requests '
+        'each served at once. --db-latency adds a delay to every query (a database across the network). '
+        'With --url, load a running server instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=('both', 'asgi', 'wsgi'), default='both')
+        parser.add_argument('--concurrency', type=int, default=100, help='Open connections (default 100)')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per mode (default 1000)')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='WSGI worker threads, as gunicorn --threads (default 8)')
+        parser.add_argument('--db-latency', type=float, default=0.0, metavar='MS',
+                            help='Milliseconds added to every query (default 0)')
+        parser.add_argument('--path', action='append', default=[],
+                            help='Path to request, for both modes (repeatable; default: students, enrollments '
+                                 'and dashboard stats from /api/async/ and /api/v1/)')
+        parser.add_argument('--url', help='Load a running server at this base URL instead, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--json', dest='json_path', help='Write the results to this file')
+
+    def handle(self, *args, **options):
+        concurrency, requests = options['concurrency'], options['requests']
+        if concurrency < 1 or requests < 1 or options['threads'] < 1 or options['db_latency'] < 0:
+            raise CommandError('--concurrency, --requests and --threads must be >= 1, --db-latency >= 0')
+
+        self.stdout.write(f"{'mode':8}{'req/s':>10}{'p50':>10}{'p95':>10}{'max':>10}{'in flight':>11}{'errors':>8}")
+        results = []
+        if options['url']:
+            if not options['url'].startswith(('http://', 'https://')):
+                raise CommandError('--url must start with http:// or https://')
+            paths = options['path'] or ASGI_PATHS
+            results.append(loadtest.run_http(options['url'], paths, requests, concurrency))
+            self.report(results[-1])
+        else:
+            with loadtest.simulated_db_latency(options['db_latency'] / 1000):
+                if options['mode'] in ('both', 'asgi'):
+                    results.append(loadtest.run_asgi(options['path'] or ASGI_PATHS, requests, concurrency))
+                    self.report(results[-1])
+                if options['mode'] in ('both', 'wsgi'):
+                    results.append(loadtest.run_wsgi(options['path'] or WSGI_PATHS, requests, concurrency,
+                                                     options['threads']))
+                    self.report(results[-1])
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'db_latency_ms': options['db_latency'], 'results': results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved to {options['json_path']}"))
+        if any(r['errors'] for r in results):
+            self.stderr.write(self.style.WARNING('Some requests failed (status >= 400).'))
+
+    def report(self, r):
+        self.stdout.write(f"{r['mode']:8}{r['requests_per_sec']:>10.1f}{r['p50_ms']:>8.1f}ms{r['p95_ms']:>8.1f}ms"
+                          f"{r['max_ms']:>8.1f}ms{r['peak_in_flight']:>11}{r['errors']:>8}")
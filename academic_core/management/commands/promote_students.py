@@ -1,21 +1,59 @@
 # academic_core/management/commands/promote_students.py
-from django.core.management.base import BaseCommand
-from academic_core.models import Student
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from datetime import timedelta
+
+from academic_core.models import Student
+from academic_core.promotion import PromotionError, parse_sequence, promote
+
 
 class Command(BaseCommand):
-    help = 'Promote students annually based on joined_date (skeleton)'
+    help = 'Promote students to the next class (set-based, one transaction per class)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--map', action='append', default=[], metavar='FROM:TO',
+                            help='Promote class_id FROM to TO; leave TO empty to graduate, closing all '
+                                 'of the students\' enrollments (repeatable)')
+        parser.add_argument('--sequence', action='append', default=[], metavar='C1,C2,...',
+                            help='Ordered class_ids; each promotes to the next, the last graduates (repeatable)')
+        parser.add_argument('--date', help='Effective date YYYY-MM-DD (default: today)')
+        parser.add_argument('--dry-run', action='store_true', help='Show what would change without writing')
 
     def handle(self, *args, **options):
-        today = timezone.now().date()
-        promoted = 0
-        # Implement your graduation/promotion logic here.
-        # This skeleton does not auto-modify grade fields (add grade field if you want).
-        students = Student.objects.all()
-        for s in students:
-            # placeholder logic example:
-            # if (today - s.joined_date).days >= 365:
-            #    perform promotion action
-            pass
-        self.stdout.write(self.style.SUCCESS(f'Promote students script executed. examined={students.count()}'))
+        mapping = {}
+        for sequence in options['sequence']:
+            mapping.update(parse_sequence(sequence))
+        for item in options['map']:
+            source, sep, target = item.partition(':')
+            if not sep or not source.strip():
+                raise CommandError(f"--map expects FROM:TO, got '{item}'")
+            mapping[source.strip()] = target.strip() or None
+        if not mapping:
+            raise CommandError('Give at least one --map or --sequence')
+
+        if options['date']:
+            try:
+                on_date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--date must look like YYYY-MM-DD')
+        else:
+            on_date = timezone.localdate()
+
+        try:
+            steps = promote(mapping, on_date, dry_run=options['dry_run'])
+        except PromotionError as exc:
+            raise CommandError(str(exc))
+
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        for step in steps:
+            target = step.target.class_id if step.target else '(graduate)'
+            self.stdout.write(
+                f"{prefix}{step.source.class_id} -> {target}: students={len(step.students)} "
+                f"enrollments closed={step.closed} opened={step.opened}"
+            )
+            if options['verbosity'] >= 2 and step.students:
+                reg_nos = Student.objects.filter(pk__in=step.students).values_list('reg_no', flat=True)
+                self.stdout.write('    ' + ', '.join(reg_nos))
+        total = sum(len(s.students) for s in steps)
+        self.stdout.write(self.style.SUCCESS(f"{prefix}{total} student(s) across {len(steps)} class(es)"))
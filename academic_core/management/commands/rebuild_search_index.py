@@ -0,0 +1,19 @@
+# academic_core/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from academic_core import search
+from academic_core.models import SearchEntry
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the student / guardian search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            SearchEntry.objects.all().delete()
+            count = search.index_students(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt. entries={count}'))
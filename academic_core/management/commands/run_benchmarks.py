@@ -0,0 +1,70 @@
+# academic_core/management/commands/run_benchmarks.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academic_core import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the hot pages, API lists, search and the delete-with-reassign / student create flows '
+        'against the current database (fill it with seed_synthetic_school first). Nothing is changed: '
+        'the run is rolled back. Save results with --json and compare commits with --compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per case (default 10)')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed runs per case first (default 2)')
+        parser.add_argument('--only', action='append', default=[], metavar='PATTERN',
+                            help='Run matching cases only, e.g. --only "api_*" (repeatable)')
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every timed run')
+        parser.add_argument('--list', action='store_true', help='List the cases and exit')
+        parser.add_argument('--label', default='', help='Free text stored with the result')
+        parser.add_argument('--json', dest='json_path', help='Write the result to this file')
+        parser.add_argument('--compare', help='Earlier --json result to compare against')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['warmup'] < 0:
+            raise CommandError('--repeat must be >= 1 and --warmup >= 0')
+        try:
+            cases = benchmarks.select(benchmarks.default_cases(), options['only'])
+        except benchmarks.BenchmarkError as exc:
+            raise CommandError(str(exc))
+        if not cases:
+            raise CommandError('No case matches --only')
+        if options['list']:
+            for case in cases:
+                self.stdout.write(f'{case.name:32}{case.method.upper():6}{case.path}')
+            return
+
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+
+        self.stdout.write(f"{'case':32}{'median':>10}{'p95':>10}{'max':>10}{'queries':>9}{'bytes':>10}")
+        try:
+            result = benchmarks.run(cases, repeat=options['repeat'], warmup=options['warmup'],
+                                    cold=options['cold'], label=options['label'], progress=self.report_case)
+        except benchmarks.BenchmarkError as exc:
+            raise CommandError(str(exc))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(result, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved to {options['json_path']}"))
+        if baseline is not None:
+            self.report_compare(result, baseline)
+
+    def report_case(self, name, r):
+        self.stdout.write(f"{name:32}{r['median_ms']:>8.1f}ms{r['p95_ms']:>8.1f}ms{r['max_ms']:>8.1f}ms"
+                          f"{r['queries']:>9}{r['bytes']:>10}")
+
+    def report_compare(self, current, baseline):
+        self.stdout.write(f"\nvs {baseline.get('commit') or '?'} {baseline.get('label', '')}".rstrip())
+        self.stdout.write(f"{'case':32}{'before':>10}{'after':>10}{'ratio':>8}{'queries':>12}")
+        for name, before, after, ratio, q_before, q_after in benchmarks.compare(current, baseline):
+            ratio = f'{ratio:.2f}' if ratio is not None else '-'
+            queries = f'{q_before}->{q_after}' if q_before != q_after else str(q_after)
+            self.stdout.write(f'{name:32}{before:>8.1f}ms{after:>8.1f}ms{ratio:>8}{queries:>12}')
@@ -0,0 +1,35 @@
+# academic_core/management/commands/run_notification_worker.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from academic_core.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued notifications (outbox) by sending core.notifications signals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=4, help='Dispatcher threads per batch')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the due messages and exit')
+
+    def handle(self, *args, **options):
+        totals = [0, 0, 0]
+        try:
+            while True:
+                sent, retried, dead = process_batch(options['batch_size'], options['workers'])
+                totals = [totals[0] + sent, totals[1] + retried, totals[2] + dead]
+                if sent or retried or dead:
+                    self.stdout.write(f'batch: sent={sent} retried={retried} dead={dead}')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f'Notification worker stopped. sent={totals[0]} retried={totals[1]} dead={totals[2]}'
+        ))
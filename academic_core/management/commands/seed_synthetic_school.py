@@ -0,0 +1,58 @@
+# academic_core/management/commands/seed_synthetic_school.py
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academic_core import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill an empty database with a deterministic synthetic school (default: 150 teachers, '
+        '500 classes, 50k students, 100k guardians, 200k enrollments) for load tests and '
+        'run_benchmarks. Use --scale for smaller or larger schools.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default 0)')
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Multiply every default volume, e.g. 0.1 for 5k students')
+        for name in ('teachers', 'subjects', 'classes', 'students', 'guardians', 'enrollments'):
+            parser.add_argument(f'--{name}', type=int, help=f'Number of {name} (overrides --scale)')
+        parser.add_argument('--sessions-per-class', type=int,
+                            help='Past class sessions per class, each with attendance for the roster (default 2)')
+        parser.add_argument('--as-of', type=date.fromisoformat, default=synthetic.DEFAULT_AS_OF,
+                            help=f'Date the data is generated around (default {synthetic.DEFAULT_AS_OF})')
+        parser.add_argument('--flush', action='store_true',
+                            help='Delete all existing teachers, classes, subjects and students first')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError('--scale must be > 0')
+        volumes = synthetic.default_volumes(options['scale'])._replace(**{
+            field: options[field] for field in synthetic.Volumes._fields if options.get(field) is not None
+        })
+        if min(volumes) < 0 or not volumes.teachers or not volumes.subjects:
+            raise CommandError('Volumes must be >= 0, with at least one teacher and one subject')
+
+        if options['flush']:
+            self.stdout.write('Flushing existing school data...')
+            synthetic.flush()
+        elif not synthetic.is_empty():
+            raise CommandError('The database already has school data; use --flush to replace it '
+                               '(or point DJANGO_SQLITE_PATH at a scratch database).')
+
+        started = time.perf_counter()
+
+        def progress(label, count):
+            self.stdout.write(f'  {label:<20}{count:>10}  ({time.perf_counter() - started:.1f}s)')
+
+        self.stdout.write(f'Seeding with seed={options["seed"]} as_of={options["as_of"]}: {dict(volumes._asdict())}')
+        result = synthetic.seed_school(volumes, seed=options['seed'], as_of=options['as_of'],
+                                       batch_size=options['batch_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {result.students} students, {result.guardians} guardians, {result.classes} classes, '
+            f'{result.enrollments} enrollments in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,322 @@
+# academic_core/metrics.py
+"""
+Per-request performance metrics, a Server-Timing header and /metrics.
+
+RequestMetricsMiddleware measures every request and records, per resolved
+route (e.g. academic_core:student_list, academic_core:student-detail,
+accounts:login_admin):
+
+- wall time, DB time and query count (QueryRecorder, all aliases)
+- serializer time: DRF serializers and the fast list path report it via timer()
+- response size; a streamed response (CSV / XLSX exports, the live feed) is
+  counted as it is sent and recorded, with its log line, when the stream
+  closes (wall time is still the time to the response)
+
+and then
+
+- adds `Server-Timing: total;dur=.., db;dur=..;desc="N queries", serialize;dur=..`
+  (METRICS_SERVER_TIMING), so the browser's network panel shows the split
+- logs one structured line on the academic_core.requests logger: INFO for
+  every request, WARNING above METRICS_SLOW_REQUEST_MS
+- feeds the in-process registry served at /metrics (admin users, or
+  `Authorization: Bearer <METRICS_TOKEN>` for a Prometheus scraper):
+    sms_request_duration_seconds          histogram since process start
+    sms_request_recent_duration_seconds   p50/p90/p99 summary over the last
+                                          METRICS_WINDOW_SECONDS (rolling)
+    sms_request_db_seconds_total, sms_request_queries_total,
+    sms_request_serialize_seconds_total, sms_response_bytes_total,
+    sms_request_errors_total (5xx)
+
+Figures are per process; with several workers, scrape each one (or sum).
+Requests that resolve to no route are grouped under view="<unresolved>",
+and methods outside the standard HTTP set under method="other", so clients
+cannot create new series.
+"""
+import contextvars
+import hmac
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+
+from accounts.decorators import admin_required
+
+from .querybudget import QueryRecorder
+
+logger = logging.getLogger('academic_core.requests')
+
+# seconds; Prometheus' default buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.9, 0.99)
+
+UNRESOLVED = '<unresolved>'
+
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT'))
+OTHER_METHOD = 'other'
+
+Sample = namedtuple('Sample', 'view method status wall db queries serialize size')
+
+# named durations (seconds) measured inside the current request
+_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def timer(name):
+    """Add the block's duration to the current request's `name` timing (no-op outside one)."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def _window():
+    return getattr(settings, 'METRICS_WINDOW_SECONDS', 300)
+
+
+# -----------------------
+# Registry
+# -----------------------
+class _Totals:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.wall = self.db = self.serialize = 0.0
+        self.queries = self.size = self.errors = 0
+
+    def add(self, sample):
+        for i, bound in enumerate(BUCKETS):
+            if sample.wall <= bound:
+                self.buckets[i] += 1
+        self.count += 1
+        self.wall += sample.wall
+        self.db += sample.db
+        self.serialize += sample.serialize
+        self.queries += sample.queries
+        self.size += sample.size
+        self.errors += sample.status >= 500
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Registry:
+    """Thread-safe request metrics: lifetime totals per (view, method) plus a rolling window."""
+
+    def __init__(self, max_recent=10000):
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.recent = deque(maxlen=max_recent)  # (monotonic time, view, method, wall)
+
+    def observe(self, sample):
+        method = sample.method if sample.method in METHODS else OTHER_METHOD
+        with self.lock:
+            self.totals.setdefault((sample.view, method), _Totals()).add(sample)
+            self.recent.append((time.monotonic(), sample.view, method, sample.wall))
+
+    def reset(self):
+        with self.lock:
+            self.totals.clear()
+            self.recent.clear()
+
+    def window(self):
+        """{(view, method): sorted wall times} for requests inside METRICS_WINDOW_SECONDS."""
+        since = time.monotonic() - _window()
+        with self.lock:
+            while self.recent and self.recent[0][0] < since:
+                self.recent.popleft()
+            recent = list(self.recent)
+        grouped = {}
+        for _, view, method, wall in recent:
+            grouped.setdefault((view, method), []).append(wall)
+        return {key: sorted(walls) for key, walls in grouped.items()}
+
+    def exposition(self):
+        """Prometheus text format (version 0.0.4)."""
+        with self.lock:
+            totals = {key: vars(t).copy() for key, t in sorted(self.totals.items())}
+        out = [
+            '# HELP sms_request_duration_seconds Request wall time by route.',
+            '# TYPE sms_request_duration_seconds histogram',
+        ]
+        for (view, method), t in totals.items():
+            for bound, n in zip(BUCKETS, t['buckets']):
+                out.append(f'sms_request_duration_seconds_bucket{_labels(view=view, method=method, le=bound)} {n}')
+            out.append(f'sms_request_duration_seconds_bucket{_labels(view=view, method=method, le="+Inf")} {t["count"]}')
+            out.append(f'sms_request_duration_seconds_sum{_labels(view=view, method=method)} {t["wall"]:.6f}')
+            out.append(f'sms_request_duration_seconds_count{_labels(view=view, method=method)} {t["count"]}')
+
+        for name, key, kind, help_text in (
+            ('sms_request_db_seconds_total', 'db', 'counter', 'Time spent in database queries.'),
+            ('sms_request_queries_total', 'queries', 'counter', 'Database queries run.'),
+            ('sms_request_serialize_seconds_total', 'serialize', 'counter', 'Time spent serializing API data.'),
+            ('sms_response_bytes_total', 'size', 'counter', 'Response body bytes.'),
+            ('sms_request_errors_total', 'errors', 'counter', 'Responses with a 5xx status.'),
+        ):
+            out += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for (view, method), t in totals.items():
+                value = t[key]
+                value = f'{value:.6f}' if isinstance(value, float) else value
+                out.append(f'{name}{_labels(view=view, method=method)} {value}')
+
+        out += [
+            f'# HELP sms_request_recent_duration_seconds Request wall time over the last {_window()}s.',
+            '# TYPE sms_request_recent_duration_seconds summary',
+        ]
+        for (view, method), walls in sorted(self.window().items()):
+            for q in QUANTILES:
+                out.append(f'sms_request_recent_duration_seconds{_labels(view=view, method=method, quantile=q)} '
+                           f'{_quantile(walls, q):.6f}')
+            out.append(f'sms_request_recent_duration_seconds_sum{_labels(view=view, method=method)} {sum(walls):.6f}')
+            out.append(f'sms_request_recent_duration_seconds_count{_labels(view=view, method=method)} {len(walls)}')
+        return '\n'.join(out) + '\n'
+
+
+registry = Registry()
+
+
+# -----------------------
+# Middleware
+# -----------------------
+def _counted(content, done):
+    size = 0
+    try:
+        for chunk in content:
+            size += len(chunk)
+            yield chunk
+    finally:
+        done(size)
+
+
+async def _acounted(content, done):
+    size = 0
+    try:
+        async for chunk in content:
+            size += len(chunk)
+            yield chunk
+    finally:
+        done(size)
+
+
+class RequestMetricsMiddleware:
+    """Times each request and records it (see module docstring). Off with METRICS_ENABLED = False."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = {}
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with QueryRecorder() as recorder:
+                response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._record(request, response, time.perf_counter() - started, recorder, timings)
+
+    async def __acall__(self, request):
+        timings = {}
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        try:
+            async with QueryRecorder() as recorder:
+                response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._record(request, response, time.perf_counter() - started, recorder, timings)
+
+    def _record(self, request, response, wall, recorder, timings):
+        match = getattr(request, 'resolver_match', None)
+        sample = Sample(
+            view=match.view_name if match else UNRESOLVED,
+            method=request.method,
+            status=response.status_code,
+            wall=wall,
+            db=recorder.seconds,
+            queries=len(recorder.queries),
+            serialize=timings.get('serialize', 0.0),
+            size=0 if response.streaming else len(response.content),
+        )
+        if response.streaming and request.method != 'HEAD':
+            # bytes are only known once the body has been sent
+            counted = _acounted if response.is_async else _counted
+            response.streaming_content = counted(
+                response.streaming_content,
+                lambda size: self._finish(request, sample._replace(size=size)),
+            )
+        else:
+            self._finish(request, sample)
+
+        if getattr(settings, 'METRICS_SERVER_TIMING', True):
+            response['Server-Timing'] = (
+                f'total;dur={wall * 1000:.1f}, '
+                f'db;dur={sample.db * 1000:.1f};desc="{sample.queries} queries", '
+                f'serialize;dur={sample.serialize * 1000:.1f}'
+            )
+        return response
+
+    def _finish(self, request, sample):
+        registry.observe(sample)
+        slow = sample.wall * 1000 >= getattr(settings, 'METRICS_SLOW_REQUEST_MS', 1000)
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            '%s %s %s %.1fms', sample.method, request.path, sample.status, sample.wall * 1000,
+            extra={
+                'view': sample.view,
+                'method': sample.method,
+                'path': request.path,
+                'status': sample.status,
+                'duration_ms': round(sample.wall * 1000, 1),
+                'db_ms': round(sample.db * 1000, 1),
+                'queries': sample.queries,
+                'serialize_ms': round(sample.serialize * 1000, 1),
+                'bytes': sample.size,
+            },
+        )
+
+
+# -----------------------
+# /metrics
+# -----------------------
+@admin_required
+def _admin_metrics(request):
+    return _exposition_response()
+
+
+def _exposition_response():
+    return HttpResponse(registry.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def metrics_view(request):
+    """Prometheus endpoint: admin session, or `Authorization: Bearer <METRICS_TOKEN>`."""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    supplied = request.headers.get('Authorization', '')
+    if token and hmac.compare_digest(supplied, f'Bearer {token}'):
+        return _exposition_response()
+    return _admin_metrics(request)
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-17 00:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic_core', '0003_alter_guardian_relationship'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('start_time', models.TimeField(blank=True, null=True)),
+                ('end_time', models.TimeField(blank=True, null=True)),
+                ('topic', models.CharField(blank=True, max_length=200)),
+                ('is_closed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='class_sessions', to=settings.AUTH_USER_MODEL)),
+                ('tuition_class', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='academic_core.tuitionclass')),
+            ],
+            options={
+                'ordering': ['-date', '-start_time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('present', 'Present'), ('late', 'Late'), ('absent', 'Absent'), ('excused', 'Excused')], default='present', max_length=10)),
+                ('marked_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('marked_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendance_marks', to=settings.AUTH_USER_MODEL)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='academic_core.student')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='academic_core.classsession')),
+            ],
+            options={
+                'ordering': ['session', 'marked_at'],
+                'constraints': [models.UniqueConstraint(fields=('session', 'student'), name='unique_session_student')],
+            },
+        ),
+    ]
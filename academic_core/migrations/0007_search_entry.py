@@ -0,0 +1,150 @@
+# Generated by Django 6.0 on 2026-10-17 00:45
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of the search.py tokenisers as of this migration: a
+# historical migration must not change when the app code does.
+FTS_TABLE = 'academic_core_searchentry_fts'
+FTS_COLUMNS = 'name_tokens, name_keys, reg_no, phone_tokens, email'
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        {FTS_COLUMNS},
+        content='academic_core_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )""",
+    f"""CREATE TRIGGER academic_core_searchentry_ai AFTER INSERT ON academic_core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name_tokens, new.name_keys, new.reg_no, new.phone_tokens, new.email);
+    END""",
+    f"""CREATE TRIGGER academic_core_searchentry_ad AFTER DELETE ON academic_core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name_tokens, old.name_keys, old.reg_no, old.phone_tokens, old.email);
+    END""",
+    f"""CREATE TRIGGER academic_core_searchentry_au AFTER UPDATE ON academic_core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name_tokens, old.name_keys, old.reg_no, old.phone_tokens, old.email);
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name_tokens, new.name_keys, new.reg_no, new.phone_tokens, new.email);
+    END""",
+]
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS academic_core_searchentry_au',
+    'DROP TRIGGER IF EXISTS academic_core_searchentry_ad',
+    'DROP TRIGGER IF EXISTS academic_core_searchentry_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS academic_core_searchentry_name_trgm '
+    'ON academic_core_searchentry USING gin (name_tokens gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS academic_core_searchentry_phone_trgm '
+    'ON academic_core_searchentry USING gin (phone_tokens gin_trgm_ops)',
+]
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS academic_core_searchentry_phone_trgm',
+    'DROP INDEX IF EXISTS academic_core_searchentry_name_trgm',
+]
+
+
+def create_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+_FOLDS = (('ph', 'f'), ('th', 't'), ('sh', 's'), ('ch', 'c'), ('ck', 'k'),
+          ('c', 'k'), ('q', 'k'), ('z', 's'), ('w', 'v'), ('y', 'i'))
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+def phonetic_key(word):
+    word = re.sub(r'[^a-z]', '', word)
+    if not word:
+        return ''
+    for a, b in _FOLDS:
+        word = word.replace(a, b)
+    head = 'a' if word[0] in 'aeiou' else word[0]
+    tail = ''.join(ch for ch in word[1:] if ch not in 'aeiouh')
+    key = head
+    for ch in tail:
+        if ch != key[-1]:
+            key += ch
+    return key
+
+
+def phone_token(phone):
+    return re.sub(r'\D', '', phone or '')[::-1]
+
+
+def entry_fields(name, phones, email):
+    tokens = normalize(name)
+    return {
+        'title': name[:255],
+        'name_tokens': tokens[:255],
+        'name_keys': ' '.join(filter(None, (phonetic_key(w) for w in tokens.split())))[:255],
+        'phone_tokens': ' '.join(filter(None, (phone_token(p) for p in phones)))[:100],
+        'email': (email or '').lower(),
+    }
+
+
+def populate(apps, schema_editor):
+    Student = apps.get_model('academic_core', 'Student')
+    Guardian = apps.get_model('academic_core', 'Guardian')
+    SearchEntry = apps.get_model('academic_core', 'SearchEntry')
+    entries = [
+        SearchEntry(kind='student', object_id=s.pk, student_id=s.pk, reg_no=s.reg_no,
+                    **entry_fields(f"{s.first_name} {s.last_name}", (s.phone, s.whatsapp), s.email))
+        for s in Student.objects.iterator()
+    ]
+    entries += [
+        SearchEntry(kind='guardian', object_id=g.pk, student_id=g.student_id, reg_no=g.student.reg_no,
+                    **entry_fields(g.name, (g.phone, g.whatsapp), g.email))
+        for g in Guardian.objects.select_related('student').iterator()
+    ]
+    SearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic_core', '0006_outbox_message'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('student', 'Student'), ('guardian', 'Guardian')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('reg_no', models.CharField(max_length=30)),
+                ('name_tokens', models.CharField(max_length=255)),
+                ('name_keys', models.CharField(max_length=255)),
+                ('phone_tokens', models.CharField(blank=True, max_length=100)),
+                ('email', models.CharField(blank=True, max_length=254)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academic_core.student')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_kind_object')],
+            },
+        ),
+        migrations.RunPython(create_search_backend, drop_search_backend),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 6.0 on 2026-10-17 00:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+TRACKED_TABLES = [
+    'academic_core.teacher', 'academic_core.tuitionclass', 'academic_core.subject',
+    'academic_core.subjectassignment', 'academic_core.student', 'academic_core.guardian',
+    'academic_core.enrollment', 'academic_core.classsession', 'academic_core.attendance',
+]
+
+
+def seed_versions(apps, schema_editor):
+    TableVersion = apps.get_model('academic_core', 'TableVersion')
+    TableVersion.objects.bulk_create([TableVersion(table=t) for t in TRACKED_TABLES], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic_core', '0007_search_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=100, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='guardian',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='subjectassignment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='teacher',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='tuitionclass',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(seed_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 6.0 on 2026-10-17 01:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic_core', '0009_id_sequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='enrollment',
+            options={'ordering': ['-start_date', 'id']},
+        ),
+        migrations.AlterField(
+            model_name='classsession',
+            name='tuition_class',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='academic_core.tuitionclass'),
+        ),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='tuition_class',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='academic_core.tuitionclass'),
+        ),
+        migrations.AlterField(
+            model_name='guardian',
+            name='student',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='guardians', to='academic_core.student'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='current_class',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='students', to='academic_core.tuitionclass'),
+        ),
+        migrations.AlterField(
+            model_name='subjectassignment',
+            name='teacher',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='academic_core.teacher'),
+        ),
+        migrations.AddIndex(
+            model_name='classsession',
+            index=models.Index(fields=['tuition_class', 'date', 'start_time'], name='session_class_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['tuition_class', 'active', 'start_date'], name='enrollment_class_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('active', True)), fields=['tuition_class', 'start_date'], name='enrollment_active_class_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['-start_date', 'id'], name='enrollment_start_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=models.Index(fields=['student', '-is_primary', 'name'], name='guardian_student_primary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=models.Index(fields=['name'], name='guardian_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['current_class', 'is_active', 'reg_no'], name='student_class_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['current_class', 'reg_no'], name='student_active_class_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['reg_no'], name='student_active_reg_no_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectassignment',
+            index=models.Index(fields=['start_date'], name='assignment_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectassignment',
+            index=models.Index(fields=['teacher', 'start_date'], name='assignment_teacher_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['last_name', 'first_name'], name='teacher_name_idx'),
+        ),
+    ]
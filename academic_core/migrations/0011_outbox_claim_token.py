@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 01:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic_core', '0010_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='claim_token',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
@@ -1,5 +1,6 @@
 # academic_core/models.py
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from decimal import Decimal
@@ -32,9 +33,13 @@ class Teacher(models.Model):
         related_name='teacher_profile'
     )
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['last_name', 'first_name'], name='teacher_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} {self.first_name} {self.last_name}"
@@ -74,6 +79,7 @@ class TuitionClass(models.Model):
     )
     capacity = models.PositiveIntegerField(default=10)
     active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['class_id']
@@ -90,6 +96,7 @@ class Subject(models.Model):
     subject_id = models.CharField(max_length=40, unique=True)
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['subject_id']
@@ -105,16 +112,23 @@ class Subject(models.Model):
 class SubjectAssignment(models.Model):
     assign_id = models.CharField(max_length=60, unique=True)
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='assignments')
-    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='assignments')
+    # indexed by assignment_teacher_start_idx
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='assignments', db_index=False)
     start_date = models.DateField(default=timezone.now)
     end_date = models.DateField(null=True, blank=True)
     notes = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['subject', 'teacher'], name='unique_subject_teacher')
         ]
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['start_date'], name='assignment_start_idx'),
+            # a teacher's assignments, newest first (teacher detail page)
+            models.Index(fields=['teacher', 'start_date'], name='assignment_teacher_start_idx'),
+        ]
 
     def __str__(self):
         return f"{self.assign_id}: {self.subject.name} -> {self.teacher.first_name} {self.teacher.last_name}"
@@ -145,16 +159,39 @@ class Student(models.Model):
         on_delete=models.PROTECT,
         null=True,
         blank=True,
-        related_name='students'
+        related_name='students',
+        db_index=False,  # indexed by student_class_active_idx
     )
     address = models.TextField(blank=True)
     phone = models.CharField(max_length=32, blank=True)
     whatsapp = models.CharField(max_length=32, blank=True)
     email = models.EmailField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['reg_no']
+        indexes = [
+            # class rosters and the ?class=&is_active= list. SQLite can't seek on a
+            # boolean column (Django emits WHERE "is_active"), so the active-row
+            # orderings below are partial indexes; Postgres uses all three columns.
+            models.Index(fields=['current_class', 'is_active', 'reg_no'], name='student_class_active_idx'),
+            models.Index(fields=['current_class', 'reg_no'], condition=models.Q(is_active=True),
+                         name='student_active_class_idx'),
+            # ?is_active=True list and its COUNT
+            models.Index(fields=['reg_no'], condition=models.Q(is_active=True), name='student_active_reg_no_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the row as loaded, for receivers that react to a change (signals.py)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {f.attname: getattr(self, f.attname) for f in self._meta.concrete_fields}
 
     def __str__(self):
         return f"{self.reg_no} - {self.first_name} {self.last_name}"
@@ -172,7 +209,8 @@ REL_CHOICES = [
 ]
 
 class Guardian(models.Model):
-    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='guardians')
+    # indexed by guardian_student_primary_idx
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='guardians', db_index=False)
     name = models.CharField(max_length=200)
     relationship = models.CharField(max_length=20, choices=REL_CHOICES)
     phone = models.CharField(max_length=32, blank=True)
@@ -180,9 +218,15 @@ class Guardian(models.Model):
     email = models.EmailField(blank=True, null=True)
     is_primary = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-is_primary', 'name']
+        indexes = [
+            # a student's guardians in Meta.ordering, primary first
+            models.Index(fields=['student', '-is_primary', 'name'], name='guardian_student_primary_idx'),
+            models.Index(fields=['name'], name='guardian_name_idx'),  # API cursor pages
+        ]
         verbose_name = "Guardian"
         verbose_name_plural = "Guardians"
 
@@ -196,15 +240,240 @@ class Guardian(models.Model):
 
 class Enrollment(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
-    tuition_class = models.ForeignKey(TuitionClass, on_delete=models.CASCADE, related_name='enrollments')
+    # indexed by enrollment_class_active_idx
+    tuition_class = models.ForeignKey(TuitionClass, on_delete=models.CASCADE, related_name='enrollments',
+                                      db_index=False)
     start_date = models.DateField(default=timezone.now)
     end_date = models.DateField(null=True, blank=True)
     active = models.BooleanField(default=True)
     fee_override = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('student', 'tuition_class', 'start_date')
-        ordering = ['-start_date']
+        ordering = ['-start_date', 'id']  # ties stay in insertion order, as they did when sorted
+        indexes = [
+            # admin list_filter and per-class counts; the partial twin serves the
+            # active roster in date order on SQLite (see Student.Meta.indexes)
+            models.Index(fields=['tuition_class', 'active', 'start_date'], name='enrollment_class_active_idx'),
+            models.Index(fields=['tuition_class', 'start_date'], condition=models.Q(active=True),
+                         name='enrollment_active_class_idx'),
+            # default ordering, enrollments this month
+            models.Index(fields=['-start_date', 'id'], name='enrollment_start_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.reg_no} -> {self.tuition_class.class_id} ({'active' if self.active else 'inactive'})"
+
+
+# -----------------------------------
+# CLASS SESSION MODEL (one sitting of a tuition class)
+# -----------------------------------
+
+class ClassSession(models.Model):
+    # indexed by session_class_date_idx
+    tuition_class = models.ForeignKey(TuitionClass, on_delete=models.CASCADE, related_name='sessions',
+                                      db_index=False)
+    date = models.DateField(default=timezone.now)
+    start_time = models.TimeField(null=True, blank=True)
+    end_time = models.TimeField(null=True, blank=True)
+    topic = models.CharField(max_length=200, blank=True)
+    is_closed = models.BooleanField(default=False)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='class_sessions'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date', '-start_time']
+        indexes = [
+            models.Index(fields=['tuition_class', 'date', 'start_time'], name='session_class_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tuition_class.class_id} @ {self.date}"
+
+
+# -----------------------------------
+# ATTENDANCE MODEL (card mark)
+# -----------------------------------
+
+ATTENDANCE_STATUS_CHOICES = [
+    ('present', 'Present'),
+    ('late', 'Late'),
+    ('absent', 'Absent'),
+    ('excused', 'Excused'),
+]
+
+class Attendance(models.Model):
+    session = models.ForeignKey(ClassSession, on_delete=models.CASCADE, related_name='attendance')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='attendance')
+    status = models.CharField(max_length=10, choices=ATTENDANCE_STATUS_CHOICES, default='present')
+    marked_at = models.DateTimeField(default=timezone.now)
+    marked_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='attendance_marks'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'student'], name='unique_session_student')
+        ]
+        ordering = ['session', 'marked_at']
+
+    def __str__(self):
+        return f"{self.student_id} @ session {self.session_id}: {self.status}"
+
+
+# -----------------------------------
+# INVOICE MODELS (generated by academic_core/billing.py)
+# -----------------------------------
+
+INVOICE_STATUS_CHOICES = [
+    ('open', 'Open'),
+    ('paid', 'Paid'),
+    ('void', 'Void'),
+]
+
+class Invoice(models.Model):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='invoices')
+    period = models.DateField(help_text="First day of the billed month")
+    due_date = models.DateField()
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    status = models.CharField(max_length=10, choices=INVOICE_STATUS_CHOICES, default='open')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'period'], name='unique_student_period_invoice')
+        ]
+        ordering = ['-period', 'student']
+
+    def __str__(self):
+        return f"{self.student_id} {self.period:%Y-%m}: {self.total}"
+
+
+class InvoiceLine(models.Model):
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name='lines')
+    enrollment = models.ForeignKey(Enrollment, on_delete=models.SET_NULL, null=True, blank=True, related_name='invoice_lines')
+    tuition_class = models.ForeignKey(TuitionClass, on_delete=models.SET_NULL, null=True, blank=True, related_name='invoice_lines')
+    description = models.CharField(max_length=200)
+    fee_type = models.CharField(max_length=20, choices=FEE_TYPE_CHOICES)
+    quantity = models.PositiveIntegerField(default=1)
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        ordering = ['invoice', 'id']
+
+    def __str__(self):
+        return f"{self.description}: {self.amount}"
+
+
+# -----------------------------------
+# NOTIFICATION OUTBOX (see academic_core/outbox.py)
+# -----------------------------------
+
+OUTBOX_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('processing', 'Processing'),
+    ('sent', 'Sent'),
+    ('dead', 'Dead'),
+]
+
+class OutboxMessage(models.Model):
+    event = models.CharField(max_length=60)  # name of a signal in core/notifications.py
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    dedupe_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=12, choices=OUTBOX_STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    claim_token = models.CharField(max_length=32, blank=True)  # set by the worker that claimed it
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['available_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_status_available_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event} #{self.pk} ({self.status})"
+
+
+# -----------------------------------
+# SEARCH INDEX (maintained by academic_core/search.py)
+# -----------------------------------
+
+SEARCH_KIND_CHOICES = [
+    ('student', 'Student'),
+    ('guardian', 'Guardian'),
+]
+
+class SearchEntry(models.Model):
+    """
+    Denormalised, pre-tokenised row per Student / Guardian. On SQLite an FTS5
+    table mirrors it (see migration 0007); elsewhere it is queried directly.
+    """
+    kind = models.CharField(max_length=10, choices=SEARCH_KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='+')
+    title = models.CharField(max_length=255)
+    reg_no = models.CharField(max_length=30)
+    name_tokens = models.CharField(max_length=255)   # "nimal perera"
+    name_keys = models.CharField(max_length=255)     # phonetic keys: "nml pr"
+    phone_tokens = models.CharField(max_length=100, blank=True)  # reversed digits
+    email = models.CharField(max_length=254, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_kind_object')
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.title}"
+
+
+# -----------------------------------
+# TABLE VERSION (change counter per table, for ETag / Last-Modified)
+# -----------------------------------
+
+class TableVersion(models.Model):
+    """
+    One row per tracked model, bumped after every committed write
+    (academic_core/conditional.py). Lets a list endpoint answer "has anything
+    changed?" with one tiny query instead of scanning the table.
+    """
+    table = models.CharField(max_length=100, unique=True)  # model label, e.g. 'academic_core.student'
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
+
+
+# -----------------------------------
+# ID SEQUENCES (next reg_no / class_id / subject_id / assign_id)
+# -----------------------------------
+
+class IdSequence(models.Model):
+    """
+    Next number for a generated ID series (academic_core/sequences.py), one
+    row per series and scope, e.g. 'student:STU-2026-{n:05d}'. Reserved with
+    a row-locking UPDATE, so concurrent clerks never get the same ID.
+    """
+    key = models.CharField(max_length=150, unique=True)
+    next_value = models.PositiveBigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.key} -> {self.next_value}"
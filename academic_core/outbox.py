@@ -0,0 +1,162 @@
+# academic_core/outbox.py
+"""
+Transactional outbox for the signals in core/notifications.py.
+
+Producers call enqueue() inside their own transaction instead of
+`signal.send()`: the event row commits (or rolls back) together with the
+business write and the request returns without waiting on any provider.
+The run_notification_worker command then claims batches and sends the
+real signal, so receivers (WhatsApp / email / ...) run in the worker.
+
+Receivers get two extra kwargs besides the payload: `message_id` and
+`dedupe_key`. Both are stable across retries; use them to make deliveries
+idempotent.
+"""
+import hashlib
+import json
+import logging
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from core import notifications
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def payload_key(event, **payload):
+    """Stable dedupe key derived from the event name and its payload."""
+    raw = json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder)
+    return f"{event}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def enqueue(event, dedupe_key=None, **payload):
+    """
+    Queue `event` (a signal name in core.notifications) with `payload`.
+    A second enqueue with the same dedupe_key is silently dropped.
+    """
+    if not isinstance(getattr(notifications, event, None), Signal):
+        raise ValueError(f"Unknown notification event: {event}")
+    OutboxMessage.objects.bulk_create(
+        [OutboxMessage(event=event, payload=payload, dedupe_key=dedupe_key)],
+        ignore_conflicts=dedupe_key is not None,
+    )
+
+
+def _claimable(now):
+    return Q(status='pending', available_at__lte=now) | Q(status='processing', locked_until__lt=now)
+
+
+def _due_ids(now, batch_size):
+    return list(
+        OutboxMessage.objects.select_for_update(skip_locked=True)
+        .filter(_claimable(now))
+        .order_by('available_at', 'id')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+
+
+def claim_batch(batch_size=100, lease_seconds=300):
+    """
+    Claim up to `batch_size` due messages for this worker. Messages stuck in
+    'processing' past their lease (crashed worker) are claimed again.
+
+    The UPDATE re-checks that each row is still claimable and stamps it with
+    a fresh claim_token, and only rows carrying that token are returned. So
+    two workers that read the same ids (SQLite ignores skip_locked) never
+    both get a message.
+    """
+    now = timezone.now()
+    token = secrets.token_hex(16)
+    with transaction.atomic():
+        ids = _due_ids(now, batch_size)
+        if ids:
+            OutboxMessage.objects.filter(_claimable(now), pk__in=ids).update(
+                status='processing', locked_until=now + timedelta(seconds=lease_seconds), claim_token=token,
+            )
+    if not ids:
+        return []
+    return list(OutboxMessage.objects.filter(pk__in=ids, claim_token=token).order_by('available_at', 'id'))
+
+
+def dispatch(message):
+    """Send the signal for one message. Returns None on success, else an error string."""
+    signal = getattr(notifications, message.event, None)
+    if signal is None:
+        return f"unknown event {message.event}"
+    results = signal.send_robust(
+        sender=OutboxMessage,
+        message_id=message.pk,
+        dedupe_key=message.dedupe_key or f"outbox:{message.pk}",
+        **message.payload,
+    )
+    errors = [f"{getattr(r, '__name__', r)}: {exc!r}" for r, exc in results if isinstance(exc, Exception)]
+    return '; '.join(errors) or None
+
+
+def _dispatch_in_thread(message):
+    try:
+        return dispatch(message)
+    finally:
+        # receivers ran on a pool thread; don't leak its DB connection
+        connections.close_all()
+
+
+def backoff_delay(attempts):
+    base = _setting('NOTIFICATION_RETRY_BASE_SECONDS', 30)
+    cap = _setting('NOTIFICATION_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
+
+def process_batch(batch_size=100, workers=4):
+    """
+    Claim one batch, dispatch it on a thread pool and record the outcome.
+    Returns (sent, retried, dead) counts.
+    """
+    messages = claim_batch(batch_size)
+    if not messages:
+        return 0, 0, 0
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_dispatch_in_thread, messages))
+    else:
+        outcomes = [dispatch(m) for m in messages]
+
+    now = timezone.now()
+    max_attempts = _setting('NOTIFICATION_MAX_ATTEMPTS', 5)
+    sent_ids = [m.pk for m, err in zip(messages, outcomes) if err is None]
+    retried = dead = 0
+    with transaction.atomic():
+        if sent_ids:
+            OutboxMessage.objects.filter(pk__in=sent_ids).update(
+                status='sent', sent_at=now, locked_until=None, last_error=''
+            )
+        for message, error in zip(messages, outcomes):
+            if error is None:
+                continue
+            attempts = message.attempts + 1
+            if attempts >= max_attempts:
+                dead += 1
+                status = 'dead'
+            else:
+                retried += 1
+                status = 'pending'
+            logger.warning("outbox %s failed (attempt %s): %s", message, attempts, error)
+            OutboxMessage.objects.filter(pk=message.pk).update(
+                status=status, attempts=attempts, last_error=error,
+                available_at=now + backoff_delay(attempts), locked_until=None,
+            )
+    return len(sent_ids), retried, dead
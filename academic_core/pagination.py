@@ -0,0 +1,64 @@
+# academic_core/pagination.py
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+def _max_page_size():
+    return getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+
+
+class ModelOrderedCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination used by default on every API viewset.
+
+    - ordering follows the view's `cursor_ordering` if declared, otherwise the
+      model's Meta.ordering (reg_no, class_id, -start_date, ...), so the
+      cursor walks the same index the rest of the app already sorts by.
+    - ?ordering= from OrderingFilter still wins when the client asks for it.
+    - page size comes from REST_FRAMEWORK['PAGE_SIZE'], clients may ask for
+      a different one with ?page_size= up to API_MAX_PAGE_SIZE.
+    """
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return _max_page_size()
+
+    def get_ordering(self, request, queryset, view):
+        self.ordering = (
+            getattr(view, 'cursor_ordering', None)
+            or queryset.model._meta.ordering
+            or ('-pk',)
+        )
+        return super().get_ordering(request, queryset, view)
+
+
+class OffsetPageNumberPagination(PageNumberPagination):
+    """
+    Classic ?page=N pagination. Only used when a client opts in (see
+    PaginationModeMixin) e.g. the admin UI that needs "jump to page N" and a total count.
+    """
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return _max_page_size()
+
+
+class PaginationModeMixin:
+    """
+    Viewset mixin: cursor pagination by default, offset pagination when the
+    request carries the offset query param (?page=).
+    """
+    offset_pagination_class = OffsetPageNumberPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class
+            offset_param = self.offset_pagination_class.page_query_param
+            request = getattr(self, 'request', None)
+            if request is not None and offset_param in request.query_params:
+                pagination_class = self.offset_pagination_class
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
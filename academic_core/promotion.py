@@ -0,0 +1,137 @@
+# academic_core/promotion.py
+"""
+Annual promotion engine.
+
+A mapping {from class_id: to class_id or None} moves every active student
+whose current_class is `from`:
+  - their active Enrollment rows in `from` are closed (active=False, end_date)
+  - an Enrollment in `to` is opened (skipped if one is already active)
+  - Student.current_class is set to `to`
+`to=None` graduates the class: all of the students' active enrollments
+(in any class) are closed, current_class is cleared and the students are
+marked inactive.
+
+Each class is one transaction of a handful of set-based queries
+(UPDATE ... WHERE, bulk_create), whatever the number of students. The
+movers are read (select_for_update) and written inside that transaction,
+by primary key, so a student changed concurrently is not half-promoted. Classes
+are processed target-first, so in a chain G9 -> G10 -> G11 the G10 students
+move on before G9 arrives and nobody is promoted twice.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import caching
+from .conditional import bump
+from .models import Enrollment, Student, TuitionClass
+
+PromotionStep = namedtuple('PromotionStep', ['source', 'target', 'students', 'closed', 'opened'])
+
+
+class PromotionError(ValueError):
+    pass
+
+
+def parse_sequence(sequence):
+    """'G9,G10,G11' -> {'G9': 'G10', 'G10': 'G11', 'G11': None} (the last class graduates)."""
+    ids = [c.strip() for c in sequence.split(',') if c.strip()]
+    return {a: b for a, b in zip(ids, ids[1:] + [None])}
+
+
+def plan_order(mapping):
+    """Return source class_ids ordered so each target is emptied before it is filled."""
+    for source, target in mapping.items():
+        if source == target:
+            raise PromotionError(f"Class '{source}' is mapped to itself")
+    order, done, visiting = [], set(), set()
+
+    def visit(source):
+        if source in done:
+            return
+        if source in visiting:
+            raise PromotionError(f"Promotion mapping has a cycle through '{source}'")
+        visiting.add(source)
+        target = mapping[source]
+        if target in mapping:
+            visit(target)
+        visiting.discard(source)
+        done.add(source)
+        order.append(source)
+
+    for source in mapping:
+        visit(source)
+    return order
+
+
+def _promote_class(source, target, on_date, dry_run):
+    now = timezone.now()
+    with transaction.atomic():
+        student_ids = list(
+            Student.objects.select_for_update()
+            .filter(current_class=source, is_active=True)
+            .values_list('pk', flat=True)
+        )
+        movers = Student.objects.filter(pk__in=student_ids)
+        closing = Enrollment.objects.filter(active=True, student_id__in=student_ids)
+        if target is not None:
+            closing = closing.filter(tuition_class=source)
+        to_open = []
+        if target is not None and student_ids:
+            already = set(
+                Enrollment.objects.filter(tuition_class=target, active=True, student_id__in=student_ids)
+                .values_list('student_id', flat=True)
+            )
+            to_open = [sid for sid in student_ids if sid not in already]
+
+        if dry_run:
+            return PromotionStep(source, target, student_ids, closing.count(), len(to_open))
+
+        closed = closing.update(active=False, end_date=on_date, updated_at=now)
+        Enrollment.objects.bulk_create(
+            [Enrollment(student_id=sid, tuition_class=target, start_date=on_date) for sid in to_open],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+        if target is None:
+            movers.update(current_class=None, is_active=False, updated_at=now)
+        else:
+            movers.update(current_class=target, updated_at=now)
+        bump(Enrollment, Student)
+        caching.invalidate(Enrollment, Student)
+    return PromotionStep(source, target, student_ids, closed, len(to_open))
+
+
+def close_enrollments(student_ids, on_date):
+    """
+    Close the students' open enrollments as of `on_date` (a deactivated
+    student is no longer billed). Returns the number of rows closed.
+    """
+    closed = (
+        Enrollment.objects.filter(student_id__in=student_ids, active=True)
+        .filter(Q(end_date__isnull=True) | Q(end_date__gt=on_date))
+        .update(active=False, end_date=on_date, updated_at=timezone.now())
+    )
+    if closed:
+        bump(Enrollment)
+        caching.invalidate(Enrollment)
+    return closed
+
+
+def promote(mapping, on_date, dry_run=False):
+    """
+    Apply {from class_id: to class_id or None} as of `on_date`.
+    Returns a list of PromotionStep (students is the list of moved pks).
+    """
+    wanted = set(mapping) | {t for t in mapping.values() if t}
+    classes = {c.class_id: c for c in TuitionClass.objects.filter(class_id__in=wanted)}
+    missing = sorted(wanted - set(classes))
+    if missing:
+        raise PromotionError(f"Unknown class_id(s): {', '.join(missing)}")
+
+    return [
+        _promote_class(classes[source], classes.get(mapping[source]), on_date, dry_run)
+        for source in plan_order(mapping)
+    ]
@@ -0,0 +1,210 @@
+# academic_core/querybudget.py
+"""
+Query budgets: catch N+1s and query-count regressions before they ship.
+
+    @query_budget(6)                             # function view, CBV or viewset
+    @query_budget({'list': 4, 'retrieve': 4})    # per viewset action / HTTP method
+    class StudentViewSet(...)
+
+QueryBudgetMiddleware records every query a request runs (all database
+aliases, through connection.execute_wrapper, so DEBUG is not needed) and
+checks two things:
+
+- the query count against the view's budget (QUERY_BUDGET_DEFAULT, if set,
+  for views that declare none)
+- repeated query shapes: the same SELECT with different parameters run
+  QUERY_BUDGET_REPEAT_LIMIT times or more is an N+1, budget or not
+
+QUERY_BUDGET_MODE decides what happens on a violation:
+
+- 'off'   middleware is not loaded (production)
+- 'log'   warning on the academic_core.querybudget logger (development)
+- 'raise' QueryBudgetExceeded, so the test that made the request fails (CI)
+
+Outside the middleware the same checks wrap any block, e.g. in a test:
+
+    with assert_query_budget(5):
+        self.client.get(url)
+"""
+import logging
+import re
+import time
+from collections import Counter, namedtuple
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'log', 'raise')
+
+# IN (%s, %s, ...) of any length is one shape
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+Query = namedtuple('Query', 'alias sql seconds')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _mode():
+    mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+    return mode if mode in MODES else 'off'
+
+
+def _repeat_limit():
+    return getattr(settings, 'QUERY_BUDGET_REPEAT_LIMIT', 3)
+
+
+def shape(sql):
+    """The SQL with its parameter list normalised; equal shapes differ only in values."""
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+# -----------------------
+# Recording
+# -----------------------
+class QueryRecorder:
+    """
+    Context manager collecting Query rows for every statement on every alias.
+
+    Use `async with` in async code: the async ORM runs queries on the
+    request's sync worker thread, whose connections are not the event
+    loop's, so the wrappers are installed (and removed) on that thread.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def _wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append(Query(alias, sql, time.perf_counter() - started))
+        return record
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for conn in connections.all():
+            self._stack.enter_context(conn.execute_wrapper(self._wrapper(conn.alias)))
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+
+    async def __aenter__(self):
+        return await sync_to_async(self.__enter__)()
+
+    async def __aexit__(self, *exc):
+        await sync_to_async(self.__exit__)(*exc)
+
+    @property
+    def seconds(self):
+        return sum(q.seconds for q in self.queries)
+
+    def repeats(self, limit):
+        """[(shape, times)] for SELECT shapes run `limit` times or more, most repeated first."""
+        counts = Counter(shape(q.sql) for q in self.queries if q.sql.lstrip().upper().startswith('SELECT'))
+        return [(sql, n) for sql, n in counts.most_common() if n >= limit]
+
+    def problems(self, budget=None, repeat_limit=None):
+        """Human readable violations (empty when within budget)."""
+        found = []
+        if budget is not None and len(self.queries) > budget:
+            found.append(f'{len(self.queries)} queries, budget is {budget}')
+        for sql, n in self.repeats(repeat_limit or _repeat_limit()):
+            found.append(f'possible N+1, run {n} times: {sql[:200]}')
+        return found
+
+
+# -----------------------
+# Budgets
+# -----------------------
+def query_budget(budget):
+    """
+    Declare the most queries a view may run. `budget` is an int, or a dict
+    keyed by viewset action ('list', 'retrieve', ...) or lower-case HTTP
+    method. Works on function views, CBV classes and DRF viewsets.
+    """
+    def decorator(view):
+        view.query_budget = budget
+        return view
+    return decorator
+
+
+def budget_for(view_func, method):
+    """The budget declared for the view `view_func` (a resolved URL callback) and `method`."""
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        # as_view() functions carry their class: .cls (DRF) / .view_class (Django)
+        owner = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        budget = getattr(owner, 'query_budget', None)
+    if isinstance(budget, dict):
+        action = (getattr(view_func, 'actions', None) or {}).get(method.lower())
+        budget = budget.get(action, budget.get(method.lower()))
+    if budget is None:
+        budget = getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """Records each request's queries and reports views over budget or with N+1s."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if _mode() == 'off':
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.query_budget = None
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self._check(request, response, recorder)
+
+    async def __acall__(self, request):
+        request.query_budget = None
+        async with QueryRecorder() as recorder:
+            response = await self.get_response(request)
+        return self._check(request, response, recorder)
+
+    def _check(self, request, response, recorder):
+        response['X-Query-Count'] = str(len(recorder.queries))
+        problems = recorder.problems(request.query_budget)
+        if problems:
+            message = f"{request.method} {request.path}: {'; '.join(problems)}"
+            if _mode() == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = budget_for(view_func, request.method)
+
+
+# -----------------------
+# Tests
+# -----------------------
+@contextmanager
+def assert_query_budget(budget=None, repeat_limit=None):
+    """
+    Fail (AssertionError) if the block runs more than `budget` queries or
+    repeats a SELECT shape `repeat_limit` times (QUERY_BUDGET_REPEAT_LIMIT).
+    """
+    with QueryRecorder() as recorder:
+        yield recorder
+    problems = recorder.problems(budget, repeat_limit)
+    if problems:
+        listing = '\n'.join(f'{i}. {q.sql}' for i, q in enumerate(recorder.queries, 1))
+        raise QueryBudgetExceeded('\n'.join(problems) + '\n\nQueries:\n' + listing)
@@ -0,0 +1,30 @@
+# academic_core/receivers.py
+"""
+Built-in receivers for core.notifications signals.
+
+These run inside the notification worker (see academic_core/outbox.py), never
+in a request, so they may call slow providers through the configured transport.
+Raising makes the worker retry the message with backoff.
+"""
+from django.dispatch import receiver
+
+from core.notifications import subject_assigned
+from .models import SubjectAssignment
+from .transports import get_transport
+
+
+@receiver(subject_assigned)
+def notify_teacher_of_assignment(sender, assignment_id, dedupe_key=None, **kwargs):
+    assignment = (
+        SubjectAssignment.objects.select_related('subject', 'teacher')
+        .filter(pk=assignment_id).first()
+    )
+    if assignment is None:
+        # deleted before the worker got to it
+        return
+    teacher = assignment.teacher
+    body = f"Hello {teacher.first_name}, you have been assigned {assignment.subject.name} ({assignment.assign_id})."
+    if teacher.whatsapp:
+        get_transport().send('whatsapp', teacher.whatsapp, body, dedupe_key=dedupe_key)
+    elif teacher.email:
+        get_transport().send('email', teacher.email, body, dedupe_key=dedupe_key)
@@ -0,0 +1,273 @@
+# academic_core/search.py
+"""
+Student / guardian search index.
+
+Every Student and Guardian has one SearchEntry row holding pre-tokenised
+text (kept in sync by signals in academic_core/signals.py: the students
+touched in a transaction are re-indexed together once it commits). Matching:
+
+- prefix      : "nim" finds "Nimal", "S00" finds "S001"
+- fuzzy name  : each name word also stored as a phonetic key (vowels dropped,
+                look-alike consonants folded), so "Nimel Pereira" finds
+                "Nimal Perera"
+- phone suffix: digits stored reversed, so "0049" (last digits of a number)
+                becomes a prefix lookup
+
+Backends by database vendor:
+- sqlite    : FTS5 external-content table + triggers (migration 0007), bm25 ranking
+- postgresql: trigram similarity on name_tokens (pg_trgm GIN index, migration 0007)
+- others    : portable prefix matching through the ORM
+"""
+import re
+import unicodedata
+from contextlib import contextmanager
+from contextvars import ContextVar
+from difflib import SequenceMatcher
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import SearchEntry, Student, Guardian
+
+FTS_TABLE = 'academic_core_searchentry_fts'
+
+# (kind, object_id) removals collected by batched_removals()
+_pending_removals = ContextVar('search_pending_removals', default=None)
+
+_FOLDS = (('ph', 'f'), ('th', 't'), ('sh', 's'), ('ch', 'c'), ('ck', 'k'),
+          ('c', 'k'), ('q', 'k'), ('z', 's'), ('w', 'v'), ('y', 'i'))
+
+
+# -----------------------
+# Tokenising
+# -----------------------
+def normalize(text):
+    """Lowercase, strip accents and punctuation: 'Pérera-Silva' -> 'perera silva'."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+def phonetic_key(word):
+    """Crude sound-alike key: 'perera' / 'pereira' -> 'pr', 'nimal' / 'nimel' -> 'nml'."""
+    word = re.sub(r'[^a-z]', '', word)
+    if not word:
+        return ''
+    for a, b in _FOLDS:
+        word = word.replace(a, b)
+    head = 'a' if word[0] in 'aeiou' else word[0]
+    tail = ''.join(ch for ch in word[1:] if ch not in 'aeiouh')
+    key = head
+    for ch in tail:
+        if ch != key[-1]:
+            key += ch
+    return key
+
+
+def phone_token(phone):
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[::-1]
+
+
+def entry_fields(name, phones, email):
+    tokens = normalize(name)
+    return {
+        'title': name[:255],
+        'name_tokens': tokens[:255],
+        'name_keys': ' '.join(filter(None, (phonetic_key(w) for w in tokens.split())))[:255],
+        'phone_tokens': ' '.join(filter(None, (phone_token(p) for p in phones)))[:100],
+        'email': (email or '').lower(),
+    }
+
+
+def student_entry(student):
+    return SearchEntry(
+        kind='student', object_id=student.pk, student_id=student.pk, reg_no=student.reg_no,
+        **entry_fields(f"{student.first_name} {student.last_name}",
+                        (student.phone, student.whatsapp), student.email),
+    )
+
+
+def guardian_entry(row):
+    """`row` is a Guardian .values() dict including 'student__reg_no'."""
+    return SearchEntry(
+        kind='guardian', object_id=row['pk'], student_id=row['student_id'], reg_no=row['student__reg_no'],
+        **entry_fields(row['name'], (row['phone'], row['whatsapp']), row['email']),
+    )
+
+
+# -----------------------
+# Index maintenance
+# -----------------------
+_UPDATE_FIELDS = ['student', 'title', 'reg_no', 'name_tokens', 'name_keys', 'phone_tokens', 'email']
+
+
+def upsert_entries(entries, batch_size=1000):
+    SearchEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=_UPDATE_FIELDS,
+        batch_size=batch_size,
+    )
+
+
+def index_students(student_ids=None, batch_size=1000):
+    """
+    (Re)index students and their guardians in bulk. `student_ids=None`
+    rebuilds everything; use after bulk_create / queryset.update() which
+    bypass the model signals.
+    """
+    students = Student.objects.only('pk', 'reg_no', 'first_name', 'last_name', 'phone', 'whatsapp', 'email')
+    guardians = Guardian.objects.values(
+        'pk', 'student_id', 'student__reg_no', 'name', 'phone', 'whatsapp', 'email'
+    )
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        students = students.filter(pk__in=student_ids)
+        guardians = guardians.filter(student_id__in=student_ids)
+
+    count = 0
+    batch = []
+    for s in students.order_by().iterator(chunk_size=batch_size):
+        batch.append(student_entry(s))
+        if len(batch) >= batch_size:
+            upsert_entries(batch, batch_size)
+            count += len(batch)
+            batch = []
+    for g in guardians.order_by().iterator(chunk_size=batch_size):
+        batch.append(guardian_entry(g))
+        if len(batch) >= batch_size:
+            upsert_entries(batch, batch_size)
+            count += len(batch)
+            batch = []
+    if batch:
+        upsert_entries(batch, batch_size)
+        count += len(batch)
+    return count
+
+
+def index_on_commit(student_ids):
+    """
+    index_students() for `student_ids` once the current transaction commits
+    (at once in autocommit). Ids from every call in the transaction are
+    indexed together, so saving a student and their guardians reads and
+    upserts them once.
+    """
+    pending = getattr(connection, 'search_pending_students', None)
+    if pending is None:
+        pending = connection.search_pending_students = set()
+    pending.update(student_ids)
+    # registered on every call: a rolled-back savepoint drops its callbacks
+    transaction.on_commit(_index_pending)
+
+
+def _index_pending():
+    pending = getattr(connection, 'search_pending_students', None)
+    connection.search_pending_students = None
+    if pending:
+        index_students(pending)
+
+
+def remove_entry(kind, object_id):
+    pending = _pending_removals.get()
+    if pending is not None:
+        pending.append((kind, object_id))
+        return
+    SearchEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+@contextmanager
+def batched_removals():
+    """
+    Collect the remove_entry() calls made in the block (e.g. post_delete for
+    every guardian of a queryset.delete()) and run them as one delete per kind.
+    """
+    pending = []
+    token = _pending_removals.set(pending)
+    try:
+        yield
+    finally:
+        _pending_removals.reset(token)
+    by_kind = {}
+    for kind, object_id in pending:
+        by_kind.setdefault(kind, []).append(object_id)
+    for kind, object_ids in by_kind.items():
+        SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+# -----------------------
+# Querying
+# -----------------------
+def _fts_quote(token):
+    return '"' + token.replace('"', '""') + '"'
+
+
+def _fts_query(terms):
+    clauses = []
+    for term in terms:
+        if term.isdigit() and len(term) >= 3:
+            # digits: phone suffix or the numeric part of a reg_no
+            clauses.append(f"(phone_tokens : {_fts_quote(term[::-1])}* OR reg_no : {_fts_quote(term)}*)")
+            continue
+        alts = [f"{{name_tokens reg_no email}} : {_fts_quote(term)}*"]
+        key = phonetic_key(term)
+        if len(key) >= 2:
+            alts.append(f"name_keys : {_fts_quote(key)}*")
+        clauses.append('(' + ' OR '.join(alts) + ')')
+    return ' AND '.join(clauses)
+
+
+def _word_prefix(field, term):
+    return Q(**{f'{field}__startswith': term}) | Q(**{f'{field}__contains': ' ' + term})
+
+
+def _orm_filter(terms):
+    cond = Q()
+    for term in terms:
+        if term.isdigit() and len(term) >= 3:
+            term_q = _word_prefix('phone_tokens', term[::-1]) | Q(reg_no__icontains=term)
+        else:
+            term_q = (_word_prefix('name_tokens', term) | Q(reg_no__istartswith=term)
+                      | Q(email__startswith=term))
+            key = phonetic_key(term)
+            if len(key) >= 2:
+                term_q |= _word_prefix('name_keys', key)
+        cond &= term_q
+    return cond
+
+
+def _ranked(entries, query):
+    """Stable re-rank by closeness of the display name to what was typed."""
+    return sorted(entries, key=lambda e: -SequenceMatcher(None, query, e.name_tokens).ratio())
+
+
+def search(query, kind=None, limit=20):
+    """Return up to `limit` SearchEntry rows best matching `query`."""
+    normalized = normalize(query)
+    terms = normalized.split()
+    if not terms:
+        return []
+    candidates = limit * 5
+
+    if connection.vendor == 'sqlite':
+        table = SearchEntry._meta.db_table
+        sql = (
+            f"SELECT {FTS_TABLE}.rowid FROM {FTS_TABLE} JOIN {table} e ON e.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s {'AND e.kind = %s ' if kind else ''}"
+            f"ORDER BY {FTS_TABLE}.rank LIMIT %s"
+        )
+        params = [_fts_query(terms)] + ([kind] if kind else []) + [candidates]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            ids = [row[0] for row in cursor.fetchall()]
+        return _ranked(SearchEntry.objects.filter(pk__in=ids), normalized)[:limit]
+
+    qs = SearchEntry.objects.all()
+    if kind:
+        qs = qs.filter(kind=kind)
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        qs = qs.annotate(sim=TrigramWordSimilarity(normalized, 'name_tokens'))
+        return list(qs.filter(_orm_filter(terms) | Q(sim__gte=0.4)).order_by('-sim')[:limit])
+    return _ranked(qs.filter(_orm_filter(terms))[:candidates], normalized)[:limit]
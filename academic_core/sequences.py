@@ -0,0 +1,157 @@
+# academic_core/sequences.py
+"""
+Generated IDs for students, classes, subjects and subject assignments.
+
+    next_id('student')           -> 'STU-2026-00042'
+    reserve('student', 500)      -> 500 consecutive free reg_nos (bulk import)
+    peek('class')                -> 'C014' (what next_id would return; reserves nothing)
+
+Formats come from settings.ID_SEQUENCE_FORMATS: a str.format() pattern with
+`{n}` for the counter (format spec allowed, e.g. {n:05d}) and optionally
+`{year}`. Each (series, year) has its own IdSequence row, so a {year}
+format restarts at 1 every January.
+
+A reservation is one UPDATE next_value = next_value + count on that row and
+one read of the new value inside the same transaction; the UPDATE's row
+lock makes concurrent reservations queue instead of handing out the same
+number. The first reservation in a scope seeds the counter past the highest
+matching ID already in the table, and IDs typed in by hand that happen to
+match a reserved number are skipped, so generated IDs never collide.
+"""
+import re
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import IdSequence, Student, Subject, SubjectAssignment, TuitionClass
+
+# series name -> (model, field holding the ID)
+SERIES = {
+    'student': (Student, 'reg_no'),
+    'class': (TuitionClass, 'class_id'),
+    'subject': (Subject, 'subject_id'),
+    'assignment': (SubjectAssignment, 'assign_id'),
+}
+
+DEFAULT_FORMATS = {
+    'student': 'STU-{year}-{n:05d}',
+    'class': 'C{n:03d}',
+    'subject': 'SUB{n:03d}',
+    'assignment': 'ASG{n:04d}',
+}
+
+_COUNTER = re.compile(r'\{n(?::[^}]*)?\}')
+
+# IDs per collision-check query (keeps IN (...) under SQLite's variable limit)
+_CHECK_CHUNK = 500
+
+
+class SequenceError(ValueError):
+    pass
+
+
+def _series(name):
+    if name not in SERIES:
+        raise SequenceError(f"Unknown ID series '{name}'. Choose from: {', '.join(SERIES)}")
+    formats = {**DEFAULT_FORMATS, **getattr(settings, 'ID_SEQUENCE_FORMATS', {})}
+    fmt = formats[name]
+    if len(_COUNTER.findall(fmt)) != 1:
+        raise SequenceError(f"ID format for '{name}' must contain {{n}} exactly once: {fmt!r}")
+    model, field = SERIES[name]
+    return model, field, fmt
+
+
+def _scope(fmt, today=None):
+    """The format with everything but the counter filled in."""
+    return fmt.replace('{year}', str((today or timezone.localdate()).year))
+
+
+def _seed(model, field, scope):
+    """Highest counter already used by IDs in `scope` (0 if none); one scan per scope."""
+    prefix, suffix = _COUNTER.split(scope)
+    pattern = re.compile(re.escape(prefix) + r'(\d+)' + re.escape(suffix))
+    values = model.objects.filter(**{f'{field}__startswith': prefix}).values_list(field, flat=True)
+    return max((int(m.group(1)) for m in map(pattern.fullmatch, values) if m), default=0)
+
+
+def _advance(key, count, seed):
+    """Move the counter for `key` on by `count`; returns the first reserved number."""
+    if not IdSequence.objects.filter(key=key).update(next_value=F('next_value') + count):
+        start = seed() + 1
+        try:
+            with transaction.atomic():
+                IdSequence.objects.create(key=key, next_value=start + count)
+            return start
+        except IntegrityError:  # created by a concurrent reservation
+            IdSequence.objects.filter(key=key).update(next_value=F('next_value') + count)
+    return IdSequence.objects.filter(key=key).values_list('next_value', flat=True).get() - count
+
+
+def reserve(name, count=1, today=None):
+    """Reserve `count` new IDs of series `name`; returns them in order."""
+    if count < 1:
+        return []
+    model, field, fmt = _series(name)
+    scope = _scope(fmt, today)
+    key = f'{name}:{scope}'
+    ids = []
+    with transaction.atomic():
+        while len(ids) < count:
+            need = count - len(ids)
+            start = _advance(key, need, lambda: _seed(model, field, scope))
+            batch = [scope.format(n=n) for n in range(start, start + need)]
+            taken = set()
+            for i in range(0, need, _CHECK_CHUNK):
+                taken.update(model.objects.filter(**{f'{field}__in': batch[i:i + _CHECK_CHUNK]})
+                             .values_list(field, flat=True))
+            ids.extend(value for value in batch if value not in taken)
+    return ids
+
+
+def next_id(name, today=None):
+    return reserve(name, 1, today)[0]
+
+
+def peek(name, today=None):
+    """The ID next_id() would hand out now, for display only (nothing is reserved)."""
+    model, field, fmt = _series(name)
+    scope = _scope(fmt, today)
+    current = IdSequence.objects.filter(key=f'{name}:{scope}').values_list('next_value', flat=True).first()
+    return scope.format(n=current if current is not None else _seed(model, field, scope) + 1)
+
+
+# -----------------------
+# Create views
+# -----------------------
+class SequenceIdMixin:
+    """
+    CreateView mixin: `sequence_field` may be left blank and is then filled
+    from series `sequence_name` when the form is saved. The form shows the
+    next ID as a placeholder; `next_id` is in the template context.
+    """
+    sequence_name = None
+    sequence_field = None
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        self.next_id_hint = peek(self.sequence_name)
+        field = form.fields[self.sequence_field]
+        field.required = False
+        field.widget.attrs['placeholder'] = f'{self.next_id_hint} (leave blank to assign)'
+        return form
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['next_id'] = getattr(self, 'next_id_hint', None)
+        return ctx
+
+    def assign_sequence_id(self, form):
+        """Fill a blank ID on form.instance; views that save the form themselves call it first."""
+        if not getattr(form.instance, self.sequence_field):
+            setattr(form.instance, self.sequence_field, next_id(self.sequence_name))
+
+    def form_valid(self, form):
+        self.assign_sequence_id(form)
+        return super().form_valid(form)
@@ -1,15 +1,33 @@
 from rest_framework import serializers
 from .models import (Teacher, TuitionClass, Subject, SubjectAssignment,
-                     Student, Guardian, Enrollment)
+                     Student, Guardian, Enrollment, ClassSession, Attendance,
+                     ATTENDANCE_STATUS_CHOICES)
+from . import images
+from .fieldsets import SparseFieldsetSerializerMixin
 
 
-class TeacherSerializer(serializers.ModelSerializer):
+class ImageDerivativesField(serializers.ReadOnlyField):
+    """ImageField -> {size name: absolute URL} of its resized derivatives (None without a photo)."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        urls = {size: images.derivative_url(value, size) for size in images.sizes()}
+        if request is not None:
+            urls = {size: request.build_absolute_uri(url) for size, url in urls.items()}
+        return urls
+
+
+class TeacherSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    profile_photo_urls = ImageDerivativesField(source='profile_photo')
+
     class Meta:
         model = Teacher
-        fields = ['id', 'title', 'first_name', 'last_name', 'phone', 'email']
+        fields = ['id', 'title', 'first_name', 'last_name', 'phone', 'email', 'profile_photo_urls']
 
 
-class TuitionClassSerializer(serializers.ModelSerializer):
+class TuitionClassSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     # include teacher fields nested for convenience (may be null)
     class_teacher = TeacherSerializer(read_only=True)
 
@@ -20,13 +38,13 @@ class TuitionClassSerializer(serializers.ModelSerializer):
                   'class_teacher', 'capacity', 'active']
 
 
-class SubjectSerializer(serializers.ModelSerializer):
+class SubjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Subject
         fields = ['id', 'subject_id', 'name', 'description']
 
 
-class SubjectAssignmentSerializer(serializers.ModelSerializer):
+class SubjectAssignmentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     # nested subject + teacher so UI has names
     subject = SubjectSerializer(read_only=True)
     teacher = TeacherSerializer(read_only=True)
@@ -36,27 +54,76 @@ class SubjectAssignmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'assign_id', 'subject', 'teacher', 'start_date', 'end_date', 'notes']
 
 
-class GuardianSerializer(serializers.ModelSerializer):
+class GuardianSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Guardian
         fields = ['id', 'student', 'name', 'relationship', 'phone', 'whatsapp', 'email', 'is_primary']
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     guardians = GuardianSerializer(many=True, read_only=True)
     current_class = TuitionClassSerializer(read_only=True)
+    profile_photo_urls = ImageDerivativesField(source='profile_photo')
 
     class Meta:
         model = Student
-        fields = ['id', 'reg_no', 'profile_photo', 'first_name', 'last_name',
+        fields = ['id', 'reg_no', 'profile_photo', 'profile_photo_urls', 'first_name', 'last_name',
                   'dob', 'joined_date', 'nic', 'school', 'gender',
                   'current_class', 'address', 'phone', 'whatsapp', 'email', 'is_active', 'guardians']
 
 
-class EnrollmentSerializer(serializers.ModelSerializer):
+class EnrollmentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     student = StudentSerializer(read_only=True)
     tuition_class = TuitionClassSerializer(read_only=True)
 
     class Meta:
         model = Enrollment
         fields = ['id', 'student', 'tuition_class', 'start_date', 'end_date', 'active', 'fee_override']
+
+
+class ClassSessionSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ClassSession
+        fields = ['id', 'tuition_class', 'date', 'start_time', 'end_time', 'topic', 'is_closed', 'created_at']
+        read_only_fields = ['is_closed', 'created_at']
+
+
+class AttendanceSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    reg_no = serializers.CharField(source='student.reg_no', read_only=True)
+
+    class Meta:
+        model = Attendance
+        fields = ['id', 'session', 'student', 'reg_no', 'status', 'marked_at', 'marked_by']
+
+
+# flat item serializers for the bulk/ endpoints (bulk.py): foreign keys as plain ids,
+# resolved for the whole batch with one in_bulk(), and no per-item unique queries
+class GuardianBulkSerializer(serializers.ModelSerializer):
+    student = serializers.IntegerField(source='student_id')
+
+    class Meta:
+        model = Guardian
+        fields = ['id', 'student', 'name', 'relationship', 'phone', 'whatsapp', 'email', 'is_primary']
+        validators = []
+
+
+class EnrollmentBulkSerializer(serializers.ModelSerializer):
+    student = serializers.IntegerField(source='student_id')
+    tuition_class = serializers.IntegerField(source='tuition_class_id')
+
+    class Meta:
+        model = Enrollment
+        fields = ['id', 'student', 'tuition_class', 'start_date', 'end_date', 'active', 'fee_override']
+        validators = []  # unique_together is checked per batch
+
+
+# plain (non-model) serializers for the card-mark batch endpoint;
+# kept flat so validating a few hundred scans stays cheap
+class CardScanSerializer(serializers.Serializer):
+    reg_no = serializers.CharField(max_length=30)
+    status = serializers.ChoiceField(choices=ATTENDANCE_STATUS_CHOICES, required=False)
+    scanned_at = serializers.DateTimeField(required=False)
+
+
+class CardScanBatchSerializer(serializers.Serializer):
+    scans = CardScanSerializer(many=True, allow_empty=False, max_length=1000)
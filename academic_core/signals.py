@@ -1,8 +1,15 @@
 # academic_core/signals.py
-from django.db.models.signals import post_save
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from .models import SubjectAssignment
-from core.notifications import subject_assigned
+from django.utils import timezone
+from .models import SubjectAssignment, ClassSession, Student, Guardian, Teacher
+from .outbox import enqueue
+from . import feed, images, search
+from .promotion import close_enrollments
+from .conditional import TRACKED_MODELS, bump
+from . import caching
 
 @receiver(post_save, sender=SubjectAssignment)
 def on_subject_assignment_created(sender, instance, created, **kwargs):
@@ -12,5 +19,119 @@ def on_subject_assignment_created(sender, instance, created, **kwargs):
             'subject_id': instance.subject_id,
             'assignment_id': instance.pk
         }
-        # send lightweight signal; receivers implemented in other apps
-        subject_assigned.send(sender=sender, **payload)
+        # queued in the same transaction; the notification worker sends the
+        # subject_assigned signal so receivers never run inside the request
+        enqueue('subject_assigned', dedupe_key=f'subject_assigned:{instance.pk}', **payload)
+
+
+@receiver(post_save, sender=ClassSession)
+def on_class_session_created(sender, instance, created, **kwargs):
+    if created:
+        enqueue(
+            'session_created',
+            dedupe_key=f'session_created:{instance.pk}',
+            session_id=instance.pk,
+            class_id=instance.tuition_class_id,
+            date=instance.date,
+        )
+
+
+# -----------------------
+# Deactivating a student closes their open enrollments, so billing stops
+# (promote_students graduation does the same with queryset updates)
+# -----------------------
+@receiver(post_save, sender=Student)
+def on_student_deactivated(sender, instance, created, raw=False, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    if not raw and not created and loaded.get('is_active') and not instance.is_active:
+        close_enrollments([instance.pk], timezone.localdate())
+
+
+# -----------------------
+# Search index sync, once per transaction (bulk_create / update() bypass these:
+# call search.index_students())
+# -----------------------
+@receiver(post_save, sender=Student)
+def on_student_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        # also refreshes the reg_no stored on the student's guardian entries
+        search.index_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=Guardian)
+def on_guardian_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_on_commit([instance.student_id])
+
+
+@receiver(post_delete, sender=Guardian)
+def on_guardian_deleted(sender, instance, **kwargs):
+    search.remove_entry('guardian', instance.pk)
+
+
+# -----------------------
+# Table versions for ETag / Last-Modified (bulk writers call conditional.bump() themselves)
+# -----------------------
+def on_tracked_model_changed(sender, raw=False, **kwargs):
+    if not raw:
+        bump(sender)
+
+
+for _model in TRACKED_MODELS:
+    post_save.connect(on_tracked_model_changed, sender=_model, dispatch_uid=f'table-version-save-{_model._meta.label_lower}')
+    post_delete.connect(on_tracked_model_changed, sender=_model, dispatch_uid=f'table-version-delete-{_model._meta.label_lower}')
+
+
+
+# -----------------------
+# Cache generations (academic_core/caching.py; bulk writers call caching.invalidate() themselves)
+# -----------------------
+def on_cached_model_changed(sender, raw=False, **kwargs):
+    if not raw:
+        caching.invalidate(sender)
+
+
+for _model in apps.get_app_config('academic_core').get_models():
+    post_save.connect(on_cached_model_changed, sender=_model, dispatch_uid=f'cache-save-{_model._meta.label_lower}')
+    post_delete.connect(on_cached_model_changed, sender=_model, dispatch_uid=f'cache-delete-{_model._meta.label_lower}')
+
+# user accounts feed the TeacherForm.user dropdown (choices.USER_CHOICES)
+post_save.connect(on_cached_model_changed, sender=settings.AUTH_USER_MODEL, dispatch_uid='cache-save-user')
+post_delete.connect(on_cached_model_changed, sender=settings.AUTH_USER_MODEL, dispatch_uid='cache-delete-user')
+
+
+# -----------------------
+# Live feed for dashboards (academic_core/feed.py)
+# -----------------------
+def on_feed_model_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        feed.model_changed(instance, 'created' if created else 'updated')
+
+
+def on_feed_model_deleted(sender, instance, **kwargs):
+    feed.model_changed(instance, 'deleted')
+
+
+for _model in feed.MODEL_EVENTS:
+    post_save.connect(on_feed_model_saved, sender=_model, dispatch_uid=f'feed-save-{_model._meta.label_lower}')
+    post_delete.connect(on_feed_model_deleted, sender=_model, dispatch_uid=f'feed-delete-{_model._meta.label_lower}')
+
+
+# -----------------------
+# Profile photo derivatives (academic_core/images.py), built once per upload
+# -----------------------
+def on_photo_model_saving(sender, instance, raw=False, **kwargs):
+    photo = instance.profile_photo
+    # a FieldFile holding a new upload is not committed to storage until the save
+    instance._photo_uploaded = not raw and bool(photo) and not photo._committed
+
+
+def on_photo_model_saved(sender, instance, **kwargs):
+    if getattr(instance, '_photo_uploaded', False):
+        instance._photo_uploaded = False
+        images.build_derivatives(instance.profile_photo)
+
+
+for _model in (Student, Teacher):
+    pre_save.connect(on_photo_model_saving, sender=_model, dispatch_uid=f'photo-saving-{_model._meta.label_lower}')
+    post_save.connect(on_photo_model_saved, sender=_model, dispatch_uid=f'photo-saved-{_model._meta.label_lower}')
@@ -0,0 +1,312 @@
+# academic_core/synthetic.py
+"""
+Deterministic synthetic school data for load testing and benchmarks.
+
+    seed_school(default_volumes(scale=0.1), seed=42)
+
+The same seed, volumes and `as_of` date always produce the same rows (names,
+phones, dates, class memberships); primary keys and IDs also match when the
+database starts empty. Everything is written with bulk_create in batches,
+so 50k students / 200k enrollments take seconds rather than minutes, and the
+search index, table versions and caches are refreshed afterwards because
+bulk_create skips the model signals.
+"""
+import random
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import caching, search, sequences
+from .conditional import bump
+from .models import (
+    Attendance, ClassSession, Enrollment, Guardian, IdSequence, Invoice, SearchEntry, Student, Subject,
+    SubjectAssignment, Teacher, TuitionClass,
+)
+
+# a fixed default, so runs on different days generate identical data
+DEFAULT_AS_OF = date(2026, 1, 5)
+
+Volumes = namedtuple('Volumes', 'teachers subjects classes students guardians enrollments sessions_per_class')
+
+SeedResult = namedtuple('SeedResult', 'teachers subjects assignments classes students guardians enrollments '
+                                      'sessions attendance')
+
+# children first, so deleting never trips a PROTECT
+SCHOOL_MODELS = (
+    SearchEntry, Invoice, Attendance, ClassSession, Enrollment, Guardian, Student,
+    SubjectAssignment, TuitionClass, Subject, Teacher,
+)
+
+FIRST_NAMES = {
+    'male': ('Nimal', 'Kamal', 'Sunil', 'Ruwan', 'Kasun', 'Dinesh', 'Tharindu', 'Chamara', 'Lahiru', 'Isuru',
+             'Pradeep', 'Asanka', 'Nuwan', 'Sahan', 'Dilshan', 'Mohamed', 'Arjun', 'Kavin', 'Ravindu', 'Yasiru'),
+    'female': ('Nimali', 'Kumari', 'Sanduni', 'Dilini', 'Hiruni', 'Tharushi', 'Ishara', 'Chathurika', 'Nadeesha',
+               'Amaya', 'Sachini', 'Fathima', 'Kavya', 'Anjali', 'Dulani', 'Ruvini', 'Sewwandi', 'Nethmi'),
+}
+LAST_NAMES = (
+    'Perera', 'Fernando', 'Silva', 'de Silva', 'Jayasinghe', 'Bandara', 'Dissanayake', 'Wickramasinghe',
+    'Gunawardena', 'Rajapaksa', 'Herath', 'Kumara', 'Ratnayake', 'Senanayake', 'Weerasinghe', 'Mendis',
+    'Karunaratne', 'Liyanage', 'Samarasinghe', 'Abeysekera', 'Wijesinghe', 'Pathirana', 'Rathnayake',
+    'Ekanayake', 'Amarasinghe', 'Hettiarachchi', 'Rodrigo', 'Peiris', 'Navaratnam', 'Sivakumar',
+)
+SUBJECT_NAMES = (
+    'Mathematics', 'Combined Maths', 'Physics', 'Chemistry', 'Biology', 'Science', 'English', 'Sinhala',
+    'Tamil', 'History', 'Geography', 'ICT', 'Accounting', 'Economics', 'Business Studies', 'Buddhism',
+    'Art', 'Music', 'Commerce', 'Agriculture',
+)
+SCHOOLS = (
+    'Royal College', 'Ananda College', 'Nalanda College', 'Visakha Vidyalaya', 'Musaeus College',
+    'Devi Balika Vidyalaya', 'D.S. Senanayake College', 'Isipathana College', 'St. Joseph\'s College',
+    'Sirimavo Bandaranaike Vidyalaya', 'Thurstan College', 'Mahamaya Girls\' College',
+)
+CITIES = ('Colombo', 'Nugegoda', 'Maharagama', 'Dehiwala', 'Kandy', 'Gampaha', 'Kurunegala', 'Galle', 'Panadura')
+
+
+def _scaled(value, scale, minimum=1):
+    return max(minimum, int(round(value * scale)))
+
+
+def default_volumes(scale=1.0):
+    """50k students / 100k guardians / 500 classes / 200k enrollments at scale 1."""
+    return Volumes(
+        teachers=_scaled(150, scale),
+        subjects=min(len(SUBJECT_NAMES) * 3, _scaled(40, scale)),
+        classes=_scaled(500, scale),
+        students=_scaled(50000, scale),
+        guardians=_scaled(100000, scale),
+        enrollments=_scaled(200000, scale),
+        sessions_per_class=2,
+    )
+
+
+def _phone(rnd):
+    return f'07{rnd.randrange(10 ** 8):08d}'
+
+
+def _insert(model, objs, batch_size):
+    """bulk_create an iterable in batches without holding it all in memory; returns the count."""
+    objs = iter(objs)
+    count = 0
+    while True:
+        batch = list(islice(objs, batch_size))
+        if not batch:
+            return count
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        count += len(batch)
+
+
+def is_empty():
+    return not any(model.objects.exists() for model in (Teacher, TuitionClass, Subject, Student))
+
+
+def flush():
+    """Delete every teacher, class, subject and student (and everything hanging off them)."""
+    with transaction.atomic():
+        for model in SCHOOL_MODELS:
+            model.objects.all().delete()
+        IdSequence.objects.filter(key__regex=r'^(student|class|subject|assignment):').delete()
+        _refresh()
+
+
+def _refresh():
+    bump(*SCHOOL_MODELS)
+    caching.invalidate(*SCHOOL_MODELS)
+
+
+# -----------------------
+# Generation
+# -----------------------
+def _teachers(rnd, count):
+    for _ in range(count):
+        gender = rnd.choice(('male', 'female'))
+        yield Teacher(
+            title='mr' if gender == 'male' else rnd.choice(('ms', 'mrs')),
+            first_name=rnd.choice(FIRST_NAMES[gender]),
+            last_name=rnd.choice(LAST_NAMES),
+            phone=_phone(rnd),
+            is_active=rnd.random() < 0.95,
+        )
+
+
+def _subjects(count):
+    ids = sequences.reserve('subject', count)
+    for i, subject_id in enumerate(ids):
+        rounds, index = divmod(i, len(SUBJECT_NAMES))
+        name = SUBJECT_NAMES[index] + (f' ({("Theory", "Revision", "Paper Class")[rounds - 1]})' if rounds else '')
+        yield Subject(subject_id=subject_id, name=name)
+
+
+def _assignments(rnd, teachers, subjects, as_of):
+    pairs = []
+    for teacher in teachers:
+        for subject in rnd.sample(subjects, min(len(subjects), rnd.randint(1, 3))):
+            pairs.append((teacher, subject))
+    for (teacher, subject), assign_id in zip(pairs, sequences.reserve('assignment', len(pairs))):
+        yield SubjectAssignment(
+            assign_id=assign_id, teacher_id=teacher.pk, subject_id=subject.pk,
+            start_date=as_of - timedelta(days=rnd.randrange(3 * 365)),
+        )
+
+
+def _classes(rnd, count, teachers, subjects):
+    for class_id in sequences.reserve('class', count):
+        monthly = rnd.random() < 0.5
+        fee = Decimal(rnd.choice((1000, 1500, 2000, 2500, 3000)))
+        yield TuitionClass(
+            class_id=class_id,
+            name=f'{rnd.choice(subjects).name} - Grade {rnd.randint(6, 13)}',
+            class_mode=rnd.choices(('group', 'online', 'one_to_one', 'home'), weights=(80, 15, 3, 2))[0],
+            fee_type='monthly' if monthly else 'per_session',
+            monthly_fee=fee * 4 if monthly else Decimal('0.00'),
+            per_session_fee=Decimal('0.00') if monthly else fee,
+            class_teacher_id=rnd.choice(teachers).pk,
+            capacity=rnd.choice((50, 100, 150, 200)),
+            active=rnd.random() < 0.9,
+        )
+
+
+def _students(rnd, count, class_ids, as_of):
+    for reg_no in sequences.reserve('student', count, today=as_of):
+        gender = rnd.choice(('male', 'female'))
+        first, last = rnd.choice(FIRST_NAMES[gender]), rnd.choice(LAST_NAMES)
+        phone = _phone(rnd)
+        email = f"{first}.{last}{rnd.randrange(1000)}@example.com".lower().replace(' ', '')
+        yield Student(
+            reg_no=reg_no,
+            first_name=first,
+            last_name=last,
+            gender=gender,
+            dob=as_of - timedelta(days=rnd.randint(10 * 365, 19 * 365)),
+            joined_date=as_of - timedelta(days=rnd.randrange(3 * 365)),
+            school=rnd.choice(SCHOOLS),
+            address=f'{rnd.randint(1, 450)}, {rnd.choice(LAST_NAMES)} Mawatha, {rnd.choice(CITIES)}',
+            phone=phone,
+            whatsapp=phone if rnd.random() < 0.6 else '',
+            email=email if rnd.random() < 0.3 else None,
+            current_class_id=rnd.choice(class_ids) if class_ids and rnd.random() < 0.95 else None,
+            is_active=rnd.random() < 0.92,
+        )
+
+
+def _spread(rnd, total, owners):
+    """Split `total` over `owners`: one each first, the rest at random. Returns a count per owner."""
+    if not owners:
+        return []
+    counts = [1] * min(total, owners)
+    counts += [0] * (owners - len(counts))
+    for _ in range(total - min(total, owners)):
+        counts[rnd.randrange(owners)] += 1
+    return counts
+
+
+def _guardians(rnd, students, total):
+    for (student_pk, _, surname), n in zip(students, _spread(rnd, total, len(students))):
+        for i in range(n):
+            relationship = rnd.choices(('mother', 'father', 'guardian', 'other'), weights=(45, 40, 10, 5))[0]
+            gender = {'father': 'male', 'mother': 'female'}.get(relationship) or rnd.choice(('male', 'female'))
+            yield Guardian(
+                student_id=student_pk,
+                name=f'{rnd.choice(FIRST_NAMES[gender])} {surname}',
+                relationship=relationship,
+                phone=_phone(rnd),
+                is_primary=i == 0,
+            )
+
+
+def _enrollments(rnd, students, class_ids, total, as_of):
+    """The current class first, then random other classes; (student, class) pairs are unique."""
+    if not class_ids:
+        return
+    per_student = _spread(rnd, total, len(students))
+    for (student_pk, current_class, _), n in zip(students, per_student):
+        chosen = [current_class] if current_class and n else []
+        wanted = min(n, len(class_ids))
+        while len(chosen) < wanted:
+            class_id = rnd.choice(class_ids)
+            if class_id not in chosen:
+                chosen.append(class_id)
+        for class_id in chosen:
+            active = class_id == current_class or rnd.random() < 0.7
+            start = as_of - timedelta(days=rnd.randrange(2 * 365))
+            yield Enrollment(
+                student_id=student_pk, tuition_class_id=class_id, start_date=start, active=active,
+                end_date=None if active else min(as_of, start + timedelta(days=rnd.randint(30, 300))),
+            )
+
+
+def _sessions(rnd, class_ids, per_class, as_of):
+    for class_id in class_ids:
+        for week in range(per_class, 0, -1):
+            hour = rnd.choice((8, 10, 14, 16, 18))
+            yield ClassSession(
+                tuition_class_id=class_id,
+                date=as_of - timedelta(weeks=week),
+                start_time=f'{hour:02d}:00',
+                end_time=f'{hour + 2:02d}:00',
+                is_closed=True,
+            )
+
+
+def _attendance(rnd, sessions, rosters):
+    for session_pk, class_id, day in sessions:
+        marked_at = timezone.make_aware(datetime.combine(day, time(10)))
+        for student_pk in rosters.get(class_id, ()):
+            status = rnd.choices(('present', 'late', 'absent', 'excused'), weights=(82, 6, 10, 2))[0]
+            yield Attendance(session_id=session_pk, student_id=student_pk, status=status, marked_at=marked_at)
+
+
+def seed_school(volumes, seed=0, as_of=DEFAULT_AS_OF, batch_size=2000, progress=None):
+    """
+    Generate a school of `volumes` (see default_volumes) into an empty
+    database, in one transaction. `progress(label, count)` is called after
+    each table. Returns a SeedResult of row counts.
+    """
+    rnd = random.Random(seed)
+    report = progress or (lambda label, count: None)
+
+    with transaction.atomic():
+        n_teachers = _insert(Teacher, _teachers(rnd, volumes.teachers), batch_size)
+        report('teachers', n_teachers)
+        teachers = list(Teacher.objects.order_by('pk').only('pk'))
+        n_subjects = _insert(Subject, _subjects(volumes.subjects), batch_size)
+        report('subjects', n_subjects)
+        subjects = list(Subject.objects.order_by('pk').only('pk', 'name'))
+        n_assignments = _insert(SubjectAssignment, _assignments(rnd, teachers, subjects, as_of), batch_size)
+        report('subject assignments', n_assignments)
+
+        n_classes = _insert(TuitionClass, _classes(rnd, volumes.classes, teachers, subjects), batch_size)
+        report('classes', n_classes)
+        active_classes = list(TuitionClass.objects.filter(active=True).order_by('pk').values_list('pk', flat=True))
+        class_ids = list(TuitionClass.objects.order_by('pk').values_list('pk', flat=True))
+
+        n_students = _insert(Student, _students(rnd, volumes.students, active_classes, as_of), batch_size)
+        report('students', n_students)
+        # (pk, current_class_id, last_name) is all the later tables need
+        students = list(Student.objects.order_by('pk').values_list('pk', 'current_class_id', 'last_name'))
+
+        n_guardians = _insert(Guardian, _guardians(rnd, students, volumes.guardians), batch_size)
+        report('guardians', n_guardians)
+        n_enrollments = _insert(Enrollment, _enrollments(rnd, students, class_ids, volumes.enrollments, as_of),
+                                batch_size)
+        report('enrollments', n_enrollments)
+
+        n_sessions = _insert(ClassSession, _sessions(rnd, class_ids, volumes.sessions_per_class, as_of), batch_size)
+        report('class sessions', n_sessions)
+        rosters = {}
+        for student_pk, class_pk in (Enrollment.objects.filter(active=True).order_by('tuition_class', 'student')
+                                     .values_list('student_id', 'tuition_class_id')):
+            rosters.setdefault(class_pk, []).append(student_pk)
+        sessions = ClassSession.objects.order_by('pk').values_list('pk', 'tuition_class_id', 'date')
+        n_attendance = _insert(Attendance, _attendance(rnd, sessions, rosters), batch_size)
+        report('attendance marks', n_attendance)
+
+        # bulk_create skips post_save: index, bump versions and drop caches explicitly
+        report('search entries', search.index_students(batch_size=batch_size))
+        _refresh()
+
+    return SeedResult(n_teachers, n_subjects, n_assignments, n_classes, n_students, n_guardians, n_enrollments,
+                      n_sessions, n_attendance)
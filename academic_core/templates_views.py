@@ -1,4 +1,6 @@
 # academic_core/templates_views.py
+import logging
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
@@ -6,10 +8,14 @@ from django.db import transaction, IntegrityError
 from django.forms import inlineformset_factory
 from django.contrib import messages
 from django.db.models.deletion import ProtectedError
-import re
+from django.db.models import Q, Count, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
+from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse, HttpResponseBadRequest, JsonResponse
+from django.utils import timezone
 
 # CBV-friendly decorators (from accounts/decorators.py)
-from accounts.decorators import admin_required_cbv, staff_or_admin_required_cbv
+from accounts.decorators import admin_required_cbv, staff_or_admin_required_cbv, staff_or_admin_required
 
 from .models import (
     Teacher, TuitionClass, Subject, SubjectAssignment,
@@ -19,27 +25,152 @@ from .forms import (
     TeacherForm, TuitionClassForm, SubjectForm, SubjectAssignmentForm,
     StudentForm, EnrollmentForm, GuardianForm
 )
+from . import caching, dashboard, exports
+from .conditional import ConditionalPageMixin, bump
+from .querybudget import query_budget
+from .sequences import SequenceIdMixin
+
+logger = logging.getLogger(__name__)
 
 
+# -----------------------
+# Server-side list helpers
+# -----------------------
+class SortFilterListMixin:
+    """
+    ListView mixin: paging, sorting and filtering happen in the database and
+    the state lives in the query string so links / bookmarks keep it.
+
+    - ?q=       icontains search over `search_fields` (OR'ed)
+    - ?sort=    a key of `sort_fields`, '-' prefix for descending
+    - ?per_page= one of `page_size_choices`
+    - ?<name>=  exact filters declared in `filter_fields` ({param: lookup})
+    """
+    paginate_by = 25
+    page_size_choices = (25, 50, 100)
+    search_fields = ()
+    sort_fields = {}
+    default_sort = None
+    filter_fields = {}
+
+    def get_paginate_by(self, queryset):
+        try:
+            per_page = int(self.request.GET.get('per_page', self.paginate_by))
+        except ValueError:
+            return self.paginate_by
+        return per_page if per_page in self.page_size_choices else self.paginate_by
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort') or self.default_sort
+        if sort and sort.lstrip('-') in self.sort_fields:
+            return sort
+        return self.default_sort
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+
+        for param, lookup in self.filter_fields.items():
+            value = self.request.GET.get(param)
+            if value in (None, ''):
+                continue
+            try:
+                qs = qs.filter(**{lookup: value})
+            except (ValidationError, ValueError):
+                # ignore filters that don't parse (e.g. ?current_class=abc)
+                continue
+
+        term = self.request.GET.get('q', '').strip()
+        if term and self.search_fields:
+            cond = Q()
+            for field in self.search_fields:
+                cond |= Q(**{f'{field}__icontains': term})
+            qs = qs.filter(cond)
+
+        sort = self.get_sort()
+        if sort:
+            desc = sort.startswith('-')
+            fields = self.sort_fields[sort.lstrip('-')]
+            qs = qs.order_by(*[('-' + f if desc else f) for f in fields], '-pk' if desc else 'pk')
+        return qs
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        ctx['page_query'] = params.urlencode()
+
+        current = self.get_sort()
+        sort_links = {}
+        for key in self.sort_fields:
+            toggled = params.copy()
+            toggled['sort'] = f'-{key}' if current == key else key
+            sort_links[key] = toggled.urlencode()
+        ctx['sort_links'] = sort_links
+        ctx['sort_state'] = {
+            key: ('desc' if current == f'-{key}' else 'asc' if current == key else '')
+            for key in self.sort_fields
+        }
+        ctx['search_query'] = self.request.GET.get('q', '')
+        ctx['page_size_choices'] = self.page_size_choices
+        ctx['per_page'] = self.get_paginate_by(None)
+        ctx['active_filters'] = {
+            p: self.request.GET.get(p) for p in self.filter_fields if self.request.GET.get(p)
+        }
+        return ctx
+
+
+def _count_subquery(model, fk_field, **filters):
+    """Correlated COUNT(*) per parent row, usable in .annotate() without join fan-out."""
+    counts = (
+        model.objects.filter(**{fk_field: OuterRef('pk')}, **filters)
+        .order_by()
+        .values(fk_field)
+        .annotate(c=Count('pk'))
+        .values('c')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+@query_budget(6)
 def index(request):
+    # figures come from the dashboard cache; no COUNT queries on a warm cache
+    stats = dashboard.stats()
     ctx = {
-        'total_students': Student.objects.count(),
-        'total_teachers': Teacher.objects.count(),
-        'total_classes': TuitionClass.objects.count(),
+        'stats': stats,
+        'total_students': stats['students']['total'],
+        'total_teachers': stats['teachers']['total'],
+        'total_classes': stats['classes']['total'],
     }
     return render(request, 'academic_core/index.html', ctx)
 
 
+@query_budget(4)
+def dashboard_stats(request):
+    """Dashboard figures plus ready-made Chart.js data for the home page widgets."""
+    stats = dashboard.stats()
+    return JsonResponse({**stats, 'charts': dashboard.chart_data(stats)})
+
+
 # -----------------------
 # Teacher views
 # -----------------------
-class TeacherListView(ListView):
+@query_budget(5)
+class TeacherListView(ConditionalPageMixin, SortFilterListMixin, ListView):
     model = Teacher
+    conditional_models = (Teacher,)
     template_name = 'academic_core/teacher_list.html'
     context_object_name = 'teachers'
     queryset = Teacher.objects.all().order_by('last_name', 'first_name')
+    search_fields = ('first_name', 'last_name', 'email', 'phone')
+    sort_fields = {
+        'name': ('last_name', 'first_name'),
+        'email': ('email',),
+    }
+    default_sort = 'name'
+    filter_fields = {'is_active': 'is_active'}
 
 
+@query_budget({'get': 3})
 @staff_or_admin_required_cbv
 class TeacherCreateView(CreateView):
     model = Teacher
@@ -48,8 +179,10 @@ class TeacherCreateView(CreateView):
     success_url = reverse_lazy('academic_core:teacher_list')
 
 
-class TeacherDetailView(DetailView):
+@query_budget(5)
+class TeacherDetailView(ConditionalPageMixin, DetailView):
     model = Teacher
+    conditional_models = (Teacher, SubjectAssignment, Subject, TuitionClass)
     template_name = 'academic_core/teacher_detail.html'
     context_object_name = 'teacher'
 
@@ -68,6 +201,7 @@ class TeacherDetailView(DetailView):
         return ctx
 
 
+@query_budget({'get': 4})
 @staff_or_admin_required_cbv
 class TeacherUpdateView(UpdateView):
     model = Teacher
@@ -91,28 +225,35 @@ class TeacherDeleteView(DeleteView):
         self.object = self.get_object()
 
         # If admin submitted reassign targets, perform reassign then delete
-        reassign_classes_to = request.POST.get('reassign_classes_to')
-        reassign_assignments_to = request.POST.get('reassign_assignments_to')
+        reassign_classes_to = request.POST.get('reassign_classes_to', '')
+        reassign_assignments_to = request.POST.get('reassign_assignments_to', '')
 
         if reassign_classes_to or reassign_assignments_to:
+            # both targets in one query, checked before anything is moved
+            targets = Teacher.objects.in_bulk(
+                {int(pk) for pk in (reassign_classes_to, reassign_assignments_to) if pk.isdigit()})
+            target_teacher = targets.get(int(reassign_classes_to)) if reassign_classes_to.isdigit() else None
+            target_teacher2 = targets.get(int(reassign_assignments_to)) if reassign_assignments_to.isdigit() else None
+            if reassign_classes_to and target_teacher is None:
+                messages.error(request, "Target teacher for classes not found.")
+                return redirect('academic_core:teacher_delete', pk=self.object.pk)
+            if reassign_assignments_to and target_teacher2 is None:
+                messages.error(request, "Target teacher for subject assignments not found.")
+                return redirect('academic_core:teacher_delete', pk=self.object.pk)
+
             with transaction.atomic():
                 moved_classes = 0
                 moved_assignments = 0
-                if reassign_classes_to:
-                    try:
-                        target_teacher = Teacher.objects.get(pk=int(reassign_classes_to))
-                        moved_classes = TuitionClass.objects.filter(class_teacher=self.object).update(class_teacher=target_teacher)
-                    except (Teacher.DoesNotExist, ValueError):
-                        messages.error(request, "Target teacher for classes not found.")
-                        return redirect('academic_core:teacher_delete', pk=self.object.pk)
-
-                if reassign_assignments_to:
-                    try:
-                        target_teacher2 = Teacher.objects.get(pk=int(reassign_assignments_to))
-                        moved_assignments = SubjectAssignment.objects.filter(teacher=self.object).update(teacher=target_teacher2)
-                    except (Teacher.DoesNotExist, ValueError):
-                        messages.error(request, "Target teacher for subject assignments not found.")
-                        return redirect('academic_core:teacher_delete', pk=self.object.pk)
+                if target_teacher is not None:
+                    moved_classes = TuitionClass.objects.filter(class_teacher=self.object).update(
+                        class_teacher=target_teacher, updated_at=timezone.now())
+                if target_teacher2 is not None:
+                    moved_assignments = SubjectAssignment.objects.filter(teacher=self.object).update(
+                        teacher=target_teacher2, updated_at=timezone.now())
+
+                # update() skips post_save: refresh ETags and cached lists here
+                bump(TuitionClass, SubjectAssignment)
+                caching.invalidate(TuitionClass, SubjectAssignment)
 
                 # After reassigning, delete the teacher
                 self.object.delete()
@@ -146,29 +287,47 @@ class TeacherDeleteView(DeleteView):
 # -----------------------
 # Class views
 # -----------------------
-class TuitionClassListView(ListView):
+@query_budget(5)
+class TuitionClassListView(ConditionalPageMixin, SortFilterListMixin, ListView):
+    """
+    Student and active-enrollment counts are annotated on the page query itself,
+    so the template no longer issues a COUNT per row.
+    """
     model = TuitionClass
+    conditional_models = (TuitionClass, Teacher, Student, Enrollment)
     template_name = 'academic_core/class_list.html'
     context_object_name = 'classes'
-    queryset = TuitionClass.objects.all().order_by('class_id')
+    queryset = TuitionClass.objects.select_related('class_teacher').annotate(
+        student_count=_count_subquery(Student, 'current_class'),
+        enrollment_count=_count_subquery(Enrollment, 'tuition_class', active=True),
+    )
+    search_fields = ('class_id', 'name')
+    sort_fields = {
+        'class_id': ('class_id',),
+        'name': ('name',),
+        'students': ('student_count',),
+        'enrollments': ('enrollment_count',),
+    }
+    default_sort = 'class_id'
+    filter_fields = {'active': 'active', 'mode': 'class_mode', 'teacher': 'class_teacher'}
 
 
+@query_budget({'get': 5})
 @staff_or_admin_required_cbv
-class TuitionClassCreateView(CreateView):
+class TuitionClassCreateView(SequenceIdMixin, CreateView):
     model = TuitionClass
     form_class = TuitionClassForm
     template_name = 'academic_core/class_form.html'
     success_url = reverse_lazy('academic_core:class_list')
-
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        last_class = TuitionClass.objects.order_by('-id').first()
-        ctx['last_class_id'] = last_class.class_id if last_class else None
-        return ctx
+    sequence_name = 'class'
+    sequence_field = 'class_id'
 
 
-class TuitionClassDetailView(DetailView):
+@query_budget(5)
+class TuitionClassDetailView(ConditionalPageMixin, DetailView):
     model = TuitionClass
+    queryset = TuitionClass.objects.select_related('class_teacher')
+    conditional_models = (TuitionClass, Teacher, Student)
     template_name = 'academic_core/class_detail.html'
     context_object_name = 'class_obj'
 
@@ -180,6 +339,7 @@ class TuitionClassDetailView(DetailView):
         return ctx
 
 
+@query_budget({'get': 4})
 @staff_or_admin_required_cbv
 class TuitionClassUpdateView(UpdateView):
     model = TuitionClass
@@ -187,12 +347,6 @@ class TuitionClassUpdateView(UpdateView):
     template_name = 'academic_core/class_form.html'
     success_url = reverse_lazy('academic_core:class_list')
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        last_class = TuitionClass.objects.order_by('-id').first()
-        ctx['last_class_id'] = last_class.class_id if last_class else None
-        return ctx
-
 
 @admin_required_cbv
 class TuitionClassDeleteView(DeleteView):
@@ -216,7 +370,10 @@ class TuitionClassDeleteView(DeleteView):
 
             with transaction.atomic():
                 students_qs = Student.objects.filter(current_class=self.object)
-                count = students_qs.update(current_class=target)
+                count = students_qs.update(current_class=target, updated_at=timezone.now())
+                # update() skips post_save: refresh ETags and cached lists here
+                bump(Student)
+                caching.invalidate(Student)
                 self.object.delete()
             messages.success(request, f"Moved {count} student(s) to '{target}' and deleted class.")
             return redirect(self.success_url)
@@ -243,27 +400,27 @@ class TuitionClassDeleteView(DeleteView):
 # -----------------------
 # Subject views
 # -----------------------
-class SubjectListView(ListView):
+@query_budget(4)
+class SubjectListView(ConditionalPageMixin, ListView):
     model = Subject
+    conditional_models = (Subject,)
     template_name = 'academic_core/subject_list.html'
     context_object_name = 'subjects'
     queryset = Subject.objects.all().order_by('subject_id')
 
 
+@query_budget({'get': 4})
 @staff_or_admin_required_cbv
-class SubjectCreateView(CreateView):
+class SubjectCreateView(SequenceIdMixin, CreateView):
     model = Subject
     form_class = SubjectForm
     template_name = 'academic_core/subject_form.html'
     success_url = reverse_lazy('academic_core:subject_list')
-
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        last = Subject.objects.order_by('-id').first()
-        ctx['last_subject_id'] = last.subject_id if last else None
-        return ctx
+    sequence_name = 'subject'
+    sequence_field = 'subject_id'
 
 
+@query_budget({'get': 3})
 @staff_or_admin_required_cbv
 class SubjectUpdateView(UpdateView):
     model = Subject
@@ -271,12 +428,6 @@ class SubjectUpdateView(UpdateView):
     template_name = 'academic_core/subject_form.html'
     success_url = reverse_lazy('academic_core:subject_list')
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        last = Subject.objects.order_by('-id').first()
-        ctx['last_subject_id'] = last.subject_id if last else None
-        return ctx
-
 
 @admin_required_cbv
 class SubjectDeleteView(DeleteView):
@@ -299,7 +450,11 @@ class SubjectDeleteView(DeleteView):
                 return redirect('academic_core:subject_delete', pk=self.object.pk)
 
             with transaction.atomic():
-                count = SubjectAssignment.objects.filter(subject=self.object).update(subject=target)
+                count = SubjectAssignment.objects.filter(subject=self.object).update(
+                    subject=target, updated_at=timezone.now())
+                # update() skips post_save: refresh ETags and cached lists here
+                bump(SubjectAssignment)
+                caching.invalidate(SubjectAssignment)
                 self.object.delete()
             messages.success(request, f"Reassigned {count} assignments to '{target}' and deleted subject.")
             return redirect(self.success_url)
@@ -326,19 +481,42 @@ class SubjectDeleteView(DeleteView):
 # -----------------------
 # SubjectAssignment (list / create / update / delete)
 # -----------------------
-class SubjectAssignmentListView(ListView):
+@query_budget(6)
+class SubjectAssignmentListView(ConditionalPageMixin, SortFilterListMixin, ListView):
     model = SubjectAssignment
+    conditional_models = (SubjectAssignment, Subject, Teacher)
     template_name = 'academic_core/subjectassign_list.html'
     context_object_name = 'assignments'
     queryset = SubjectAssignment.objects.select_related('subject', 'teacher').order_by('-start_date')
+    search_fields = ('assign_id', 'subject__name', 'teacher__first_name', 'teacher__last_name')
+    sort_fields = {
+        'assign_id': ('assign_id',),
+        'subject': ('subject__subject_id',),
+        'teacher': ('teacher__last_name', 'teacher__first_name'),
+        'start': ('start_date',),
+    }
+    default_sort = '-start'
+    filter_fields = {'subject': 'subject', 'teacher': 'teacher'}
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # hint shown above the table; independent of the page / sort being viewed
+        ctx['latest_assign_id'] = (
+            SubjectAssignment.objects.order_by('-start_date', '-pk')
+            .values_list('assign_id', flat=True).first()
+        )
+        return ctx
 
+
+@query_budget({'get': 6})
 @staff_or_admin_required_cbv
-class SubjectAssignmentCreateView(CreateView):
+class SubjectAssignmentCreateView(SequenceIdMixin, CreateView):
     model = SubjectAssignment
     form_class = SubjectAssignmentForm
     template_name = 'academic_core/subjectassign_form.html'
     success_url = reverse_lazy('academic_core:subjectassign_list')
+    sequence_name = 'assignment'
+    sequence_field = 'assign_id'
 
     def get_initial(self):
         initial = super().get_initial()
@@ -346,27 +524,8 @@ class SubjectAssignmentCreateView(CreateView):
         subject_pk = self.request.GET.get('subject')
         if subject_pk:
             initial['subject'] = subject_pk
-
-        # prefilling assign id with "next" from last record if the field is empty
-        last = SubjectAssignment.objects.order_by('-id').first()
-        if last and not initial.get('assign_id'):
-            prev = last.assign_id or ''
-            m = re.search(r'(\d+)$', prev)
-            if m:
-                num = m.group(1)
-                nxt = str(int(num) + 1).zfill(len(num))
-                base = prev[:m.start(1)]
-                initial['assign_id'] = base + nxt
-            else:
-                initial['assign_id'] = prev + '-1'
         return initial
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        last = SubjectAssignment.objects.order_by('-id').first()
-        ctx['last_assign_id'] = last.assign_id if last else None
-        return ctx
-
     def form_valid(self, form):
         """
         Enforce uniqueness of (subject, teacher) at the form level as well as catching DB IntegrityError.
@@ -379,6 +538,7 @@ class SubjectAssignmentCreateView(CreateView):
             return self.form_invalid(form)
 
 
+@query_budget({'get': 5})
 @staff_or_admin_required_cbv
 class SubjectAssignmentUpdateView(UpdateView):
     model = SubjectAssignment
@@ -386,12 +546,6 @@ class SubjectAssignmentUpdateView(UpdateView):
     template_name = 'academic_core/subjectassign_form.html'
     success_url = reverse_lazy('academic_core:subjectassign_list')
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        last = SubjectAssignment.objects.order_by('-id').first()
-        ctx['last_assign_id'] = last.assign_id if last else None
-        return ctx
-
     def form_valid(self, form):
         try:
             return super().form_valid(form)
@@ -419,8 +573,10 @@ class SubjectAssignmentDeleteView(DeleteView):
 
 
 # Subject detail view to expose assignments for the subject
-class SubjectDetailView(DetailView):
+@query_budget(5)
+class SubjectDetailView(ConditionalPageMixin, DetailView):
     model = Subject
+    conditional_models = (Subject, SubjectAssignment, Teacher)
     template_name = 'academic_core/subject_detail.html'
     context_object_name = 'subject'
 
@@ -433,19 +589,38 @@ class SubjectDetailView(DetailView):
 # -----------------------
 # Student (create / detail / update / delete)
 # -----------------------
-class StudentListView(ListView):
+@query_budget(6)
+class StudentListView(ConditionalPageMixin, SortFilterListMixin, ListView):
     model = Student
+    conditional_models = (Student, TuitionClass)
     template_name = 'academic_core/student_list.html'
     context_object_name = 'students'
     queryset = Student.objects.select_related('current_class').order_by('reg_no')
+    search_fields = ('reg_no', 'first_name', 'last_name', 'phone')
+    sort_fields = {
+        'reg_no': ('reg_no',),
+        'name': ('last_name', 'first_name'),
+        'class': ('current_class__class_id',),
+        'joined': ('joined_date',),
+    }
+    default_sort = 'reg_no'
+    filter_fields = {'class': 'current_class', 'is_active': 'is_active'}
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['class_choices'] = TuitionClass.objects.order_by('class_id').values_list('pk', 'class_id', 'name')
+        return ctx
 
 
+@query_budget({'get': 5})
 @staff_or_admin_required_cbv
-class StudentCreateView(CreateView):
+class StudentCreateView(SequenceIdMixin, CreateView):
     model = Student
     form_class = StudentForm
     template_name = 'academic_core/student_form.html'
     success_url = reverse_lazy('academic_core:student_list')
+    sequence_name = 'student'
+    sequence_field = 'reg_no'
 
     def get_guardian_formset_class(self):
         return inlineformset_factory(
@@ -458,8 +633,6 @@ class StudentCreateView(CreateView):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        last_student = Student.objects.order_by('-id').first()
-        ctx['last_reg_no'] = last_student.reg_no if last_student else None
 
         GuardianFormSet = self.get_guardian_formset_class()
         if self.request.method == 'POST':
@@ -483,7 +656,9 @@ class StudentCreateView(CreateView):
             return self.form_invalid(form)
 
         with transaction.atomic():
-            student = form.save()
+            # the reg_no is reserved before the first INSERT, never saved blank
+            self.assign_sequence_id(form)
+            student = self.object = form.save()
             formset.instance = student
             formset.save()
 
@@ -499,7 +674,7 @@ class StudentCreateView(CreateView):
                 keep = primaries.earliest('id')
                 student.guardians.exclude(pk=keep.pk).update(is_primary=False)
 
-        return super().form_valid(form)
+        return redirect(self.get_success_url())
 
     def form_invalid(self, form):
         context = self.get_context_data(form=form)
@@ -509,12 +684,23 @@ class StudentCreateView(CreateView):
         return render(self.request, self.template_name, context)
 
 
-class StudentDetailView(DetailView):
+@query_budget(6)
+class StudentDetailView(ConditionalPageMixin, DetailView):
     model = Student
+    queryset = Student.objects.select_related('current_class__class_teacher')
+    conditional_models = (Student, TuitionClass, Teacher, Guardian, Enrollment)
     template_name = 'academic_core/student_detail.html'
     context_object_name = 'student'
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['guardians'] = self.object.guardians.all()
+        # one join instead of a tuition_class query per enrollment row
+        ctx['enrollments'] = self.object.enrollments.select_related('tuition_class')
+        return ctx
+
 
+@query_budget({'get': 5})
 @staff_or_admin_required_cbv
 class StudentUpdateView(UpdateView):
     model = Student
@@ -533,8 +719,6 @@ class StudentUpdateView(UpdateView):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        last_student = Student.objects.order_by('-id').first()
-        ctx['last_reg_no'] = last_student.reg_no if last_student else None
 
         GuardianFormSet = self.get_guardian_formset_class()
         if self.request.method == 'POST':
@@ -577,22 +761,21 @@ class StudentUpdateView(UpdateView):
         """
         When either the Student form or the guardian formset is invalid we:
         - bind the guardian formset so errors are preserved,
-        - log the errors to the server console (helps debugging),
+        - log the errors (DEBUG on academic_core.templates_views),
         - render the template with both form and guardian_formset included.
         """
         GuardianFormSet = self.get_guardian_formset_class()
         # bind posted formset to display errors
         formset = GuardianFormSet(self.request.POST, instance=self.object, prefix='guardians')
 
-        # Server-side debug (check runserver console)
-        # Remove or replace prints with logging in production
-        print("=== Student form errors ===")
-        print(form.errors.as_json() if hasattr(form.errors, 'as_json') else form.errors)
-        print("=== Guardian formset non-form errors ===")
-        print(formset.non_form_errors())
-        print("=== Guardian formset per-form errors ===")
-        for i, gf in enumerate(formset.forms):
-            print(f"Form #{i} errors:", gf.errors)
+        logger.debug(
+            "student %s update rejected", self.object.reg_no,
+            extra={
+                'form_errors': form.errors.get_json_data(),
+                'guardian_errors': [gf.errors.get_json_data() for gf in formset.forms],
+                'guardian_non_form_errors': list(formset.non_form_errors()),
+            },
+        )
 
         # Add a warning message so the user sees an alert
         messages.error(self.request, "Please fix the errors and try again.")
@@ -622,9 +805,36 @@ class StudentDeleteView(DeleteView):
 # -----------------------
 # Enrollment (admin only)
 # -----------------------
+@query_budget({'get': 3})
 @admin_required_cbv
 class EnrollmentCreateView(CreateView):
     model = Enrollment
     form_class = EnrollmentForm
     template_name = 'academic_core/enrollment_form.html'
     success_url = reverse_lazy('academic_core:enrollment_create')
+
+
+# -----------------------
+# Exports (staff / admin)
+# -----------------------
+@staff_or_admin_required
+def export_data(request, name):
+    """
+    Stream students / guardians / enrollments / classes as CSV or XLSX.
+    ?format=csv|xlsx  ?columns=reg_no,first_name  ?class=<class_id>  ?active=1
+    """
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in exports.FORMATS:
+        return HttpResponseBadRequest("format must be 'csv' or 'xlsx'.")
+    columns = [c for c in request.GET.get('columns', '').split(',') if c]
+    filters = {p: request.GET.get(p) for p in ('class', 'active') if p in request.GET}
+    try:
+        header, rows = exports.export_rows(name, columns=columns, filters=filters)
+    except exports.ExportError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    content_type, encoder = exports.FORMATS[fmt]
+    response = StreamingHttpResponse(encoder(header, rows), content_type=content_type)
+    filename = f"{name}-{timezone.localdate():%Y%m%d}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
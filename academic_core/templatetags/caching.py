@@ -0,0 +1,17 @@
+# academic_core/templatetags/caching.py
+"""
+{% load cache caching %}
+{% cache_version 'academic_core.TuitionClass' 'academic_core.Teacher' as v %}
+{% cache 600 class_table v %}...{% endcache %}
+"""
+from django import template
+
+from academic_core import caching
+
+register = template.Library()
+
+
+@register.simple_tag
+def cache_version(*models):
+    """Current generation of `models` ('app_label.Model'), for {% cache %} vary-on arguments."""
+    return '.'.join(str(v) for _, v in sorted(caching.versions(*models).items()))
@@ -0,0 +1,21 @@
+# academic_core/templatetags/images.py
+"""
+{% load images %}
+<img src="{{ student.profile_photo|thumbnail:'medium' }}"
+     srcset="{{ student.profile_photo|srcset }}" sizes="(min-width: 768px) 25vw, 100vw">
+"""
+from django import template
+
+from academic_core import images
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail(fieldfile, size='small'):
+    return images.derivative_url(fieldfile, size)
+
+
+@register.filter(name='srcset')
+def srcset_filter(fieldfile):
+    return images.srcset(fieldfile)
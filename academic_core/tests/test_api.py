@@ -0,0 +1,89 @@
+# academic_core/tests/test_api.py
+from django.test import TestCase
+from academic_core.models import TuitionClass, Student
+
+
+class ApiPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cls = TuitionClass.objects.create(class_id='C1', name='Maths')
+        for i in range(5):
+            Student.objects.create(reg_no=f'S{i:03d}', first_name='Stu', last_name=str(i), current_class=cls.cls)
+
+    def test_students_use_cursor_pagination_in_reg_no_order(self):
+        resp = self.client.get('/api/v1/students/', {'page_size': 2})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual([r['reg_no'] for r in data['results']], ['S000', 'S001'])
+        self.assertIn('cursor=', data['next'])
+        self.assertNotIn('count', data)
+
+        data = self.client.get(data['next']).json()
+        self.assertEqual([r['reg_no'] for r in data['results']], ['S002', 'S003'])
+
+    def test_page_param_opts_into_offset_pagination(self):
+        data = self.client.get('/api/v1/students/', {'page': 2, 'page_size': 2}).json()
+        self.assertEqual(data['count'], 5)
+        self.assertEqual([r['reg_no'] for r in data['results']], ['S002', 'S003'])
+
+    def test_page_size_is_capped(self):
+        with self.settings(API_MAX_PAGE_SIZE=3):
+            data = self.client.get('/api/v1/students/', {'page_size': 100}).json()
+        self.assertEqual(len(data['results']), 3)
+
+
+class SparseFieldsetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from academic_core.models import Teacher, Guardian, Enrollment
+        teacher = Teacher.objects.create(first_name='T', last_name='One')
+        cls.cls = TuitionClass.objects.create(class_id='C1', name='Maths', class_teacher=teacher)
+        for i in range(3):
+            s = Student.objects.create(reg_no=f'S{i:03d}', first_name='Stu', last_name=str(i), current_class=cls.cls)
+            Guardian.objects.create(student=s, name=f'G{i}', relationship='mother', is_primary=True)
+            Enrollment.objects.create(student=s, tuition_class=cls.cls)
+
+    def get(self, url, **params):
+        return self.client.get(url, params).json()['results']
+
+    def test_default_output_is_unchanged_and_nplus1_free(self):
+        with self.assertNumQueries(3):  # table versions, enrollments joined to student/class/teacher, guardians
+            rows = self.get('/api/v1/enrollments/')
+        self.assertEqual(rows[0]['student']['current_class']['class_teacher']['last_name'], 'One')
+        self.assertEqual(rows[0]['student']['guardians'][0]['name'], 'G0')
+
+    def test_fields_and_omit(self):
+        with self.assertNumQueries(2):  # table versions + students
+            rows = self.get('/api/v1/students/', fields='id,reg_no,first_name,last_name')
+        self.assertEqual(set(rows[0]), {'id', 'reg_no', 'first_name', 'last_name'})
+
+        rows = self.get('/api/v1/enrollments/', fields='id,student.reg_no,tuition_class.class_id')
+        self.assertEqual(rows[0]['student'], {'reg_no': 'S000'})
+        self.assertEqual(rows[0]['tuition_class'], {'class_id': 'C1'})
+
+        rows = self.get('/api/v1/students/', omit='guardians,current_class.class_teacher')
+        self.assertNotIn('guardians', rows[0])
+        self.assertNotIn('class_teacher', rows[0]['current_class'])
+        self.assertIn('name', rows[0]['current_class'])
+
+    def test_expand_collapses_unlisted_relations_to_ids(self):
+        with self.assertNumQueries(2):  # table versions + enrollments
+            rows = self.get('/api/v1/enrollments/', expand='')
+        self.assertEqual(rows[0]['student'], Student.objects.get(reg_no='S000').pk)
+        self.assertEqual(rows[0]['tuition_class'], self.cls.pk)
+
+        rows = self.get('/api/v1/enrollments/', expand='student')
+        self.assertIsInstance(rows[0]['tuition_class'], int)
+        self.assertEqual(rows[0]['student']['current_class'], self.cls.pk)
+        self.assertIsInstance(rows[0]['student']['guardians'][0], int)
+
+    def test_writes_ignore_fields(self):
+        from django.contrib.auth import get_user_model
+        staff = get_user_model().objects.create_user('staff', password='x', role=get_user_model().ROLE_STAFF)
+        self.client.force_login(staff)
+        student = Student.objects.get(reg_no='S001')
+        resp = self.client.patch(f'/api/v1/students/{student.pk}/?fields=id', {'first_name': 'Renamed'},
+                                 content_type='application/json')
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual(Student.objects.get(pk=student.pk).first_name, 'Renamed')
+        self.assertEqual(resp.json()['first_name'], 'Renamed')
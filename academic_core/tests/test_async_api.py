@@ -0,0 +1,126 @@
+# academic_core/tests/test_async_api.py
+import io
+import json
+import os
+import tempfile
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from academic_core import loadtest
+from academic_core.models import Enrollment, Guardian, Student, Teacher, TuitionClass
+
+
+def school(students=5):
+    teacher = Teacher.objects.create(first_name='Kamal', last_name='Silva')
+    c1 = TuitionClass.objects.create(class_id='C1', name='Maths', class_teacher=teacher, capacity=10)
+    c2 = TuitionClass.objects.create(class_id='C2', name='Art', active=False)
+    for i in range(students):
+        s = Student.objects.create(reg_no=f'S{i:03d}', first_name=f'Nimal{i}', last_name='Perera',
+                                   current_class=c1 if i < 3 else c2, is_active=i != 4)
+        if i % 2:
+            Guardian.objects.create(student=s, name=f'Guardian {i}', relationship='mother', is_primary=True)
+        Enrollment.objects.create(student=s, tuition_class=c1 if i % 2 else c2, start_date=date(2026, 1, i + 1))
+    return c1, c2
+
+
+class AsyncReadApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.c1, cls.c2 = school()
+        cls.student = Student.objects.get(reg_no='S001')
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_items_match_the_sync_api(self):
+        response = await self.async_client.get(f'/api/async/students/{self.student.pk}/')
+        self.assertEqual(response.status_code, 200)
+        sync = await self.async_client.get(f'/api/v1/students/{self.student.pk}/')
+        self.assertEqual(response.content, sync.content)
+
+        data = (await self.async_client.get('/api/async/enrollments/', {'expand': 'student'})).json()
+        sync = (await self.async_client.get('/api/v1/enrollments/', {'expand': 'student'})).json()
+        self.assertEqual(data['results'], sorted(sync['results'], key=lambda row: row['id']))
+
+    async def test_keyset_pages_and_count(self):
+        url = '/api/async/students/?page_size=2&count=1'
+        seen = []
+        while url:
+            data = (await self.async_client.get(url)).json()
+            self.assertEqual(data['count'], 5)
+            seen += [row['reg_no'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(seen, [f'S{i:03d}' for i in range(5)])
+
+    async def test_filters_and_bad_params(self):
+        data = (await self.async_client.get('/api/async/students/', {'class': self.c1.pk, 'is_active': 'true'})).json()
+        self.assertEqual([row['reg_no'] for row in data['results']], ['S000', 'S001', 'S002'])
+        data = (await self.async_client.get('/api/async/classes/', {'active': 'no'})).json()
+        self.assertEqual([row['class_id'] for row in data['results']], ['C2'])
+
+        for params in ({'class': 'x'}, {'is_active': 'maybe'}, {'page_size': '0'}, {'after': '-1'}):
+            with self.subTest(params=params):
+                response = await self.async_client.get('/api/async/students/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('detail', response.json())
+
+        response = await self.async_client.get('/api/async/classes/999999/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'detail': 'No TuitionClass matches the given query.'})
+
+    async def test_not_modified(self):
+        first = await self.async_client.get('/api/async/classes/')
+        self.assertTrue(first.has_header('ETag'))
+        again = await self.async_client.get('/api/async/classes/', headers={'if-none-match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
+
+        await sync_to_async(self.rename_class)()
+        changed = await self.async_client.get('/api/async/classes/', headers={'if-none-match': first['ETag']})
+        self.assertEqual(changed.status_code, 200)
+
+    def rename_class(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c1.name = 'Pure Maths'
+            self.c1.save()
+
+    async def test_dashboard_stats_match_the_sync_endpoint(self):
+        data = (await self.async_client.get('/api/async/dashboard/stats/')).json()
+        cache.clear()
+        sync = (await self.async_client.get('/dashboard/stats/')).json()
+        data.pop('generated_at', None)
+        sync.pop('generated_at', None)
+        self.assertEqual(data, sync)
+        self.assertEqual(data['students']['total'], 5)
+
+
+class LoadTestApiTest(TransactionTestCase):
+    # the load test serves requests from other threads, which must see committed rows
+    def setUp(self):
+        cache.clear()
+        school()
+
+    def test_asgi_and_wsgi_modes(self):
+        paths = ['/api/async/students/?page_size=2']
+        asgi = loadtest.run_asgi(paths, requests=12, concurrency=6)
+        self.assertEqual((asgi['requests'], asgi['errors']), (12, 0))
+        self.assertGreater(asgi['peak_in_flight'], 1)
+
+        wsgi = loadtest.run_wsgi(['/api/v1/students/?page_size=2'], requests=12, concurrency=6, threads=2)
+        self.assertEqual((wsgi['requests'], wsgi['errors']), (12, 0))
+        self.assertLessEqual(wsgi['peak_in_flight'], 2)
+
+    def test_command_writes_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'load.json')
+            out = io.StringIO()
+            call_command('load_test_api', '--requests', '6', '--concurrency', '3', '--threads', '2',
+                         '--db-latency', '1', '--json', path, stdout=out)
+            with open(path) as fh:
+                result = json.load(fh)
+        self.assertEqual([r['mode'] for r in result['results']], ['asgi', 'wsgi'])
+        self.assertEqual(sum(r['errors'] for r in result['results']), 0)
+        self.assertIn('in flight', out.getvalue())
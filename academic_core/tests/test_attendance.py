@@ -0,0 +1,79 @@
+# academic_core/tests/test_attendance.py
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from academic_core.models import TuitionClass, Student, Enrollment, ClassSession, Attendance
+from academic_core.outbox import process_batch
+from core.notifications import attendance_recorded, attendance_alert
+
+User = get_user_model()
+
+
+class CardMarkTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.marker = User.objects.create_user('marker', password='x', role=User.ROLE_STAFF)
+        cls.cls = TuitionClass.objects.create(class_id='C1', name='Maths')
+        cls.students = [
+            Student.objects.create(reg_no=f'S{i:03d}', first_name='Stu', last_name=str(i))
+            for i in range(4)
+        ]
+        for s in cls.students[:3]:
+            Enrollment.objects.create(student=s, tuition_class=cls.cls)
+        cls.session = ClassSession.objects.create(tuition_class=cls.cls)
+
+    def setUp(self):
+        self.client.force_login(self.marker)
+        self.events = []
+        handler = lambda sender, **kw: self.events.append(kw)  # noqa: E731
+        attendance_recorded.connect(handler, weak=False, dispatch_uid='test-recorded')
+        attendance_alert.connect(handler, weak=False, dispatch_uid='test-alert')
+        self.addCleanup(attendance_recorded.disconnect, dispatch_uid='test-recorded')
+        self.addCleanup(attendance_alert.disconnect, dispatch_uid='test-alert')
+
+    def mark(self, scans):
+        return self.client.post(
+            f'/api/v1/sessions/{self.session.pk}/mark/', {'scans': scans}, content_type='application/json'
+        )
+
+    def test_batch_is_upserted_and_signalled_once(self):
+        scans = [{'reg_no': 'S000'}, {'reg_no': 'S001', 'status': 'late'}, {'reg_no': 'S000'},
+                 {'reg_no': 'S003'}, {'reg_no': 'NOPE'}]
+        resp = self.mark(scans)
+        process_batch(workers=1)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['recorded'], 2)
+        self.assertEqual(
+            {r['reg_no']: r['error'] for r in resp.json()['rejected']},
+            {'S003': 'not enrolled in this class', 'NOPE': 'unknown student'},
+        )
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(sorted(self.events[0]['student_ids']), [self.students[0].pk, self.students[1].pk])
+
+        # re-scanning updates in place
+        self.mark([{'reg_no': 'S001', 'status': 'present'}])
+        self.assertEqual(Attendance.objects.filter(session=self.session).count(), 2)
+        self.assertEqual(Attendance.objects.get(student=self.students[1]).status, 'present')
+
+    def test_close_marks_absentees_in_one_batch(self):
+        self.mark([{'reg_no': 'S000'}])
+        resp = self.client.post(f'/api/v1/sessions/{self.session.pk}/close/')
+        process_batch(workers=1)
+        self.assertEqual(resp.json()['absent'], 2)
+        self.assertEqual(self.events[-1]['status'], 'absent')
+        self.assertEqual(self.mark([{'reg_no': 'S002'}]).status_code, 409)
+
+    def test_anonymous_cannot_mark(self):
+        self.client.logout()
+        self.assertEqual(self.mark([{'reg_no': 'S000'}]).status_code, 403)
+
+    def test_bad_filters_are_400(self):
+        for url in ('/api/v1/sessions/?date=abc', '/api/v1/sessions/?tuition_class=abc',
+                    '/api/v1/attendance/?session=abc', '/api/v1/attendance/?student=abc'):
+            with self.subTest(url=url):
+                resp = self.client.get(url)
+                self.assertEqual(resp.status_code, 400)
+                self.assertEqual(list(resp.json()), [url.split('?')[1].split('=')[0]])
+        day = ClassSession.objects.get(pk=self.session.pk).date
+        resp = self.client.get(f'/api/v1/sessions/?date={day}&tuition_class={self.cls.pk}')
+        self.assertEqual([row['id'] for row in resp.json()['results']], [self.session.pk])
@@ -0,0 +1,95 @@
+# academic_core/tests/test_billing.py
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from academic_core.billing import generate_invoices
+from academic_core.models import (TuitionClass, Student, Enrollment, ClassSession, Attendance,
+                                  Invoice, InvoiceLine)
+
+
+class BillingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.monthly = TuitionClass.objects.create(class_id='M1', name='Maths', fee_type='monthly',
+                                                  monthly_fee=Decimal('2500.00'))
+        cls.per_session = TuitionClass.objects.create(class_id='P1', name='Physics', fee_type='per_session',
+                                                      per_session_fee=Decimal('400.00'))
+        cls.term = TuitionClass.objects.create(class_id='T1', name='Art', fee_type='term',
+                                               monthly_fee=Decimal('6000.00'))
+        cls.amy = Student.objects.create(reg_no='S001', first_name='Amy', last_name='A')
+        cls.ben = Student.objects.create(reg_no='S002', first_name='Ben', last_name='B')
+        start = date(2026, 1, 1)
+        Enrollment.objects.create(student=cls.amy, tuition_class=cls.monthly, start_date=start)
+        Enrollment.objects.create(student=cls.amy, tuition_class=cls.per_session, start_date=start)
+        Enrollment.objects.create(student=cls.ben, tuition_class=cls.monthly, start_date=start,
+                                  fee_override=Decimal('2000.00'))
+        Enrollment.objects.create(student=cls.ben, tuition_class=cls.term, start_date=start)
+        for day in (5, 12, 19):
+            session = ClassSession.objects.create(tuition_class=cls.per_session, date=date(2026, 5, day))
+            Attendance.objects.create(session=session, student=cls.amy, status='absent' if day == 19 else 'present')
+
+    def test_month_charges(self):
+        summary = generate_invoices(date(2026, 5, 1))
+        self.assertEqual(summary['invoices'], 2)
+        self.assertEqual(summary['lines'], 4)
+        totals = dict(Invoice.objects.values_list('student__reg_no', 'total'))
+        # Amy: 2500 monthly + 2 attended x 400; Ben: 2000 override + 6000 term (May starts a term)
+        self.assertEqual(totals, {'S001': Decimal('3300.00'), 'S002': Decimal('8000.00')})
+
+    def test_rerun_is_idempotent_and_keeps_paid_invoices(self):
+        generate_invoices(date(2026, 5, 1))
+        Invoice.objects.filter(student=self.ben).update(status='paid', total=Decimal('1.00'))
+        summary = generate_invoices(date(2026, 5, 1))
+        self.assertEqual(summary['skipped_locked'], 1)
+        self.assertEqual(Invoice.objects.count(), 2)
+        self.assertEqual(InvoiceLine.objects.filter(invoice__student=self.amy).count(), 2)
+        self.assertEqual(Invoice.objects.get(student=self.ben).total, Decimal('1.00'))
+
+    def test_command_dry_run_writes_nothing(self):
+        out = StringIO()
+        call_command('generate_invoices', '--period', '2026-06', '--dry-run', stdout=out)
+        self.assertIn('invoices=2', out.getvalue())
+        self.assertFalse(Invoice.objects.exists())
+
+    def test_rerun_of_a_past_month_ignores_later_closures(self):
+        generate_invoices(date(2026, 5, 1))
+        before = dict(Invoice.objects.values_list('student__reg_no', 'total'))
+        # June: Amy's maths enrollment is closed and Ben leaves
+        Enrollment.objects.filter(student=self.amy, tuition_class=self.monthly).update(
+            active=False, end_date=date(2026, 6, 15))
+        ben = Student.objects.get(pk=self.ben.pk)
+        ben.is_active = False
+        with mock.patch.object(timezone, 'localdate', return_value=date(2026, 6, 20)):
+            ben.save()
+
+        generate_invoices(date(2026, 5, 1))
+        self.assertEqual(dict(Invoice.objects.values_list('student__reg_no', 'total')), before)
+        self.assertEqual(InvoiceLine.objects.filter(invoice__student=self.amy).count(), 2)
+        summary = generate_invoices(date(2026, 7, 1))
+        # Amy's monthly fee stops after June; per_session has no attendance in July
+        # and Ben's enrollments were closed when he was deactivated
+        self.assertFalse(Invoice.objects.filter(student=self.amy, period=date(2026, 7, 1)).exists())
+        self.assertEqual(summary['invoices'], 0)
+
+    def test_deactivating_a_student_closes_open_enrollments(self):
+        Enrollment.objects.create(student=self.ben, tuition_class=self.per_session, start_date=date(2026, 1, 1),
+                                  active=False, end_date=date(2026, 3, 31))
+        ben = Student.objects.get(pk=self.ben.pk)
+        ben.is_active = False
+        with mock.patch.object(timezone, 'localdate', return_value=date(2026, 6, 20)):
+            ben.save()
+        self.assertEqual(
+            sorted(Enrollment.objects.filter(student=ben).values_list('active', 'end_date')),
+            [(False, date(2026, 3, 31)), (False, date(2026, 6, 20)), (False, date(2026, 6, 20))],
+        )
+        # Ben is still billed for June, not for July
+        generate_invoices(date(2026, 6, 1))
+        generate_invoices(date(2026, 7, 1))
+        self.assertEqual(list(Invoice.objects.filter(student=ben).values_list('period', flat=True)),
+                         [date(2026, 6, 1)])
@@ -0,0 +1,136 @@
+# academic_core/tests/test_bulk.py
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from academic_core import feed
+from academic_core.models import Enrollment, Guardian, SearchEntry, Student, TuitionClass
+from academic_core.search import search
+
+User = get_user_model()
+
+
+class BulkApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('staff', password='x', role=User.ROLE_STAFF)
+        cls.c1 = TuitionClass.objects.create(class_id='C1', name='Maths')
+        cls.c2 = TuitionClass.objects.create(class_id='C2', name='Art')
+        cls.students = [Student.objects.create(reg_no=f'S{i:03d}', first_name=f'Nimal{i}', last_name='Perera')
+                        for i in range(20)]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post(self, url, items, method='post', **params):
+        query = '?' + '&'.join(f'{k}={v}' for k, v in params.items()) if params else ''
+        return getattr(self.client, method)(url + query, items, content_type='application/json')
+
+    def enrollment_items(self, n, start=date(2026, 1, 5)):
+        return [{'student': s.pk, 'tuition_class': self.c1.pk, 'start_date': start.isoformat()}
+                for s in self.students[:n]]
+
+    def test_create_is_a_fixed_number_of_queries(self):
+        self.post('/api/v1/enrollments/bulk/', self.enrollment_items(2))  # warm the session / version rows
+        Enrollment.objects.all().delete()
+        for n in (3, 20):
+            with self.subTest(items=n), self.captureOnCommitCallbacks(execute=True):
+                with self.assertNumQueries(8):
+                    # session, user, students, classes, unique check, savepoint, insert, release
+                    # (table versions are bumped on commit)
+                    response = self.post('/api/v1/enrollments/bulk/', self.enrollment_items(n))
+                self.assertEqual(response.status_code, 201, response.content)
+                results = response.json()['results']
+                self.assertEqual(len(results), n)
+                self.assertEqual(results[0]['student'], self.students[0].pk)
+                self.assertEqual(Enrollment.objects.get(pk=results[-1]['id']).student_id, self.students[n - 1].pk)
+            Enrollment.objects.all().delete()
+
+    def test_invalid_items_write_nothing_and_are_reported_by_index(self):
+        Enrollment.objects.create(student=self.students[0], tuition_class=self.c1, start_date=date(2026, 1, 5))
+        items = self.enrollment_items(3) + [
+            {'student': 999999, 'tuition_class': self.c1.pk},
+            {'student': self.students[5].pk, 'tuition_class': self.c2.pk, 'active': 'sometimes'},
+            {'tuition_class': self.c2.pk},
+            {'student': self.students[1].pk, 'tuition_class': self.c1.pk, 'start_date': '2026-01-05'},
+        ]
+        response = self.post('/api/v1/enrollments/bulk/', items)
+        self.assertEqual(response.status_code, 400)
+        errors = {e['index']: e['errors'] for e in response.json()['errors']}
+        self.assertEqual(sorted(errors), [0, 3, 4, 5, 6])
+        self.assertIn('must make a unique set', errors[0]['non_field_errors'][0])  # already in the table
+        self.assertEqual(errors[3], {'student': ['Invalid pk "999999" - object does not exist.']})
+        self.assertIn('active', errors[4])
+        self.assertIn('student', errors[5])
+        self.assertIn('non_field_errors', errors[6])  # repeats item 1
+        self.assertEqual(Enrollment.objects.count(), 1)
+
+        response = self.post('/api/v1/enrollments/bulk/', items, skip_invalid=1)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['results']), 2)
+        self.assertEqual(len(response.json()['errors']), 5)
+        self.assertEqual(Enrollment.objects.count(), 3)
+
+    def test_update(self):
+        enrollments = [Enrollment.objects.create(student=s, tuition_class=self.c1, start_date=date(2026, 1, 5))
+                       for s in self.students[:3]]
+        before = enrollments[0].updated_at
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post('/api/v1/enrollments/bulk/', [
+                {'id': enrollments[0].pk, 'active': False},
+                {'id': enrollments[1].pk, 'tuition_class': self.c2.pk, 'fee_override': '250.00'},
+            ], method='patch')
+        self.assertEqual(response.status_code, 200, response.content)
+        enrollments = [Enrollment.objects.get(pk=e.pk) for e in enrollments]
+        self.assertFalse(enrollments[0].active)
+        self.assertGreater(enrollments[0].updated_at, before)
+        self.assertEqual(enrollments[1].tuition_class_id, self.c2.pk)
+        self.assertEqual(str(enrollments[1].fee_override), '250.00')
+        self.assertTrue(enrollments[2].active)
+        self.assertEqual(feed.broker.buffer[-1].type, 'enrollment.updated')
+
+        response = self.post('/api/v1/enrollments/bulk/', [
+            {'id': enrollments[2].pk, 'tuition_class': self.c2.pk},
+            {'id': 999999, 'active': True},
+            {'active': True},
+            {'id': enrollments[2].pk, 'active': False},
+        ], method='patch')
+        self.assertEqual(response.status_code, 400)
+        errors = {e['index']: e['errors'] for e in response.json()['errors']}
+        self.assertEqual(errors, {1: {'id': ['Not found.']}, 2: {'id': ['This field is required.']},
+                                  3: {'id': ['Given more than once.']}})
+        self.assertEqual(Enrollment.objects.get(pk=enrollments[2].pk).tuition_class_id, self.c1.pk)
+
+    def test_guardians_are_searchable_and_deleted_in_bulk(self):
+        items = [{'student': s.pk, 'name': f'Kumari Bulk{i}', 'relationship': 'mother', 'is_primary': True}
+                 for i, s in enumerate(self.students[:5])]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post('/api/v1/guardians/bulk/', items)
+        self.assertEqual(response.status_code, 201, response.content)
+        ids = [row['id'] for row in response.json()['results']]
+        self.assertEqual(SearchEntry.objects.filter(kind='guardian', object_id__in=ids).count(), 5)
+        self.assertIn(ids[3], [h.object_id for h in search('Kumari', kind='guardian')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post('/api/v1/guardians/bulk/', ids[:4] + [999999], method='delete')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], [{'index': 4, 'errors': {'id': ['Not found.']}}])
+        self.assertEqual(Guardian.objects.count(), 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post('/api/v1/guardians/bulk/', ids[:4], method='delete')
+        self.assertEqual(response.json(), {'deleted': 4})
+        self.assertEqual(list(Guardian.objects.values_list('pk', flat=True)), ids[4:])
+        self.assertFalse(SearchEntry.objects.filter(kind='guardian', object_id__in=ids[:4]).exists())
+
+    def test_batch_shape_and_permissions(self):
+        for body in ({'student': 1}, []):
+            with self.subTest(body=body):
+                self.assertEqual(self.post('/api/v1/enrollments/bulk/', body).status_code, 400)
+        with self.settings(API_BULK_MAX_ITEMS=2):
+            response = self.post('/api/v1/enrollments/bulk/', self.enrollment_items(3))
+        self.assertEqual(response.json(), {'detail': 'At most 2 items per request.'})
+
+        self.client.logout()
+        self.assertEqual(self.post('/api/v1/enrollments/bulk/', self.enrollment_items(1)).status_code, 403)
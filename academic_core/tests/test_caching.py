@@ -0,0 +1,94 @@
+# academic_core/tests/test_caching.py
+import tempfile
+
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from academic_core import caching
+from academic_core.models import Teacher, TuitionClass
+
+
+@caching.cached_queryset(TuitionClass)
+def active_classes(prefix=''):
+    return TuitionClass.objects.filter(active=True, class_id__startswith=prefix).values_list('class_id', flat=True)
+
+
+class CachingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Teacher.objects.create(first_name='Kamal', last_name='Silva')
+        TuitionClass.objects.create(class_id='C1', name='Maths')
+        TuitionClass.objects.create(class_id='D1', name='Dance')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_versioned_key_changes_on_commit(self):
+        key = caching.versioned_key('thing', TuitionClass, Teacher)
+        self.assertEqual(caching.versioned_key('thing', Teacher, TuitionClass), key)
+        with self.captureOnCommitCallbacks() as callbacks:
+            caching.invalidate(TuitionClass)
+        self.assertEqual(caching.versioned_key('thing', TuitionClass, Teacher), key)  # not committed yet
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(caching.versioned_key('thing', TuitionClass, Teacher), key)
+
+    def test_lost_generation_does_not_revive_old_entries(self):
+        before = caching.versions(TuitionClass)['academic_core.tuitionclass']
+        cache.delete(caching._version_key('academic_core.tuitionclass'))
+        self.assertGreater(caching.versions(TuitionClass)['academic_core.tuitionclass'], before)
+
+    def test_cached_queryset_and_signal_invalidation(self):
+        self.assertEqual(active_classes(), ['C1', 'D1'])
+        with self.assertNumQueries(0):
+            self.assertEqual(active_classes(), ['C1', 'D1'])
+        self.assertEqual(active_classes(prefix='C'), ['C1'])  # arguments are part of the key
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TuitionClass.objects.create(class_id='C2', name='Physics')
+        with self.assertNumQueries(1):
+            self.assertEqual(active_classes(), ['C1', 'C2', 'D1'])
+
+        # unrelated models leave the entry alone
+        with self.captureOnCommitCallbacks(execute=True):
+            Teacher.objects.create(first_name='Nimal', last_name='Perera')
+        with self.assertNumQueries(0):
+            active_classes()
+
+    def test_cached_fragment(self):
+        calls = []
+
+        @caching.cached_fragment(Teacher, name='teacher-names')
+        def names():
+            calls.append(1)
+            return ', '.join(Teacher.objects.values_list('first_name', flat=True))
+
+        self.assertEqual(names(), 'Kamal')
+        self.assertEqual(names(), 'Kamal')
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(names.cache_key().startswith('academic_core:teacher-names:'))
+
+    def test_template_tag_varies_the_cache_tag(self):
+        template = Template(
+            "{% load cache caching %}{% cache_version 'academic_core.Teacher' as v %}"
+            "{% cache 60 names v %}{{ teachers|length }}{% endcache %}"
+        )
+        self.assertEqual(template.render(Context({'teachers': [1]})), '1')
+        self.assertEqual(template.render(Context({'teachers': [1, 2]})), '1')
+        with self.captureOnCommitCallbacks(execute=True):
+            caching.invalidate(Teacher)
+        self.assertEqual(template.render(Context({'teachers': [1, 2]})), '2')
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                   'LOCATION': location}}
+            with override_settings(CACHES=backend):
+                self.assertEqual(active_classes(), ['C1', 'D1'])
+                with self.assertNumQueries(0):
+                    self.assertEqual(active_classes(), ['C1', 'D1'])
+                with self.captureOnCommitCallbacks(execute=True):
+                    caching.invalidate(TuitionClass)
+                with self.assertNumQueries(1):
+                    active_classes()
@@ -0,0 +1,75 @@
+# academic_core/tests/test_choices.py
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from academic_core.forms import EnrollmentForm, StudentForm, SubjectAssignmentForm
+from academic_core.models import Teacher, TuitionClass, Subject, Student
+
+User = get_user_model()
+
+
+class PlainStudentForm(forms.ModelForm):
+    class Meta:
+        model = Student
+        fields = ['current_class']
+        widgets = {'current_class': forms.Select(attrs={'class': 'form-control'})}
+
+
+class CachedChoicesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('boss', password='x', role=User.ROLE_ADMIN)
+        cls.teacher = Teacher.objects.create(first_name='Kamal', last_name='Silva')
+        cls.c1 = TuitionClass.objects.create(class_id='C1', name='Maths')
+        TuitionClass.objects.create(class_id='C2', name='Science')
+        Subject.objects.create(subject_id='SU1', name='Algebra')
+        cls.student = Student.objects.create(reg_no='S001', first_name='Amal', last_name='Perera',
+                                             current_class=cls.c1)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_options_match_model_choice_field_and_are_cached(self):
+        instance = Student(current_class=self.c1)
+        expected = str(PlainStudentForm(instance=instance)['current_class'])
+        self.assertEqual(str(StudentForm(instance=instance)['current_class']), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(StudentForm(instance=instance)['current_class']), expected)
+
+    def test_writes_refresh_the_options(self):
+        str(StudentForm()['current_class'])
+        with self.captureOnCommitCallbacks(execute=True):
+            TuitionClass.objects.create(class_id='C3', name='Physics')
+        self.assertIn('C3 - Physics', str(StudentForm()['current_class']))
+
+    def test_validation_still_uses_the_queryset(self):
+        form = SubjectAssignmentForm(data={'assign_id': 'A1', 'subject': Subject.objects.get().pk,
+                                           'teacher': self.teacher.pk, 'start_date': '2026-01-05'})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['teacher'], self.teacher)
+
+        form = SubjectAssignmentForm(data={'assign_id': 'A1', 'subject': 999, 'teacher': self.teacher.pk,
+                                           'start_date': '2026-01-05'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('subject', form.errors)
+
+    def test_enrollment_form_does_not_list_students(self):
+        form = EnrollmentForm(initial={'student': self.student.pk})
+        with self.assertNumQueries(2):  # selected student's label, class choices (cold cache)
+            html = str(form['student']) + str(form['tuition_class'])
+        self.assertIn('value="S001 - Amal Perera"', html)
+        self.assertIn('data-autocomplete-url="/api/v1/search/"', html)
+        self.assertNotIn('<option value="%s"' % self.student.pk, str(form['student']))
+
+        form = EnrollmentForm(data={'student': self.student.pk, 'tuition_class': self.c1.pk,
+                                    'start_date': '2026-01-05', 'active': 'on'})
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_enrollment_page_loads_autocomplete_script(self):
+        self.client.force_login(self.admin)
+        resp = self.client.get(reverse('academic_core:enrollment_create'))
+        self.assertContains(resp, 'js/autocomplete.js')
+        self.assertContains(resp, 'data-autocomplete-input')
@@ -0,0 +1,109 @@
+# academic_core/tests/test_conditional.py
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from academic_core.models import Teacher, TuitionClass, Student, Subject, SubjectAssignment, TableVersion
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('boss', password='x', role=User.ROLE_ADMIN)
+        cls.teacher = Teacher.objects.create(first_name='Kamal', last_name='Silva')
+        cls.cls = TuitionClass.objects.create(class_id='C1', name='Maths', class_teacher=cls.teacher)
+        Subject.objects.create(subject_id='SU1', name='Algebra')
+        Student.objects.create(reg_no='S001', first_name='A', last_name='B', current_class=cls.cls)
+
+    def revalidate(self, url, resp, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=resp['ETag'])
+
+    def test_api_list_returns_304_without_running_the_query(self):
+        url = '/api/v1/classes/'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', first)
+        self.assertIn('no-cache', first['Cache-Control'])
+
+        with self.assertNumQueries(1):  # the TableVersion lookup only
+            second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        # Last-Modified works too
+        resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_writes_to_any_rendered_table_change_the_etag(self):
+        url = '/api/v1/classes/'
+        first = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Subject.objects.create(subject_id='SU2', name='Geometry')  # not part of the class payload
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Teacher.objects.filter(pk=self.teacher.pk).update(last_name='Perera')
+            self.teacher.save()  # nested class_teacher
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+
+        # ... unless the client no longer asks for the nested teacher
+        narrow = self.client.get(url, {'expand': ''})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teacher.save()
+        self.assertEqual(self.revalidate(url, narrow, expand='').status_code, 304)
+
+    def test_versions_are_bumped_on_commit(self):
+        self.client.get('/api/v1/students/')
+        before = TableVersion.objects.get(table='academic_core.student').version
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.create(reg_no='S002', first_name='C', last_name='D')
+        self.assertEqual(TableVersion.objects.get(table='academic_core.student').version, before + 1)
+
+    def test_pages_and_details(self):
+        self.client.force_login(self.admin)
+        for url in ('/students/', f'/students/{Student.objects.get().pk}/', '/classes/', '/teachers/'):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertEqual(self.revalidate(url, first).status_code, 304)
+
+        # the ETag is per user (pages show who is logged in)
+        first = self.client.get('/students/')
+        self.client.logout()
+        self.assertEqual(self.revalidate('/students/', first).status_code, 200)
+
+    def test_page_etag_follows_the_csrf_secret(self):
+        self.client.force_login(self.admin)
+        first = self.client.get('/students/')
+        self.assertEqual(self.revalidate('/students/', first).status_code, 304)
+        # logging in again rotates the secret: the cached forms' tokens no longer validate
+        self.client.cookies['csrftoken'] = 'a' * 32
+        second = self.revalidate('/students/', first)
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.revalidate('/students/', second).status_code, 304)
+
+    def test_reassign_deletes_change_the_etag(self):
+        self.client.force_login(self.admin)
+        other_teacher = Teacher.objects.create(first_name='Nimal', last_name='Perera')
+        other_class = TuitionClass.objects.create(class_id='C2', name='Science')
+        algebra = Subject.objects.get()
+        geometry = Subject.objects.create(subject_id='SU2', name='Geometry')
+        SubjectAssignment.objects.create(subject=algebra, teacher=self.teacher)
+        cases = [
+            ('/api/v1/students/', reverse('academic_core:class_delete', args=[self.cls.pk]),
+             {'reassign_to': other_class.pk}),
+            ('/api/v1/subject-assignments/', reverse('academic_core:subject_delete', args=[algebra.pk]),
+             {'reassign_to': geometry.pk}),
+            ('/api/v1/classes/', reverse('academic_core:teacher_delete', args=[self.teacher.pk]),
+             {'reassign_classes_to': other_teacher.pk, 'reassign_assignments_to': other_teacher.pk}),
+        ]
+        for url, delete_url, data in cases:
+            with self.subTest(delete_url=delete_url):
+                first = self.client.get(url, {'expand': ''})
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.assertEqual(self.client.post(delete_url, data).status_code, 302)
+                self.assertEqual(self.revalidate(url, first, expand='').status_code, 200)
@@ -0,0 +1,78 @@
+# academic_core/tests/test_dashboard.py
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from academic_core import dashboard
+from academic_core.models import Teacher, TuitionClass, Student, Enrollment
+from academic_core.promotion import promote
+
+
+class DashboardStatsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        Teacher.objects.create(first_name='Kamal', last_name='Silva')
+        Teacher.objects.create(first_name='Nimal', last_name='Perera', is_active=False)
+        cls.c1 = TuitionClass.objects.create(class_id='C1', name='Maths', capacity=4)
+        cls.c2 = TuitionClass.objects.create(class_id='C2', name='Science', capacity=0)
+        cls.c3 = TuitionClass.objects.create(class_id='C3', name='Old', capacity=10, active=False)
+        for i in range(5):
+            s = Student.objects.create(reg_no=f'S{i}', first_name='A', last_name='B',
+                                       current_class=cls.c1 if i < 3 else cls.c2, is_active=i != 2)
+            Enrollment.objects.create(student=s, tuition_class=cls.c1,
+                                      start_date=today if i < 2 else date(2000, 1, 1))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_figures(self):
+        data = dashboard.compute()
+        self.assertEqual(data['students'], {'total': 5, 'active': 4, 'inactive': 1})
+        self.assertEqual(data['teachers'], {'total': 2, 'active': 1, 'inactive': 1})
+        self.assertEqual(data['classes'], {'total': 3, 'active': 2, 'inactive': 1})
+        self.assertEqual(data['enrollments_this_month'], 2)
+        per_class = {c['class_id']: (c['students'], c['utilisation']) for c in data['per_class']}
+        self.assertEqual(per_class, {'C1': (2, 50.0), 'C2': (2, None), 'C3': (0, 0.0)})
+        # only active classes count towards seats
+        self.assertEqual(data['capacity'], {'seats': 4, 'filled': 4, 'utilisation': 100.0})
+
+    def test_index_renders_from_cache(self):
+        url = reverse('academic_core:index')
+        resp = self.client.get(url)
+        self.assertEqual(resp.context['total_students'], 5)
+        with self.assertNumQueries(0):
+            resp = self.client.get(url)
+        self.assertEqual(resp.context['stats']['enrollments_this_month'], 2)
+        self.assertContains(resp, 'studentsPerClassChart')
+
+    def test_signals_invalidate(self):
+        self.assertEqual(dashboard.stats()['students']['total'], 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.create(reg_no='S9', first_name='N', last_name='E', current_class=self.c1)
+        self.assertEqual(dashboard.stats()['students']['total'], 6)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c3.delete()
+        self.assertEqual(dashboard.stats()['classes']['total'], 2)
+
+    def test_bulk_writers_invalidate(self):
+        self.assertEqual(dashboard.stats()['per_class'][0]['students'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            promote({'C1': None}, on_date=timezone.localdate())
+        data = dashboard.stats()
+        self.assertEqual(data['per_class'][0]['students'], 0)
+        self.assertEqual(data['students']['active'], 2)
+
+    def test_json_endpoint_has_chart_data(self):
+        resp = self.client.get(reverse('academic_core:dashboard_stats'))
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual(body['students']['total'], 5)
+        bars = body['charts']['students_per_class']
+        self.assertEqual(bars['labels'], ['C1', 'C2'])
+        self.assertEqual([d['data'] for d in bars['datasets']], [[2, 2], [4, 0]])
+        self.assertEqual(body['charts']['student_status']['datasets'][0]['data'], [4, 1])
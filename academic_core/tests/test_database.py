@@ -0,0 +1,63 @@
+# academic_core/tests/test_database.py
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TransactionTestCase, SimpleTestCase
+
+from core.database import database_config, postgres_config, sqlite_config
+
+
+class DatabaseConfigTest(SimpleTestCase):
+    def test_sqlite_profile(self):
+        config = sqlite_config(Path('/srv'), {'DJANGO_SQLITE_BUSY_TIMEOUT': '5', 'DJANGO_SQLITE_MMAP_MB': '0'})
+        self.assertEqual(config['NAME'], Path('/srv/db.sqlite3'))
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(config['OPTIONS']['timeout'], 5)
+        init = config['OPTIONS']['init_command']
+        for pragma in ('journal_mode=WAL', 'synchronous=NORMAL', 'busy_timeout=5000', 'mmap_size=0'):
+            self.assertIn(pragma, init)
+
+        self.assertEqual(sqlite_config(Path('/srv'), {'DJANGO_SQLITE_PATH': '/tmp/x.db'})['NAME'], '/tmp/x.db')
+
+    def test_postgres_profile(self):
+        config = postgres_config({'DJANGO_DB_NAME': 'sms', 'DJANGO_DB_HOST': 'db'})
+        self.assertEqual((config['NAME'], config['HOST']), ('sms', 'db'))
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', config['OPTIONS'])
+
+        pooled = postgres_config({'DJANGO_DB_POOL': '1', 'DJANGO_DB_POOL_MAX': '20'})
+        self.assertEqual(pooled['CONN_MAX_AGE'], 0)
+        self.assertEqual(pooled['OPTIONS']['pool']['max_size'], 20)
+
+    def test_engine_selection(self):
+        self.assertEqual(database_config(Path('/srv'), {})['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(database_config(Path('/srv'), {'DJANGO_DB_ENGINE': 'postgres'})['ENGINE'],
+                         'django.db.backends.postgresql')
+        with self.assertRaises(ValueError):
+            database_config(Path('/srv'), {'DJANGO_DB_ENGINE': 'oracle'})
+
+
+class CheckDatabaseCommandTest(TransactionTestCase):
+    def test_bench_writes_json_and_compares(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run.json')
+            out = io.StringIO()
+            call_command('check_database', '--bench', '--threads', '1', '--seconds', '0.2',
+                         '--json', path, stdout=out)
+            self.assertIn('journal_mode', out.getvalue())
+            self.assertIn('ops/s', out.getvalue())
+            with open(path) as fh:
+                result = json.load(fh)
+            self.assertGreater(result['ops'], 0)
+            self.assertEqual(result['errors'], 0)
+
+            out = io.StringIO()
+            call_command('check_database', '--bench', '--threads', '1', '--seconds', '0.2',
+                         '--compare', path, stdout=out)
+            self.assertIn('ratio', out.getvalue())
+            self.assertIn('writes_per_sec', out.getvalue())
@@ -0,0 +1,74 @@
+# academic_core/tests/test_exports.py
+import csv
+import io
+import os
+import tempfile
+import zipfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from academic_core.models import TuitionClass, Student, Guardian, Enrollment
+
+User = get_user_model()
+
+
+class ExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='x', role=User.ROLE_STAFF)
+        c1 = TuitionClass.objects.create(class_id='C1', name='Maths')
+        c2 = TuitionClass.objects.create(class_id='C2', name='Science')
+        for i in range(5):
+            s = Student.objects.create(
+                reg_no=f'S{i:03d}', first_name='Stu', last_name=f'N{i} & <co>',
+                current_class=c1 if i < 3 else c2, is_active=i != 0,
+            )
+            Guardian.objects.create(student=s, name=f'Parent {i}', is_primary=True)
+            Enrollment.objects.create(student=s, tuition_class=c1)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def get(self, name, **params):
+        resp = self.client.get(reverse('academic_core:export_data', args=[name]), params)
+        return resp, b''.join(resp.streaming_content) if resp.streaming else resp.content
+
+    def test_csv_with_columns_and_filters(self):
+        resp, body = self.get('students', columns='reg_no,last_name', **{'class': 'C1', 'active': '1'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('attachment; filename="students-', resp['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+        self.assertEqual(rows, [['reg_no', 'last_name'], ['S001', 'N1 & <co>'], ['S002', 'N2 & <co>']])
+
+    def test_xlsx_is_a_readable_workbook(self):
+        resp, body = self.get('guardians', format='xlsx', columns='reg_no,name')
+        with zipfile.ZipFile(io.BytesIO(body)) as zf:
+            self.assertIsNone(zf.testzip())
+            sheet = zf.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(sheet.count('<row>'), 6)
+        self.assertIn('Parent 4', sheet)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.get('students', columns='password')[0].status_code, 400)
+        self.assertEqual(self.get('nope')[0].status_code, 400)
+        self.assertEqual(self.get('students', format='pdf')[0].status_code, 400)
+        self.client.logout()
+        self.assertNotEqual(self.get('students')[0].status_code, 200)
+
+    def test_export_data_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'enrollments.csv')
+            call_command('export_data', 'enrollments', '--columns', 'reg_no,class_id', '-o', path, stderr=io.StringIO())
+            with open(path, encoding='utf-8-sig', newline='') as fh:
+                rows = list(csv.reader(fh))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1], ['S000', 'C1'])
+
+    def test_export_data_command_to_stdout(self):
+        out = io.StringIO()
+        call_command('export_data', 'enrollments', '--columns', 'reg_no,class_id', stdout=out)
+        self.assertTrue(out.getvalue().startswith('\ufeffreg_no,class_id\r\n'))
+        self.assertEqual(len(list(csv.reader(io.StringIO(out.getvalue().lstrip('\ufeff'))))), 6)
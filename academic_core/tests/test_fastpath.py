@@ -0,0 +1,120 @@
+# academic_core/tests/test_fastpath.py
+"""Parity: the compiled list path must return exactly what the serializers return."""
+import io
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from academic_core import fastpath, images
+from academic_core.models import (
+    Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment,
+    ClassSession, Attendance,
+)
+from academic_core.views import (
+    TeacherViewSet, TuitionClassViewSet, SubjectViewSet, SubjectAssignmentViewSet, StudentViewSet,
+    GuardianViewSet, EnrollmentViewSet, ClassSessionViewSet, AttendanceViewSet,
+)
+
+User = get_user_model()
+MEDIA = tempfile.mkdtemp()
+
+ENDPOINTS = ['teachers', 'classes', 'subjects', 'subject-assignments', 'students', 'guardians',
+             'enrollments', 'sessions', 'attendance']
+
+PARAMS = [
+    {},
+    {'page': 1, 'page_size': 3},
+    {'page_size': 2},
+    {'fields': 'id,reg_no,first_name,last_name'},
+    {'fields': 'id,student.reg_no,student.guardians,tuition_class.class_id'},
+    {'omit': 'guardians,current_class.class_teacher'},
+    {'expand': ''},
+    {'expand': 'student,current_class'},
+    {'ordering': '-start_date'},
+    {'search': 'a'},
+]
+
+
+def photo():
+    buf = io.BytesIO()
+    Image.new('RGB', (400, 300), 'teal').save(buf, 'JPEG')
+    return SimpleUploadedFile('p.jpg', buf.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA, IMAGE_DERIVATIVE_FORMAT='jpeg')
+class FastListParityTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='x', role=User.ROLE_STAFF)
+        t1 = Teacher.objects.create(title='Mr', first_name='Kamal', last_name='Silva', email='k@x.lk')
+        Teacher.objects.create(first_name='Nadee', last_name='Perera')
+        c1 = TuitionClass.objects.create(class_id='C1', name='Maths', class_teacher=t1,
+                                         per_session_fee=Decimal('500.5'), fee_type='per_session')
+        c2 = TuitionClass.objects.create(class_id='C2', name='Art', monthly_fee=Decimal('3000'), fee_type='monthly')
+        subj = Subject.objects.create(subject_id='SU1', name='Algebra')
+        SubjectAssignment.objects.create(assign_id='A1', subject=subj, teacher=t1, start_date=date(2026, 1, 5))
+        for i in range(5):
+            s = Student.objects.create(
+                reg_no=f'S{i:03d}', first_name=f'Nimal{i}', last_name='Perera', gender='male' if i % 2 else None,
+                current_class=c1 if i < 3 else None, dob=date(2010, 1, i + 1), email=f's{i}@x.lk' if i else None,
+                is_active=i != 4,
+            )
+            for j in range(i % 3):
+                Guardian.objects.create(student=s, name=f'Guardian {i}{j}', relationship='mother', is_primary=j == 0)
+            Enrollment.objects.create(student=s, tuition_class=c1 if i % 2 else c2, start_date=date(2026, 1, i + 1),
+                                      fee_override=Decimal('250.00') if i == 2 else None)
+        session = ClassSession.objects.create(tuition_class=c1, date=date(2026, 2, 1), topic='Limits')
+        for s in Student.objects.filter(current_class=c1):
+            Attendance.objects.create(session=session, student=s, status='present')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA, ignore_errors=True)
+
+    def setUp(self):
+        images._existing.cache_clear()
+        self.client.force_login(self.staff)
+        s = Student.objects.get(reg_no='S001')
+        s.profile_photo = photo()
+        s.save()
+
+    def test_every_list_endpoint_compiles(self):
+        for viewset in (TeacherViewSet, TuitionClassViewSet, SubjectViewSet, SubjectAssignmentViewSet,
+                        StudentViewSet, GuardianViewSet, EnrollmentViewSet, ClassSessionViewSet,
+                        AttendanceViewSet):
+            with self.subTest(viewset=viewset.__name__):
+                serializer = viewset.serializer_class(context={'request': None})
+                self.assertIsNotNone(fastpath.compile(serializer))
+
+    def test_output_is_byte_identical(self):
+        for endpoint in ENDPOINTS:
+            for params in PARAMS:
+                with self.subTest(endpoint=endpoint, params=params):
+                    url = f'/api/v1/{endpoint}/'
+                    fast = self.client.get(url, params)
+                    with self.settings(API_FAST_LIST=False):
+                        slow = self.client.get(url, params)
+                    self.assertEqual(fast.status_code, slow.status_code)
+                    self.assertEqual(fast.content, slow.content)
+
+    def test_cursor_pages_match(self):
+        url = '/api/v1/enrollments/'
+        fast_next = slow_next = url + '?page_size=2'
+        while fast_next:
+            fast = self.client.get(fast_next).json()
+            with self.settings(API_FAST_LIST=False):
+                slow = self.client.get(slow_next).json()
+            self.assertEqual(fast, slow)
+            fast_next, slow_next = fast['next'], slow['next']
+        self.assertIsNone(slow_next)
+
+    def test_enrollment_list_query_count(self):
+        with self.assertNumQueries(5):  # session, user, table versions, enrollments (joined), guardians
+            self.client.get('/api/v1/enrollments/')
@@ -0,0 +1,177 @@
+# academic_core/tests/test_feed.py
+import asyncio
+import contextlib
+import json
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+
+from academic_core import feed
+from academic_core.models import ClassSession, Enrollment, Student, Subject, SubjectAssignment, Teacher, TuitionClass
+from academic_core.outbox import enqueue
+
+
+def parse(frame):
+    fields = dict(line.split(': ', 1) for line in frame.decode().strip().split('\n'))
+    return fields.get('id'), fields['event'], json.loads(fields['data'])
+
+
+class Stream:
+    """Reads an /api/async/events/ response frame by frame."""
+
+    def __init__(self, response):
+        self.response = response
+        self.frames = aiter(response.streaming_content)
+
+    async def next(self, timeout=1):
+        return await asyncio.wait_for(anext(self.frames), timeout)
+
+    async def event(self):
+        frame = await self.next()
+        while frame.startswith((b':', b'retry:')):
+            frame = await self.next()
+        return parse(frame)
+
+    async def close(self):
+        # as the ASGI handler does when the client disconnects: cancel the pending read
+        pending = asyncio.ensure_future(self.next(timeout=None))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        pending.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await pending
+
+
+class LiveFeedTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.c1 = TuitionClass.objects.create(class_id='C1', name='Maths')
+        cls.c2 = TuitionClass.objects.create(class_id='C2', name='Art')
+        cls.student = Student.objects.create(reg_no='S001', first_name='Nimal', last_name='Perera',
+                                             current_class=cls.c1)
+
+    async def open(self, query='', **headers):
+        response = await self.async_client.get(f'/api/async/events/{query}', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = Stream(response)
+        self.assertEqual(await stream.next(), b'retry: 3000\n\n')
+        return stream
+
+    async def test_class_topics(self):
+        everything = await self.open()
+        maths = await self.open(f'?class={self.c1.pk}')
+        feed.broker.publish('enrollment.created', {'id': 1}, [self.c2.pk])
+        feed.broker.publish('enrollment.created', {'id': 2}, [self.c1.pk])
+        feed.broker.publish('assignment.created', {'id': 3}, [])
+
+        self.assertEqual([(await everything.event())[2]['id'] for _ in range(3)], [1, 2, 3])
+        event_id, event_type, data = await maths.event()
+        self.assertEqual((event_type, data), ('enrollment.created', {'id': 2}))
+        self.assertTrue(event_id.startswith(feed.EPOCH))
+        await everything.close()
+        await maths.close()
+        self.assertFalse(feed.broker.subscribers)
+
+    async def test_replay_after_last_event_id(self):
+        first = feed.broker.publish('student.updated', {'id': 1}, [self.c1.pk])
+        feed.broker.publish('student.updated', {'id': 2}, [self.c1.pk])
+        stream = await self.open(**{'last-event-id': f'{feed.EPOCH}-{first.seq}'})
+        self.assertEqual((await stream.event())[2], {'id': 2})
+        await stream.close()
+
+        # an id from another process (or gone from the buffer) means: refetch
+        stream = await self.open(**{'last-event-id': 'deadbeef-1'})
+        self.assertEqual((await stream.event())[1:], ('reset', {'reason': 'gap'}))
+        await stream.close()
+
+    @override_settings(FEED_QUEUE_SIZE=2, FEED_KEEPALIVE_SECONDS=0.05)
+    async def test_slow_reader_gets_reset_not_unbounded_queue(self):
+        stream = await self.open()
+        sub = next(iter(feed.broker.subscribers))
+        for i in range(5):
+            feed.broker.publish('student.updated', {'id': i})
+        await asyncio.sleep(0)  # let the loop deliver
+        self.assertEqual(sub.queue.qsize(), 1)
+        self.assertEqual((await stream.event())[1:], ('reset', {'reason': 'overflow'}))
+
+        feed.broker.publish('student.updated', {'id': 9})
+        self.assertEqual((await stream.event())[2], {'id': 9})
+        self.assertEqual(await stream.next(), b': keepalive\n\n')
+        await stream.close()
+
+    @override_settings(FEED_MAX_SUBSCRIBERS=1)
+    async def test_too_many_streams_and_bad_class(self):
+        stream = await self.open()
+        response = await self.async_client.get('/api/async/events/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
+        await stream.close()
+
+        response = await self.async_client.get('/api/async/events/?class=maths')
+        self.assertEqual(response.status_code, 400)
+
+    def test_wsgi_is_refused(self):
+        self.assertEqual(self.client.get('/api/async/events/').status_code, 501)
+
+    def test_model_signals_publish_on_commit(self):
+        seq = feed.broker.seq
+        teacher = Teacher.objects.create(first_name='Kamal', last_name='Silva')
+        subject = Subject.objects.create(subject_id='SU1', name='Algebra')
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment = Enrollment.objects.create(student=self.student, tuition_class=self.c2)
+            SubjectAssignment.objects.create(assign_id='A1', subject=subject, teacher=teacher)
+            self.student.is_active = False
+            self.student.save()
+            enrollment_pk = enrollment.pk
+            enrollment.delete()
+        self.assertEqual(feed.broker.seq, seq + 4)
+
+        events = [parse(e.frame)[1:] + (e.classes,) for e in list(feed.broker.buffer)[-4:]]
+        self.assertEqual(events[0][:2], ('enrollment.created', {
+            'id': enrollment_pk, 'student_id': self.student.pk, 'tuition_class_id': self.c2.pk, 'active': True}))
+        self.assertEqual(events[0][2], {self.c2.pk})
+        self.assertEqual([e[0] for e in events[1:]], ['assignment.created', 'student.updated', 'enrollment.deleted'])
+        self.assertEqual(events[1][2], frozenset())
+        self.assertEqual(events[2][1]['is_active'], False)
+        self.assertEqual(events[3][1]['id'], enrollment_pk)
+
+        # nothing is published for a rolled-back write
+        with self.captureOnCommitCallbacks(execute=False):
+            Enrollment.objects.create(student=self.student, tuition_class=self.c1)
+        self.assertEqual(feed.broker.seq, seq + 4)
+
+    def test_student_move_reaches_both_classes(self):
+        student = Student.objects.get(pk=self.student.pk)
+        student.current_class = self.c2
+        with self.captureOnCommitCallbacks(execute=True):
+            student.save()
+            student.save()  # no longer a move
+        moved, saved = list(feed.broker.buffer)[-2:]
+        self.assertEqual(moved.classes, {self.c1.pk, self.c2.pk})
+        self.assertEqual(parse(moved.frame)[2]['previous_class_id'], self.c1.pk)
+        self.assertEqual(saved.classes, {self.c2.pk})
+        self.assertNotIn('previous_class_id', parse(saved.frame)[2])
+
+    async def test_outbox_events_are_relayed(self):
+        session = await sync_to_async(self.session_with_attendance)()
+        stream = await self.open(f'?class={self.c1.pk}')
+        after = await feed.broker.poll_outbox(0)
+        self.assertGreater(after, 0)
+
+        kinds = {}
+        for _ in range(2):
+            _, event_type, data = await stream.event()
+            kinds[event_type] = data
+        self.assertEqual(kinds['session.created'], {'session_id': session.pk, 'class_id': self.c1.pk,
+                                                    'date': '2026-02-01'})
+        self.assertEqual(kinds['attendance.recorded'], {'session_id': session.pk, 'class_id': self.c1.pk,
+                                                        'student_ids': [self.student.pk]})
+        self.assertEqual(await feed.broker.poll_outbox(after), after)
+        await stream.close()
+
+    def session_with_attendance(self):
+        session = ClassSession.objects.create(tuition_class=self.c1, date=date(2026, 2, 1))
+        enqueue('attendance_recorded', session_id=session.pk, student_ids=[self.student.pk])
+        return session
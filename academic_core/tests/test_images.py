@@ -0,0 +1,82 @@
+# academic_core/tests/test_images.py
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from academic_core import images
+from academic_core.models import Student
+from academic_core.serializers import StudentSerializer
+
+MEDIA = tempfile.mkdtemp()
+
+
+def photo(size=(2000, 1000), fmt='JPEG'):
+    buf = io.BytesIO()
+    Image.new('RGB', size, 'orange').save(buf, fmt)
+    return SimpleUploadedFile('phone.jpg', buf.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA, IMAGE_DERIVATIVE_FORMAT='jpeg')
+class DerivativeTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA, ignore_errors=True)
+
+    def setUp(self):
+        images._existing.cache_clear()
+        self.student = Student.objects.create(reg_no='S001', first_name='A', last_name='B', profile_photo=photo())
+
+    def test_derivative_is_resized_and_cached_on_disk(self):
+        url = images.derivative_url(self.student.profile_photo, 'small')
+        self.assertRegex(url, r'^/media/derivatives/[0-9a-f]{2}/[0-9a-f]{40}\.jpg$')
+        with Image.open(MEDIA + url[len('/media'):]) as img:
+            self.assertEqual(img.size, (160, 80))
+        self.assertEqual(images.derivative_url(self.student.profile_photo, 'small'), url)
+
+        # a new upload gets a new name
+        self.student.profile_photo = photo((300, 600))
+        self.student.save()
+        self.assertNotEqual(images.derivative_url(self.student.profile_photo, 'small'), url)
+
+    def test_template_tags_and_serializer(self):
+        resp = self.client.get(f'/students/{self.student.pk}/')
+        self.assertContains(resp, ' 480w')
+        self.assertNotContains(resp, 'src="/media/students/')
+
+        data = StudentSerializer(Student.objects.get(pk=self.student.pk)).data
+        self.assertEqual(set(data['profile_photo_urls']), {'thumb', 'small', 'medium'})
+        Student.objects.filter(pk=self.student.pk).update(profile_photo='')
+        data = StudentSerializer(Student.objects.get(pk=self.student.pk)).data
+        self.assertIsNone(data['profile_photo_urls'])
+
+    def test_unreadable_original_falls_back(self):
+        self.student.profile_photo = SimpleUploadedFile('x.jpg', b'not an image')
+        with self.assertLogs('academic_core.images', 'WARNING'):
+            self.student.save()
+        with mock.patch.object(images, 'render') as render:
+            url = images.derivative_url(self.student.profile_photo, 'thumb')
+            self.assertEqual(images.srcset(self.student.profile_photo), '')
+        render.assert_not_called()
+        self.assertEqual(url, self.student.profile_photo.url)
+
+    def test_rendering_never_builds_and_the_command_backfills(self):
+        shutil.rmtree(os.path.join(MEDIA, images.DERIVATIVE_DIR))
+        images._existing.cache_clear()
+        with mock.patch.object(images, 'render') as render:
+            data = StudentSerializer(Student.objects.get(pk=self.student.pk)).data
+        render.assert_not_called()
+        self.assertEqual(set(data['profile_photo_urls'].values()), {self.student.profile_photo.url})
+
+        out = io.StringIO()
+        call_command('build_photo_derivatives', stdout=out)
+        self.assertIn('photos=1 files=3', out.getvalue())
+        data = StudentSerializer(Student.objects.get(pk=self.student.pk)).data
+        self.assertTrue(data['profile_photo_urls']['small'].startswith('/media/derivatives/'))
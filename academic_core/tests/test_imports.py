@@ -0,0 +1,94 @@
+# academic_core/tests/test_imports.py
+import io
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from academic_core.imports import import_students
+from academic_core.models import TuitionClass, Student, Guardian, SearchEntry
+
+User = get_user_model()
+
+HEADER = 'reg_no,first_name,last_name,class_id,dob,is_active,guardian_name,guardian_relationship,guardian_is_primary\n'
+
+
+class StudentImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cls = TuitionClass.objects.create(class_id='C1', name='Maths')
+        Student.objects.create(reg_no='S000', first_name='Old', last_name='One')
+
+    def test_valid_file_is_written_in_bulk(self):
+        body = HEADER + (
+            'S001,Nimal,Perera,C1,2010-05-01,,Kamala Perera,Mother,\n'
+            'S001,,,,,,Sunil Perera,father,yes\n'
+            'S002,Amal,Silva,,,0,Ruwan Silva,Father,\n'
+        )
+        with self.assertNumQueries(9):
+            result = import_students(io.StringIO(body))
+        self.assertTrue(result.written)
+        self.assertEqual((result.students, result.guardians, result.errors), (2, 3, []))
+
+        s1 = Student.objects.get(reg_no='S001')
+        self.assertEqual(s1.current_class, self.cls)
+        self.assertTrue(s1.is_active)
+        self.assertEqual(list(s1.guardians.filter(is_primary=True).values_list('name', flat=True)), ['Sunil Perera'])
+        s2 = Student.objects.get(reg_no='S002')
+        self.assertFalse(s2.is_active)
+        self.assertTrue(s2.guardians.get().is_primary)
+        self.assertTrue(SearchEntry.objects.filter(kind='student', object_id=s2.pk).exists())
+
+    def test_errors_are_reported_per_row_and_block_the_import(self):
+        body = HEADER + (
+            'S000,Dup,Licate,,,,G,mother,\n'
+            'S003,Bad,Class,C9,,,G,mother,\n'
+            'S004,Bad,Date,,31-31-2020,,G,aunt,\n'
+            'S005,No,Guardian,,,,,,\n'
+            'S006,Good,Row,,,,G,other,\n'
+        )
+        result = import_students(io.StringIO(body))
+        self.assertFalse(result.written)
+        self.assertEqual(
+            sorted((e.line, e.reg_no, e.field) for e in result.errors if e.line),
+            [(2, 'S000', 'reg_no'), (3, 'S003', 'class_id'), (4, 'S004', 'dob')],
+        )
+        self.assertIn(('S005', 'guardian_name'), [(e.reg_no, e.field) for e in result.errors])
+        self.assertFalse(Student.objects.filter(reg_no='S006').exists())
+
+        result = import_students(io.StringIO(body), skip_invalid=True)
+        self.assertEqual(result.students, 1)
+        self.assertTrue(Guardian.objects.filter(student__reg_no='S006').exists())
+
+    def test_command_and_admin_upload(self):
+        body = HEADER + 'S010,Cmd,Line,C1,,,G,mother,\n'
+        with self.assertRaises(CommandError):
+            call_command('import_students', '/nonexistent.csv')
+
+        admin = User.objects.create_superuser('root', password='x')
+        self.client.force_login(admin)
+        resp = self.client.post('/admin/academic_core/student/import/', {
+            'csv_file': SimpleUploadedFile('students.csv', body.encode('utf-8-sig')),
+        })
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(Student.objects.filter(reg_no='S010', current_class=self.cls).exists())
+
+    def test_file_that_is_not_utf8_is_a_file_error(self):
+        body = (HEADER + 'S011,Jos\u00e9,Silva,C1,,,G,mother,\n').encode('latin-1')
+        with tempfile.NamedTemporaryFile(suffix='.csv') as fh:
+            fh.write(body)
+            fh.flush()
+            with self.assertRaisesMessage(CommandError, 'Nothing imported: 1 error(s)'):
+                call_command('import_students', fh.name, stderr=io.StringIO())
+
+        admin = User.objects.create_superuser('root', password='x')
+        self.client.force_login(admin)
+        resp = self.client.post('/admin/academic_core/student/import/', {
+            'csv_file': SimpleUploadedFile('students.csv', body),
+        })
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, 'not UTF-8')
+        self.assertFalse(Student.objects.filter(reg_no='S011').exists())
@@ -0,0 +1,111 @@
+# academic_core/tests/test_indexes.py
+import re
+import unittest
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academic_core.models import (
+    Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment, ClassSession,
+)
+
+User = get_user_model()
+
+# "SCAN academic_core_student" with no index: a full table scan. Walking an
+# index ("SCAN ... USING INDEX") is how a paged, ordered list should read.
+FULL_SCAN = re.compile(r'\bSCAN (\w+)$')
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTest(TestCase):
+    """
+    Every SELECT the list / detail pages and API endpoints run is explained;
+    none may scan an application table without an index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('boss', password='x', role=User.ROLE_ADMIN)
+        cls.teacher = Teacher.objects.create(first_name='Kamal', last_name='Silva')
+        cls.cls = TuitionClass.objects.create(class_id='C1', name='Maths', class_teacher=cls.teacher)
+        cls.subject = Subject.objects.create(subject_id='SU1', name='Algebra')
+        SubjectAssignment.objects.create(assign_id='A1', subject=cls.subject, teacher=cls.teacher,
+                                         start_date=date(2026, 1, 5))
+        cls.student = Student.objects.create(reg_no='S001', first_name='Amal', last_name='Perera',
+                                             current_class=cls.cls)
+        Guardian.objects.create(student=cls.student, name='Kamala', relationship='mother', is_primary=True)
+        Enrollment.objects.create(student=cls.student, tuition_class=cls.cls, start_date=date(2026, 1, 5))
+        ClassSession.objects.create(tuition_class=cls.cls, date=date(2026, 1, 12))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def urls(self):
+        c, s = self.cls.pk, self.student.pk
+        return [
+            reverse('academic_core:class_list'),
+            reverse('academic_core:class_list') + f'?active=True&teacher={self.teacher.pk}',
+            reverse('academic_core:class_detail', args=[c]),
+            reverse('academic_core:teacher_list'),
+            reverse('academic_core:teacher_detail', args=[self.teacher.pk]),
+            reverse('academic_core:subject_list'),
+            reverse('academic_core:subject_detail', args=[self.subject.pk]),
+            reverse('academic_core:subjectassign_list'),
+            reverse('academic_core:student_list'),
+            reverse('academic_core:student_list') + f'?class={c}&is_active=True',
+            reverse('academic_core:student_list') + '?is_active=True',
+            reverse('academic_core:student_detail', args=[s]),
+            reverse('academic_core:student_update', args=[s]),
+            '/api/v1/teachers/',
+            '/api/v1/classes/',
+            '/api/v1/subject-assignments/',
+            '/api/v1/students/',
+            '/api/v1/guardians/',
+            '/api/v1/enrollments/',
+            f'/api/v1/sessions/?tuition_class={c}',
+            f'/api/v1/attendance/?student={s}',
+        ]
+
+    def test_no_full_table_scans(self):
+        scans = []
+        for url in self.urls():
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200, url)
+            for query in ctx.captured_queries:
+                sql = query['sql']
+                if not sql.startswith('SELECT') or 'academic_core_' not in sql:
+                    continue
+                for line in query_plan(sql):
+                    m = FULL_SCAN.search(line)
+                    if m and m.group(1).startswith('academic_core_'):
+                        scans.append(f'{url}: {line}\n    {sql}')
+        self.assertEqual(scans, [], '\n'.join(scans))
+
+    def test_hot_queries_use_their_index(self):
+        c = self.cls
+        cases = [
+            (Enrollment.objects.filter(tuition_class=c, active=True).order_by('start_date'),
+             'enrollment_active_class_idx'),
+            (Student.objects.filter(current_class=c, is_active=True).order_by('reg_no'), 'student_active_class_idx'),
+            (Student.objects.filter(is_active=True).order_by('reg_no'), 'student_active_reg_no_idx'),
+            (self.student.guardians.all(), 'guardian_student_primary_idx'),
+            (self.teacher.assignments.order_by('-start_date'), 'assignment_teacher_start_idx'),
+        ]
+        for qs, index in cases:
+            plan = query_plan(str(qs.query))
+            self.assertTrue(any(index in line for line in plan), f'{index} not used: {plan}')
+            # the index also yields the rows in order
+            self.assertFalse(any('TEMP B-TREE' in line for line in plan), plan)
@@ -0,0 +1,110 @@
+# academic_core/tests/test_metrics.py
+import json
+import logging
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from academic_core.metrics import registry
+from academic_core.models import Student, TuitionClass
+from core.logformat import JsonFormatter
+
+User = get_user_model()
+
+
+class RequestMetricsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('boss', password='x', role=User.ROLE_ADMIN)
+        c = TuitionClass.objects.create(class_id='C1', name='Maths')
+        for i in range(3):
+            Student.objects.create(reg_no=f'S{i}', first_name='A', last_name='B', current_class=c)
+
+    def setUp(self):
+        registry.reset()
+        self.client.force_login(self.admin)
+
+    def test_server_timing_and_registry(self):
+        resp = self.client.get(reverse('academic_core:student_list'))
+        timing = resp['Server-Timing']
+        self.assertRegex(timing, r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+$')
+
+        totals = registry.totals[('academic_core:student_list', 'GET')]
+        self.assertEqual(totals.count, 1)
+        self.assertGreater(totals.queries, 0)
+        self.assertEqual(totals.size, len(resp.content))
+
+    def test_streamed_response_size_is_recorded_when_the_stream_closes(self):
+        resp = self.client.get(reverse('academic_core:export_data', args=['students']))
+        self.assertTrue(resp.streaming)
+        key = ('academic_core:export_data', 'GET')
+        self.assertNotIn(key, registry.totals)
+        body = b''.join(resp.streaming_content)
+        self.assertEqual(registry.totals[key].count, 1)
+        self.assertEqual(registry.totals[key].size, len(body))
+        self.assertGreater(len(body), 0)
+
+    def test_serializer_time_is_recorded_for_both_list_paths(self):
+        self.client.get('/api/v1/students/')
+        self.client.get('/api/v1/students/', {'fields': 'id,reg_no'})
+        with self.settings(API_FAST_LIST=False):
+            self.client.get('/api/v1/classes/')
+        self.assertGreater(registry.totals[('academic_core:student-list', 'GET')].serialize, 0)
+        self.assertGreater(registry.totals[('academic_core:tuitionclass-list', 'GET')].serialize, 0)
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('academic_core:student_list'))
+        self.client.get('/no/such/page/')
+
+        resp = self.client.get(reverse('academic_core:metrics'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = resp.content.decode()
+        self.assertIn('# TYPE sms_request_duration_seconds histogram', body)
+        self.assertIn('sms_request_duration_seconds_bucket{view="academic_core:student_list",method="GET",le="+Inf"} 1',
+                      body)
+        self.assertIn('sms_request_recent_duration_seconds{view="academic_core:student_list",method="GET",'
+                      'quantile="0.99"}', body)
+        self.assertIn('view="<unresolved>"', body)
+
+        # the rolling summary forgets old requests, the histogram does not
+        with self.settings(METRICS_WINDOW_SECONDS=0):
+            body = self.client.get(reverse('academic_core:metrics')).content.decode()
+        self.assertNotIn('sms_request_recent_duration_seconds{', body)
+        self.assertIn('sms_request_duration_seconds_count{view="academic_core:student_list"', body)
+
+    def test_unknown_methods_share_one_series(self):
+        url = reverse('academic_core:student_list')
+        for method in ('BREW', 'PROPFIND', 'X' * 50):
+            self.client.generic(method, url)
+        self.client.get(url)
+        self.assertEqual(sorted(m for _, m in registry.totals), ['GET', 'other'])
+        self.assertEqual(registry.totals[('academic_core:student_list', 'other')].count, 3)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_metrics_access(self):
+        self.client.logout()
+        url = reverse('academic_core:metrics')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 302)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+        clerk = User.objects.create_user('clerk', password='x', role=User.ROLE_STAFF)
+        self.client.force_login(clerk)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_structured_request_log(self):
+        url = reverse('academic_core:student_list')
+        with self.assertLogs('academic_core.requests', 'INFO') as logs:
+            self.client.get(url)
+        record = logs.records[0]
+        self.assertEqual(record.levelno, logging.INFO)
+        line = json.loads(JsonFormatter().format(record))
+        self.assertEqual(line['view'], 'academic_core:student_list')
+        self.assertEqual(line['status'], 200)
+        self.assertGreater(line['queries'], 0)
+        self.assertIn('duration_ms', line)
+
+        with self.settings(METRICS_SLOW_REQUEST_MS=0), self.assertLogs('academic_core.requests', 'WARNING'):
+            self.client.get(url)
@@ -0,0 +1,79 @@
+# academic_core/tests/test_outbox.py
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from academic_core.models import Teacher, Subject, SubjectAssignment, OutboxMessage
+from academic_core import outbox
+from academic_core.outbox import claim_batch, enqueue, process_batch
+from academic_core.transports import LocalMemoryTransport
+from core.notifications import subject_assigned
+
+
+@override_settings(NOTIFICATION_TRANSPORT='academic_core.transports.LocalMemoryTransport')
+class OutboxTest(TestCase):
+    def setUp(self):
+        LocalMemoryTransport.reset()
+        self.teacher = Teacher.objects.create(first_name='Jane', last_name='Roe', whatsapp='+94770000000')
+        self.subject = Subject.objects.create(subject_id='SUB1', name='Chemistry')
+
+    def test_assignment_is_queued_not_delivered_in_request(self):
+        a = SubjectAssignment.objects.create(assign_id='A1', subject=self.subject, teacher=self.teacher)
+        self.assertEqual(LocalMemoryTransport.sent, [])
+        msg = OutboxMessage.objects.get()
+        self.assertEqual((msg.event, msg.status, msg.payload['assignment_id']), ('subject_assigned', 'pending', a.pk))
+
+        self.assertEqual(process_batch(workers=1), (1, 0, 0))
+        self.assertEqual(len(LocalMemoryTransport.sent), 1)
+        self.assertEqual(LocalMemoryTransport.sent[0]['to'], '+94770000000')
+        self.assertEqual(OutboxMessage.objects.get().status, 'sent')
+
+    def test_duplicate_dedupe_key_is_dropped(self):
+        enqueue('fee_due', dedupe_key='k1', invoice_ids=[1])
+        enqueue('fee_due', dedupe_key='k1', invoice_ids=[1])
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        with self.assertRaises(ValueError):
+            enqueue('no_such_signal')
+
+    @override_settings(NOTIFICATION_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_go_dead(self):
+        def broken(sender, **kwargs):
+            raise RuntimeError('provider down')
+        subject_assigned.connect(broken, dispatch_uid='test-broken')
+        self.addCleanup(subject_assigned.disconnect, dispatch_uid='test-broken')
+
+        enqueue('subject_assigned', teacher_id=0, subject_id=0, assignment_id=0)
+        with self.assertLogs('academic_core.outbox', 'WARNING'):
+            self.assertEqual(process_batch(workers=1), (0, 1, 0))
+        msg = OutboxMessage.objects.get()
+        self.assertEqual((msg.status, msg.attempts), ('pending', 1))
+        self.assertIn('provider down', msg.last_error)
+        self.assertGreater(msg.available_at, timezone.now())
+
+        # not due yet
+        self.assertEqual(process_batch(workers=1), (0, 0, 0))
+        OutboxMessage.objects.update(available_at=timezone.now())
+        with self.assertLogs('academic_core.outbox', 'WARNING'):
+            self.assertEqual(process_batch(workers=1), (0, 0, 1))
+        self.assertEqual(OutboxMessage.objects.get().status, 'dead')
+
+    def test_two_workers_reading_the_same_ids_claim_each_message_once(self):
+        for n in range(3):
+            enqueue('fee_due', invoice_ids=[n])
+        # both workers read the due ids before either claims them (no row locks on SQLite)
+        seen = outbox._due_ids(timezone.now(), 100)
+        with mock.patch.object(outbox, '_due_ids', return_value=seen):
+            first = claim_batch()
+            second = claim_batch()
+        self.assertEqual(len(first), 3)
+        self.assertEqual(second, [])
+        self.assertEqual(set(OutboxMessage.objects.values_list('claim_token', flat=True)), {first[0].claim_token})
+
+        # an expired lease can be taken over, once
+        OutboxMessage.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        seen = outbox._due_ids(timezone.now(), 100)
+        with mock.patch.object(outbox, '_due_ids', return_value=seen):
+            self.assertEqual(len(claim_batch()), 3)
+            self.assertEqual(claim_batch(), [])
@@ -0,0 +1,62 @@
+# academic_core/tests/test_promotion.py
+import io
+from datetime import date
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from academic_core.models import TuitionClass, Student, Enrollment
+from academic_core.promotion import promote, plan_order, PromotionError
+
+ON = date(2027, 1, 1)
+
+
+class PromotionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.g9, cls.g10, cls.g11 = [TuitionClass.objects.create(class_id=c, name=c) for c in ('G9', 'G10', 'G11')]
+        for i, cls_ in enumerate([cls.g9] * 3 + [cls.g10] * 2 + [cls.g11]):
+            s = Student.objects.create(reg_no=f'S{i:03d}', first_name='S', last_name=str(i), current_class=cls_)
+            Enrollment.objects.create(student=s, tuition_class=cls_, start_date=date(2026, 1, 1))
+        Student.objects.create(reg_no='S999', first_name='Left', last_name='Early', current_class=cls.g9, is_active=False)
+
+    def classes(self):
+        return dict(Student.objects.filter(is_active=True).values_list('reg_no', 'current_class__class_id'))
+
+    def test_chain_promotes_each_student_once(self):
+        mapping = {'G9': 'G10', 'G10': 'G11', 'G11': None}
+        self.assertEqual(plan_order(mapping), ['G11', 'G10', 'G9'])
+        # class lookup + per class: savepoint, ids, [already enrolled], close, [open], move, release
+        with self.assertNumQueries(1 + 7 + 7 + 5):
+            steps = promote(mapping, ON)
+        self.assertEqual([(s.source.class_id, len(s.students), s.closed, s.opened) for s in steps],
+                         [('G11', 1, 1, 0), ('G10', 2, 2, 2), ('G9', 3, 3, 3)])
+        self.assertEqual(self.classes(), {'S000': 'G10', 'S001': 'G10', 'S002': 'G10', 'S003': 'G11', 'S004': 'G11'})
+        self.assertFalse(Student.objects.get(reg_no='S005').is_active)
+        self.assertEqual(Enrollment.objects.filter(active=True, tuition_class=self.g10, start_date=ON).count(), 3)
+        self.assertEqual(Enrollment.objects.filter(active=False, end_date=ON).count(), 6)
+        self.assertEqual(Student.objects.get(reg_no='S999').current_class, self.g9)
+
+    def test_dry_run_writes_nothing(self):
+        before = self.classes()
+        out = io.StringIO()
+        call_command('promote_students', '--sequence', 'G9,G10,G11', '--dry-run', '--date', '2027-01-01', stdout=out)
+        self.assertIn('[dry-run] G10 -> G11: students=2 enrollments closed=2 opened=2', out.getvalue())
+        self.assertEqual(self.classes(), before)
+        self.assertFalse(Enrollment.objects.filter(start_date=ON).exists())
+
+    def test_bad_mappings(self):
+        with self.assertRaises(PromotionError):
+            plan_order({'G9': 'G10', 'G10': 'G9'})
+        with self.assertRaises(CommandError):
+            call_command('promote_students', '--map', 'G9:G99', stdout=io.StringIO())
+
+    def test_graduation_closes_every_enrollment(self):
+        s005 = Student.objects.get(reg_no='S005')
+        extra = Enrollment.objects.create(student=s005, tuition_class=self.g9, start_date=date(2026, 3, 1))
+        [step] = promote({'G11': None}, ON)
+        self.assertEqual((len(step.students), step.closed), (1, 2))
+        extra.refresh_from_db()
+        self.assertEqual((extra.active, extra.end_date), (False, ON))
+        self.assertFalse(Enrollment.objects.filter(student=s005, active=True).exists())
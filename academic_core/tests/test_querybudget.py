@@ -0,0 +1,112 @@
+# academic_core/tests/test_querybudget.py
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from academic_core import templates_views as tv
+from academic_core.models import (
+    Teacher, TuitionClass, Subject, SubjectAssignment, Student, Guardian, Enrollment, ClassSession,
+)
+from academic_core.querybudget import QueryBudgetExceeded, assert_query_budget, budget_for
+from academic_core.views import StudentViewSet
+
+User = get_user_model()
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', QUERY_BUDGET_REPEAT_LIMIT=3)
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('boss', password='x', role=User.ROLE_ADMIN)
+        cls.teacher = Teacher.objects.create(first_name='Kamal', last_name='Silva')
+        cls.classes = [TuitionClass.objects.create(class_id=f'C{i}', name='Maths', class_teacher=cls.teacher)
+                       for i in range(4)]
+        cls.subject = Subject.objects.create(subject_id='SU1', name='Algebra')
+        SubjectAssignment.objects.create(assign_id='A1', subject=cls.subject, teacher=cls.teacher)
+        for i in range(5):
+            s = Student.objects.create(reg_no=f'S{i:03d}', first_name='Stu', last_name=str(i),
+                                       current_class=cls.classes[0])
+            for j in range(3):
+                Guardian.objects.create(student=s, name=f'G{j}', relationship='mother', is_primary=j == 0)
+                Enrollment.objects.create(student=s, tuition_class=cls.classes[j], start_date=date(2026, 1, 1 + j))
+        cls.student = s
+        ClassSession.objects.create(tuition_class=cls.classes[0], date=date(2026, 1, 12))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def test_pages_and_endpoints_stay_within_budget(self):
+        # many rows per page, cold cache: an N+1 or an extra query fails the request
+        urls = [
+            reverse('academic_core:index'),
+            reverse('academic_core:teacher_list'),
+            reverse('academic_core:teacher_detail', args=[self.teacher.pk]),
+            reverse('academic_core:class_list'),
+            reverse('academic_core:class_detail', args=[self.classes[0].pk]),
+            reverse('academic_core:class_create'),
+            reverse('academic_core:subject_list'),
+            reverse('academic_core:subject_detail', args=[self.subject.pk]),
+            reverse('academic_core:subjectassign_list'),
+            reverse('academic_core:student_list'),
+            reverse('academic_core:student_detail', args=[self.student.pk]),
+            reverse('academic_core:student_update', args=[self.student.pk]),
+            reverse('academic_core:enrollment_create'),
+        ] + [f'/api/v1/{name}/' for name in ('teachers', 'classes', 'students', 'guardians', 'enrollments')]
+        for url in urls:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200, url)
+            self.assertIn('X-Query-Count', resp)
+
+    def test_over_budget_raises_or_logs(self):
+        url = reverse('academic_core:student_list')
+        with mock.patch.object(tv.StudentListView, 'query_budget', 2):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'budget is 2'):
+                self.client.get(url)
+            with self.settings(QUERY_BUDGET_MODE='log'), self.assertLogs('academic_core.querybudget', 'WARNING'):
+                self.client.get(url)
+
+    def test_budget_lookup(self):
+        view = tv.StudentCreateView.as_view()
+        self.assertEqual(budget_for(view, 'GET'), 5)
+        self.assertIsNone(budget_for(view, 'POST'))
+        self.assertEqual(budget_for(StudentViewSet.as_view({'get': 'list'}), 'GET'), 6)
+        self.assertIsNone(budget_for(StudentViewSet.as_view({'post': 'create'}), 'POST'))
+        self.assertEqual(budget_for(tv.index, 'GET'), 6)
+
+    def test_helper_reports_repeated_query_shapes(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'possible N+1, run 5 times'):
+            with assert_query_budget():
+                for e in Enrollment.objects.filter(tuition_class=self.classes[0]):
+                    e.student.reg_no
+
+        with assert_query_budget(1) as recorder:
+            list(Enrollment.objects.filter(tuition_class=self.classes[0]).select_related('student'))
+        self.assertEqual(len(recorder.queries), 1)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', QUERY_BUDGET_REPEAT_LIMIT=3)
+class QueryBudgetWriteTest(TransactionTestCase):
+    # real commits, so on_commit work (search index, table versions) runs inside the request
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('boss', password='x', role=User.ROLE_ADMIN))
+
+    def test_student_create_with_guardians(self):
+        data = {
+            'reg_no': '', 'first_name': 'Nimal', 'last_name': 'Perera', 'gender': 'male',
+            'joined_date': '2026-01-05', 'is_active': 'on',
+            'guardians-TOTAL_FORMS': '3', 'guardians-INITIAL_FORMS': '0',
+            'guardians-MIN_NUM_FORMS': '0', 'guardians-MAX_NUM_FORMS': '1000',
+        }
+        for i, relationship in enumerate(('mother', 'father', 'guardian')):
+            data.update({f'guardians-{i}-name': f'Guardian {i}', f'guardians-{i}-relationship': relationship})
+        resp = self.client.post(reverse('academic_core:student_create'), data)
+        self.assertEqual(resp.status_code, 302)
+        student = Student.objects.get(first_name='Nimal')
+        self.assertEqual(student.guardians.count(), 3)
+        self.assertEqual(student.guardians.filter(is_primary=True).count(), 1)
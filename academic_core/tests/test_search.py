@@ -0,0 +1,61 @@
+# academic_core/tests/test_search.py
+from unittest import mock
+
+from django.test import TestCase
+
+from academic_core import search
+from academic_core.models import Student, Guardian, SearchEntry
+from academic_core.search import phonetic_key
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.create_students()
+
+    @classmethod
+    def create_students(cls):
+        cls.nimal = Student.objects.create(reg_no='S001', first_name='Nimal', last_name='Perera',
+                                           phone='077 123 4567')
+        cls.kamala = Student.objects.create(reg_no='S002', first_name='Kamala', last_name='Silva')
+        cls.mother = Guardian.objects.create(student=cls.kamala, name='Sunethra Silva', relationship='mother',
+                                             phone='+94 71 555 9876')
+
+    def search(self, q, **params):
+        resp = self.client.get('/api/v1/search/', {'q': q, **params})
+        self.assertEqual(resp.status_code, 200)
+        return [(r['kind'], r['reg_no']) for r in resp.json()['results']]
+
+    def test_phonetic_key_folds_spelling_variants(self):
+        self.assertEqual(phonetic_key('perera'), phonetic_key('pereira'))
+        self.assertEqual(phonetic_key('nimal'), phonetic_key('nimel'))
+
+    def test_prefix_fuzzy_and_phone_suffix(self):
+        self.assertEqual(self.search('nim'), [('student', 'S001')])
+        self.assertEqual(self.search('Nimel Pereira'), [('student', 'S001')])
+        self.assertEqual(self.search('4567'), [('student', 'S001')])
+        self.assertEqual(self.search('9876'), [('guardian', 'S002')])
+        self.assertEqual(self.search('s00', kind='guardian'), [('guardian', 'S002')])
+
+    def test_index_follows_model_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kamala.reg_no = 'S099'
+            self.kamala.save()
+        self.assertEqual(sorted(self.search('silva')), [('guardian', 'S099'), ('student', 'S099')])
+
+        self.mother.delete()
+        self.assertEqual(self.search('sunethra'), [])
+        self.kamala.delete()
+        self.assertFalse(SearchEntry.objects.filter(student_id=self.kamala.pk).exists())
+
+    def test_a_transaction_is_indexed_once(self):
+        with mock.patch.object(search, 'index_students', wraps=search.index_students) as index:
+            with self.captureOnCommitCallbacks(execute=True):
+                amal = Student.objects.create(reg_no='S003', first_name='Amal', last_name='Fernando')
+                Guardian.objects.create(student=amal, name='Rohan Fernando', relationship='father')
+                Guardian.objects.create(student=amal, name='Mala Fernando', relationship='mother')
+                self.assertFalse(SearchEntry.objects.filter(student=amal).exists())
+        index.assert_called_once_with({amal.pk})
+        self.assertEqual(SearchEntry.objects.filter(student=amal).count(), 3)
+        self.assertEqual(self.search('rohan'), [('guardian', 'S003')])
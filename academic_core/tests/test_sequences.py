@@ -0,0 +1,110 @@
+# academic_core/tests/test_sequences.py
+import io
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from academic_core import sequences
+from academic_core.imports import import_students
+from academic_core.models import Student, Subject, TuitionClass, IdSequence
+
+User = get_user_model()
+
+DAY = date(2026, 3, 1)
+
+
+class SequenceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Student.objects.create(reg_no='STU-2026-00041', first_name='A', last_name='B')
+        Student.objects.create(reg_no='STU-2025-00099', first_name='C', last_name='D')
+        Student.objects.create(reg_no='LEGACY-7', first_name='E', last_name='F')
+
+    def test_first_reservation_continues_after_existing_ids(self):
+        self.assertEqual(sequences.peek('student', today=DAY), 'STU-2026-00042')
+        self.assertEqual(sequences.next_id('student', today=DAY), 'STU-2026-00042')
+        self.assertEqual(sequences.next_id('student', today=DAY), 'STU-2026-00043')
+        # {year} scopes the counter
+        self.assertEqual(sequences.next_id('student', today=date(2027, 1, 2)), 'STU-2027-00001')
+        self.assertEqual(IdSequence.objects.get(key='student:STU-2026-{n:05d}').next_value, 44)
+
+    def test_batch_reservation_costs_the_same_as_one(self):
+        sequences.next_id('student', today=DAY)  # seed
+        # savepoint, UPDATE, read back, collision check, release
+        with self.assertNumQueries(5):
+            ids = sequences.reserve('student', 500, today=DAY)
+        self.assertEqual(len(ids), 500)
+        self.assertEqual((ids[0], ids[-1]), ('STU-2026-00043', 'STU-2026-00542'))
+
+    def test_hand_entered_ids_are_skipped(self):
+        self.assertEqual(sequences.next_id('student', today=DAY), 'STU-2026-00042')
+        Student.objects.create(reg_no='STU-2026-00044', first_name='G', last_name='H')
+        self.assertEqual(sequences.reserve('student', 3, today=DAY),
+                         ['STU-2026-00043', 'STU-2026-00045', 'STU-2026-00046'])
+
+    @override_settings(ID_SEQUENCE_FORMATS={'class': 'G{year}/{n}', 'subject': 'SUB'})
+    def test_formats_from_settings(self):
+        self.assertEqual(sequences.next_id('class', today=DAY), 'G2026/1')
+        with self.assertRaises(sequences.SequenceError):
+            sequences.next_id('subject')
+        with self.assertRaises(sequences.SequenceError):
+            sequences.next_id('teacher')
+
+
+class SequenceViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('boss', password='x', role=User.ROLE_ADMIN)
+        TuitionClass.objects.create(class_id='C007', name='Maths')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_blank_id_is_assigned_on_save(self):
+        resp = self.client.get(reverse('academic_core:class_create'))
+        self.assertEqual(resp.context['next_id'], 'C008')
+        self.assertContains(resp, 'Next Class ID: <strong>C008</strong>')
+
+        resp = self.client.post(reverse('academic_core:subject_create'), {'subject_id': '', 'name': 'Algebra'})
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(Subject.objects.get().subject_id, 'SUB001')
+
+        # a typed ID is kept as is
+        self.client.post(reverse('academic_core:subject_create'), {'subject_id': 'X1', 'name': 'Art'})
+        self.assertTrue(Subject.objects.filter(subject_id='X1').exists())
+
+    def test_blank_reg_no_is_reserved_before_the_student_is_inserted(self):
+        data = {
+            'reg_no': '', 'first_name': 'Nimal', 'last_name': 'Perera', 'gender': 'male', 'is_active': 'on',
+            'joined_date': '2026-01-05',
+            'guardians-TOTAL_FORMS': '1', 'guardians-INITIAL_FORMS': '0',
+            'guardians-MIN_NUM_FORMS': '0', 'guardians-MAX_NUM_FORMS': '1000',
+            'guardians-0-name': 'Kamala Perera', 'guardians-0-relationship': 'mother',
+        }
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(reverse('academic_core:student_create'), data)
+        self.assertEqual(resp.status_code, 302)
+        student = Student.objects.get(first_name='Nimal')
+        self.assertEqual(student.reg_no, f'STU-{date.today().year}-00001')
+        self.assertTrue(student.guardians.get().is_primary)
+        # one INSERT already carrying the reg_no: no blank row another clerk's INSERT could collide with
+        writes = [q['sql'] for q in queries.captured_queries
+                  if q['sql'].startswith(('INSERT INTO "academic_core_student"', 'UPDATE "academic_core_student"'))]
+        self.assertEqual(len(writes), 1)
+
+    def test_import_reserves_reg_nos_in_one_batch(self):
+        body = ('reg_no,first_name,last_name,guardian_name,guardian_relationship\n'
+                ',Nimal,Perera,Kamala,mother\n'
+                ',Amal,Silva,Ruwan,father\n'
+                'S9,Kasun,Fernando,Saman,father\n')
+        result = import_students(io.StringIO(body))
+        self.assertTrue(result.written, result.errors)
+        year = date.today().year
+        self.assertEqual(
+            sorted(Student.objects.values_list('reg_no', flat=True)),
+            ['S9', f'STU-{year}-00001', f'STU-{year}-00002'],
+        )
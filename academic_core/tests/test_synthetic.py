@@ -0,0 +1,97 @@
+# academic_core/tests/test_synthetic.py
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from academic_core import synthetic
+from academic_core.models import Enrollment, Guardian, SearchEntry, Student, Teacher, TuitionClass
+
+TINY = synthetic.Volumes(teachers=4, subjects=3, classes=6, students=40, guardians=70, enrollments=120,
+                         sessions_per_class=1)
+
+
+def snapshot():
+    return (
+        list(Student.objects.order_by('reg_no').values_list('reg_no', 'first_name', 'last_name', 'phone',
+                                                          'current_class__class_id', 'is_active')),
+        list(Guardian.objects.order_by('student__reg_no', 'name', 'phone').values_list('student__reg_no', 'name')),
+        sorted(Enrollment.objects.values_list('student__reg_no', 'tuition_class__class_id', 'start_date')),
+    )
+
+
+class SeedSyntheticSchoolTest(TestCase):
+    def test_volumes_and_shape(self):
+        result = synthetic.seed_school(TINY, seed=7)
+        self.assertEqual((result.students, result.guardians, result.classes), (40, 70, 6))
+        self.assertEqual(Student.objects.count(), 40)
+        self.assertEqual(Teacher.objects.count(), 4)
+        self.assertEqual(Enrollment.objects.count(), result.enrollments)
+        self.assertGreaterEqual(result.enrollments, 100)
+        # every student has exactly one primary guardian, and is in the search index
+        self.assertFalse(Student.objects.exclude(guardians__is_primary=True).exists())
+        self.assertEqual(Guardian.objects.filter(is_primary=True).count(), 40)
+        self.assertEqual(SearchEntry.objects.count(), 40 + 70)
+        # the current class is always one of the student's enrollments
+        for student in Student.objects.exclude(current_class=None):
+            self.assertTrue(student.enrollments.filter(tuition_class=student.current_class_id).exists())
+
+    def test_same_seed_same_data(self):
+        synthetic.seed_school(TINY, seed=7)
+        first = snapshot()
+        synthetic.flush()
+        self.assertFalse(Student.objects.exists())
+        synthetic.seed_school(TINY, seed=7)
+        self.assertEqual(snapshot(), first)
+
+        synthetic.flush()
+        synthetic.seed_school(TINY, seed=8)
+        self.assertNotEqual(snapshot(), first)
+
+    def test_command_refuses_existing_data_without_flush(self):
+        out = io.StringIO()
+        args = ['--teachers', '2', '--subjects', '2', '--classes', '3', '--students', '10',
+                '--guardians', '15', '--enrollments', '20', '--sessions-per-class', '0']
+        call_command('seed_synthetic_school', *args, stdout=out)
+        self.assertIn('Seeded 10 students', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('seed_synthetic_school', *args, stdout=io.StringIO())
+        call_command('seed_synthetic_school', *args, '--flush', stdout=io.StringIO())
+        self.assertEqual(Student.objects.count(), 10)
+        self.assertEqual(TuitionClass.objects.count(), 3)
+
+
+class RunBenchmarksTest(TestCase):
+    def test_suite_runs_saves_and_compares_without_changing_data(self):
+        synthetic.seed_school(TINY, seed=1)
+        before = snapshot()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            out = io.StringIO()
+            call_command('run_benchmarks', '--repeat', '1', '--warmup', '0', '--json', path, stdout=out)
+            with open(path) as fh:
+                result = json.load(fh)
+            for name in ('student_list', 'student_detail', 'api_students_list', 'api_enrollments_list',
+                         'search_name', 'teacher_delete_reassign', 'class_delete_reassign',
+                         'student_create_with_guardians'):
+                self.assertIn(name, result['cases'])
+                self.assertGreater(result['cases'][name]['queries'], 0)
+            self.assertEqual(result['counts']['student'], 40)
+
+            out = io.StringIO()
+            call_command('run_benchmarks', '--repeat', '1', '--only', 'api_*', '--compare', path, stdout=out)
+            self.assertIn('ratio', out.getvalue())
+            self.assertNotIn('student_detail', out.getvalue())
+
+        # deletes and creates were rolled back, and the benchmark user is gone
+        self.assertEqual(snapshot(), before)
+        self.assertFalse(get_user_model().objects.filter(username='benchmark-admin').exists())
+
+    def test_empty_database_is_an_error(self):
+        with self.assertRaises(CommandError):
+            call_command('run_benchmarks', stdout=io.StringIO())
@@ -0,0 +1,47 @@
+# academic_core/tests/test_views.py
+from django.test import TestCase
+from django.urls import reverse
+from academic_core.models import Teacher, TuitionClass, Student, Enrollment
+
+
+class ListViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Teacher.objects.create(first_name='John', last_name='Doe')
+        cls.c1 = TuitionClass.objects.create(class_id='C1', name='Maths', class_teacher=cls.teacher)
+        cls.c2 = TuitionClass.objects.create(class_id='C2', name='Science', active=False)
+        for i in range(30):
+            s = Student.objects.create(
+                reg_no=f'S{i:03d}', first_name='Stu', last_name=f'N{i:03d}',
+                current_class=cls.c1 if i < 20 else cls.c2, is_active=i % 2 == 0,
+            )
+            Enrollment.objects.create(student=s, tuition_class=cls.c1, active=i < 5)
+
+    def test_student_list_is_paginated(self):
+        resp = self.client.get(reverse('academic_core:student_list'))
+        self.assertEqual(len(resp.context['students']), 25)
+        self.assertTrue(resp.context['is_paginated'])
+
+        resp = self.client.get(reverse('academic_core:student_list'), {'page': 2})
+        self.assertEqual([s.reg_no for s in resp.context['students']], [f'S{i:03d}' for i in range(25, 30)])
+
+    def test_student_list_filter_search_and_sort(self):
+        url = reverse('academic_core:student_list')
+        resp = self.client.get(url, {'class': self.c2.pk, 'is_active': '1', 'sort': '-reg_no'})
+        self.assertEqual([s.reg_no for s in resp.context['students']], ['S028', 'S026', 'S024', 'S022', 'S020'])
+        self.assertIn('sort=-reg_no', resp.context['page_query'])
+
+        resp = self.client.get(url, {'q': 'N007'})
+        self.assertEqual([s.reg_no for s in resp.context['students']], ['S007'])
+
+    def test_invalid_params_are_ignored(self):
+        resp = self.client.get(reverse('academic_core:student_list'),
+                               {'class': 'abc', 'sort': 'password', 'per_page': '7'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context['students']), 25)
+
+    def test_class_list_counts_come_from_one_query(self):
+        with self.assertNumQueries(3):  # table versions, COUNT for the paginator, the annotated page
+            resp = self.client.get(reverse('academic_core:class_list'))
+        counts = {c.class_id: (c.student_count, c.enrollment_count) for c in resp.context['classes']}
+        self.assertEqual(counts, {'C1': (20, 5), 'C2': (10, 0)})
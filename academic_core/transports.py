@@ -0,0 +1,57 @@
+# academic_core/transports.py
+"""
+Message transports used by notification receivers (WhatsApp / SMS / email).
+
+Pick one with settings.NOTIFICATION_TRANSPORT (dotted path). Receivers call
+get_transport().send(...) and never talk to a provider directly, so tests and
+local development can swap in LocalMemoryTransport.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class BaseTransport:
+    def send(self, channel, to, body, dedupe_key=None):
+        """
+        Deliver one message. `channel` is 'whatsapp' / 'sms' / 'email'.
+        Raise on failure so the outbox worker retries; `dedupe_key` is stable
+        across retries so a provider-side idempotency key can be derived from it.
+        """
+        raise NotImplementedError
+
+
+class LoggingTransport(BaseTransport):
+    """Default: write the message to the log instead of sending it."""
+
+    def send(self, channel, to, body, dedupe_key=None):
+        logger.info("notification [%s] to %s: %s", channel, to, body)
+
+
+class LocalMemoryTransport(BaseTransport):
+    """
+    Fake transport for tests: keeps messages in LocalMemoryTransport.sent
+    (like django.core.mail's locmem backend). Call reset() between tests.
+    """
+    sent = []
+    _lock = threading.Lock()
+
+    def send(self, channel, to, body, dedupe_key=None):
+        with self._lock:
+            LocalMemoryTransport.sent.append({
+                'channel': channel, 'to': to, 'body': body, 'dedupe_key': dedupe_key,
+            })
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls.sent = []
+
+
+def get_transport():
+    path = getattr(settings, 'NOTIFICATION_TRANSPORT', 'academic_core.transports.LoggingTransport')
+    return import_string(path)()
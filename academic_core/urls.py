@@ -3,11 +3,15 @@ from django.urls import path, include
 from . import templates_views as tv
 from rest_framework import routers
 from . import views as api_views
+from . import metrics
+from . import async_views
 
 app_name = 'academic_core'
 
 urlpatterns = [
     path('', tv.index, name='index'),
+    path('dashboard/stats/', tv.dashboard_stats, name='dashboard_stats'),
+    path('metrics', metrics.metrics_view, name='metrics'),
 
     # -----------------------
     # TEACHERS
@@ -58,6 +62,11 @@ urlpatterns = [
     # ENROLLMENT (ADMIN ONLY)
     # -----------------------
     path('enrollments/create/', tv.EnrollmentCreateView.as_view(), name='enrollment_create'),
+
+    # -----------------------
+    # EXPORTS (STAFF / ADMIN)
+    # -----------------------
+    path('exports/<slug:name>/', tv.export_data, name='export_data'),
 ]
 
 # ---------------------------------------------------------
@@ -71,7 +80,23 @@ router.register(r'subject-assignments', api_views.SubjectAssignmentViewSet)
 router.register(r'students', api_views.StudentViewSet)
 router.register(r'guardians', api_views.GuardianViewSet)
 router.register(r'enrollments', api_views.EnrollmentViewSet)
+router.register(r'sessions', api_views.ClassSessionViewSet)
+router.register(r'attendance', api_views.AttendanceViewSet)
 
 urlpatterns += [
+    path('api/v1/search/', api_views.SearchView.as_view(), name='api_search'),
     path('api/v1/', include(router.urls)),
 ]
+
+# ---------------------------------------------------------
+# ASYNC READ API (async ORM; see async_views.py)
+# ---------------------------------------------------------
+urlpatterns += [
+    path('api/async/students/', async_views.student_list, name='async_student_list'),
+    path('api/async/students/<int:pk>/', async_views.student_detail, name='async_student_detail'),
+    path('api/async/classes/', async_views.class_list, name='async_class_list'),
+    path('api/async/classes/<int:pk>/', async_views.class_detail, name='async_class_detail'),
+    path('api/async/enrollments/', async_views.enrollment_list, name='async_enrollment_list'),
+    path('api/async/dashboard/stats/', async_views.dashboard_stats, name='async_dashboard_stats'),
+    path('api/async/events/', async_views.event_stream, name='async_event_stream'),
+]
@@ -1,23 +1,57 @@
 # academic_core/views.py
-from rest_framework import viewsets, permissions, filters
+from datetime import date
+
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.db.models import Prefetch
 
+from accounts.permissions import IsStaffOrAdmin
+
 from .models import (
     Teacher, TuitionClass, Subject, SubjectAssignment,
-    Student, Guardian, Enrollment
+    Student, Guardian, Enrollment, ClassSession, Attendance
 )
 from .serializers import (
     TeacherSerializer, TuitionClassSerializer, SubjectSerializer,
     SubjectAssignmentSerializer, StudentSerializer, GuardianSerializer,
-    EnrollmentSerializer
+    EnrollmentSerializer, ClassSessionSerializer, AttendanceSerializer,
+    CardScanBatchSerializer, GuardianBulkSerializer, EnrollmentBulkSerializer
 )
+from .pagination import PaginationModeMixin
+from .fieldsets import SparseFieldsetMixin
+from .fastpath import FastListMixin
+from .conditional import ConditionalGetMixin
+from .bulk import BulkMixin
+from .querybudget import query_budget
+from . import attendance as attendance_service
+from . import search as search_index
 
 
 # Shared filter backends used by many viewsets
 COMMON_FILTER_BACKENDS = [filters.SearchFilter, filters.OrderingFilter]
 
+def _query_filters(request, params):
+    """{lookup: parsed value} for the `params` ({?param: (lookup, parser)}) given; 400 on a bad value."""
+    lookups = {}
+    for param, (lookup, parse) in params.items():
+        value = request.query_params.get(param)
+        if value:
+            try:
+                lookups[lookup] = parse(value)
+            except ValueError:
+                raise ValidationError({param: [f'Invalid value: {value!r}.']})
+    return lookups
+
+
+# @query_budget: session + user + table versions + the page (+ prefetches); list
+# budgets include the COUNT of ?page= offset pagination (see querybudget.py)
+
 
-class TeacherViewSet(viewsets.ModelViewSet):
+@query_budget({'list': 5, 'retrieve': 4})
+class TeacherViewSet(PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Teacher viewset.
     - searchable by first_name / last_name / email
@@ -30,12 +64,13 @@ class TeacherViewSet(viewsets.ModelViewSet):
     ordering_fields = ('last_name', 'first_name', 'id')
 
 
-class TuitionClassViewSet(viewsets.ModelViewSet):
+@query_budget({'list': 5, 'retrieve': 4})
+class TuitionClassViewSet(PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     """
-    TuitionClass viewset. Uses select_related on class_teacher so
-    TuitionClassSerializer's nested teacher fields are available without extra queries.
+    TuitionClass viewset. class_teacher is joined only when the nested
+    teacher is rendered (see SparseFieldsetMixin).
     """
-    queryset = TuitionClass.objects.select_related('class_teacher').all()
+    queryset = TuitionClass.objects.all()
     serializer_class = TuitionClassSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = COMMON_FILTER_BACKENDS
@@ -43,7 +78,8 @@ class TuitionClassViewSet(viewsets.ModelViewSet):
     ordering_fields = ('class_id', 'name')
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+@query_budget({'list': 5, 'retrieve': 4})
+class SubjectViewSet(PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Subject viewset.
     """
@@ -55,11 +91,13 @@ class SubjectViewSet(viewsets.ModelViewSet):
     ordering_fields = ('subject_id', 'name')
 
 
-class SubjectAssignmentViewSet(viewsets.ModelViewSet):
+@query_budget({'list': 5, 'retrieve': 4})
+class SubjectAssignmentViewSet(PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     """
-    SubjectAssignment viewset. Prefetch teacher + subject for compact nested serializers.
+    SubjectAssignment viewset. teacher + subject are joined for the nested serializers
+    unless collapsed with ?expand= / dropped with ?fields= / ?omit=.
     """
-    queryset = SubjectAssignment.objects.select_related('teacher', 'subject').all()
+    queryset = SubjectAssignment.objects.all()
     serializer_class = SubjectAssignmentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = COMMON_FILTER_BACKENDS
@@ -67,14 +105,14 @@ class SubjectAssignmentViewSet(viewsets.ModelViewSet):
     ordering_fields = ('start_date', 'assign_id')
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+@query_budget({'list': 6, 'retrieve': 5})
+class StudentViewSet(PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     """
-    Student viewset. Prefetch guardians and select_related current_class so nested fields
-    in StudentSerializer are efficient.
+    Student viewset. guardians are prefetched and current_class__class_teacher joined
+    only when those nested fields are part of the response.
+    e.g. the card-marking client: ?fields=id,reg_no,first_name,last_name (no joins)
     """
-    queryset = Student.objects.select_related('current_class__class_teacher') \
-                              .prefetch_related('guardians') \
-                              .all()
+    queryset = Student.objects.all()
     serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = COMMON_FILTER_BACKENDS
@@ -82,25 +120,135 @@ class StudentViewSet(viewsets.ModelViewSet):
     ordering_fields = ('reg_no', 'first_name', 'last_name')
 
 
-class GuardianViewSet(viewsets.ModelViewSet):
+@query_budget({'list': 5, 'retrieve': 4})
+class GuardianViewSet(BulkMixin, PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin,
+                      viewsets.ModelViewSet):
     """
     Guardian viewset.
+    Cursor pages walk `name` rather than Meta.ordering: leading with the
+    is_primary boolean would make every cursor an offset scan.
+    - POST / PATCH / DELETE bulk/  batches for the sync client (see bulk.py)
     """
-    queryset = Guardian.objects.select_related('student').all()
+    queryset = Guardian.objects.all()
     serializer_class = GuardianSerializer
+    bulk_serializer_class = GuardianBulkSerializer
+    cursor_ordering = ('name',)
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = COMMON_FILTER_BACKENDS
     search_fields = ('name', 'phone', 'email', 'student__reg_no')
     ordering_fields = ('name',)
 
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+@query_budget({'list': 6, 'retrieve': 5})
+class EnrollmentViewSet(BulkMixin, PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin,
+                        viewsets.ModelViewSet):
     """
-    Enrollment viewset. Use select_related for student and tuition_class to support nested serializer.
+    Enrollment viewset. The nested student / tuition_class trees are the
+    heaviest in the API; ?expand=student or ?fields=id,student.reg_no keep
+    both the joins and the payload down to what is asked for.
+    - POST / PATCH / DELETE bulk/  batches by student / class id (see bulk.py)
     """
-    queryset = Enrollment.objects.select_related('student', 'tuition_class').all()
+    queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
+    bulk_serializer_class = EnrollmentBulkSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = COMMON_FILTER_BACKENDS
     search_fields = ('student__reg_no', 'tuition_class__class_id')
     ordering_fields = ('start_date',)
+
+
+@query_budget({'list': 5, 'retrieve': 4})
+class ClassSessionViewSet(PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
+    """
+    ClassSession viewset (card-mark staff + admins).
+    - POST {id}/mark/  batch of card scans -> one upsert, one attendance_recorded signal
+    - POST {id}/close/ marks everyone not scanned as absent
+    """
+    queryset = ClassSession.objects.all()
+    serializer_class = ClassSessionSerializer
+    permission_classes = [IsStaffOrAdmin]
+    filter_backends = COMMON_FILTER_BACKENDS
+    search_fields = ('tuition_class__class_id', 'topic')
+    ordering_fields = ('date', 'start_time')
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**_query_filters(self.request, {
+            'tuition_class': ('tuition_class_id', int),
+            'date': ('date', date.fromisoformat),
+        }))
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=['post'])
+    def mark(self, request, pk=None):
+        session = self.get_object()
+        if session.is_closed:
+            return Response({'detail': 'Session is closed.'}, status=status.HTTP_409_CONFLICT)
+        batch = CardScanBatchSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        recorded, rejected = attendance_service.record_scans(
+            session, batch.validated_data['scans'], marked_by=request.user
+        )
+        return Response({'session': session.pk, 'recorded': len(recorded), 'rejected': rejected})
+
+    @action(detail=True, methods=['post'])
+    def close(self, request, pk=None):
+        session = self.get_object()
+        absent = attendance_service.close_session(session, marked_by=request.user)
+        return Response({'session': session.pk, 'absent': len(absent)})
+
+
+@query_budget({'list': 5, 'retrieve': 4})
+class AttendanceViewSet(PaginationModeMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only attendance log; writes go through ClassSessionViewSet.mark.
+    Filter with ?session= or ?student=.
+    """
+    queryset = Attendance.objects.all()
+    serializer_class = AttendanceSerializer
+    permission_classes = [IsStaffOrAdmin]
+    cursor_ordering = ('marked_at',)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**_query_filters(self.request, {
+            'session': ('session_id', int),
+            'student': ('student_id', int),
+        }))
+
+
+@query_budget(4)
+class SearchView(APIView):
+    """
+    GET /api/v1/search/?q=<text>[&kind=student|guardian][&limit=20]
+
+    Prefix, sound-alike name and phone-suffix search over students and
+    guardians (see academic_core/search.py). Each hit carries the student
+    it belongs to so the front desk can jump straight to the record.
+    """
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    max_limit = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        kind = request.query_params.get('kind')
+        if kind not in (None, 'student', 'guardian'):
+            return Response({'detail': "kind must be 'student' or 'guardian'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            limit = 20
+        hits = search_index.search(query, kind=kind, limit=max(limit, 1))
+        return Response({
+            'query': query,
+            'results': [
+                {
+                    'kind': e.kind,
+                    'id': e.object_id,
+                    'student_id': e.student_id,
+                    'reg_no': e.reg_no,
+                    'name': e.title,
+                }
+                for e in hits
+            ],
+        })
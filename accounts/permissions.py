@@ -0,0 +1,14 @@
+# accounts/permissions.py
+from rest_framework.permissions import BasePermission
+
+
+class IsStaffOrAdmin(BasePermission):
+    """
+    DRF counterpart of decorators.staff_or_admin_required:
+    card-mark staff and admins only (read and write).
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.is_admin or user.is_staff_user))
+
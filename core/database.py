@@ -0,0 +1,81 @@
+# core/database.py
+"""
+DATABASES['default'] built from the environment (used by core/settings.py).
+
+    DJANGO_DB_ENGINE=sqlite (default)
+        DJANGO_SQLITE_PATH          database file (default: BASE_DIR/db.sqlite3)
+        DJANGO_SQLITE_BUSY_TIMEOUT  seconds a writer waits for the lock (default 20)
+        DJANGO_SQLITE_MMAP_MB       memory-mapped I/O size (default 128, 0 = off)
+
+    DJANGO_DB_ENGINE=postgres
+        DJANGO_DB_NAME / _USER / _PASSWORD / _HOST / _PORT
+        DJANGO_DB_CONN_MAX_AGE      persistent connection lifetime in s (default 60)
+        DJANGO_DB_POOL=1            psycopg connection pool instead of persistent
+                                    connections (needs `pip install "psycopg[pool]"`)
+        DJANGO_DB_POOL_MIN / _MAX   pool size (default 2 / 10)
+
+SQLite runs every connection with WAL (readers no longer block the writer),
+synchronous=NORMAL (fsync at checkpoints, still crash safe in WAL mode),
+a busy timeout and mmap reads, and starts write transactions IMMEDIATE so a
+transaction that reads then writes queues for the lock up front instead of
+failing with "database is locked" when it tries to upgrade.
+"""
+import os
+
+ENGINES = ('sqlite', 'postgres')
+
+
+def _int(env, name, default):
+    value = env.get(name, '')
+    return int(value) if value.strip() else default
+
+
+def sqlite_config(base_dir, env=os.environ):
+    busy_timeout = _int(env, 'DJANGO_SQLITE_BUSY_TIMEOUT', 20)
+    mmap_bytes = _int(env, 'DJANGO_SQLITE_MMAP_MB', 128) * 1024 * 1024
+    pragmas = [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA busy_timeout={busy_timeout * 1000}',
+        f'PRAGMA mmap_size={mmap_bytes}',
+        'PRAGMA temp_store=MEMORY',
+    ]
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': env.get('DJANGO_SQLITE_PATH') or base_dir / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': busy_timeout,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': '; '.join(pragmas),
+        },
+    }
+
+
+def postgres_config(env=os.environ):
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env.get('DJANGO_DB_NAME', 'tuition_sms'),
+        'USER': env.get('DJANGO_DB_USER', ''),
+        'PASSWORD': env.get('DJANGO_DB_PASSWORD', ''),
+        'HOST': env.get('DJANGO_DB_HOST', ''),
+        'PORT': env.get('DJANGO_DB_PORT', ''),
+        'CONN_MAX_AGE': _int(env, 'DJANGO_DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    if env.get('DJANGO_DB_POOL', '') in ('1', 'true', 'yes'):
+        # the pool owns connection lifetimes; Django requires CONN_MAX_AGE = 0 with it
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': _int(env, 'DJANGO_DB_POOL_MIN', 2),
+            'max_size': _int(env, 'DJANGO_DB_POOL_MAX', 10),
+            'timeout': 10,
+        }
+    return config
+
+
+def database_config(base_dir, env=os.environ):
+    engine = env.get('DJANGO_DB_ENGINE', 'sqlite')
+    if engine not in ENGINES:
+        raise ValueError(f"DJANGO_DB_ENGINE must be one of {', '.join(ENGINES)}, not {engine!r}")
+    return sqlite_config(base_dir, env) if engine == 'sqlite' else postgres_config(env)
@@ -0,0 +1,26 @@
+# core/logformat.py
+"""
+JSON log lines for LOGGING (DJANGO_LOG_FORMAT=json): one object per record
+with time, level, logger, message and any `extra={...}` fields, e.g. the
+per-request line from academic_core/metrics.py.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+
+# attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((k, v) for k, v in vars(record).items() if k not in _RECORD_ATTRS)
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
@@ -1,8 +1,10 @@
 # core/notifications.py
+# Don't call .send() on these from request code: queue them with
+# academic_core.outbox.enqueue() and let run_notification_worker deliver.
 from django.dispatch import Signal
 
-fee_due = Signal()  # payload: {'student_id', 'amount', 'due_date'}
-attendance_alert = Signal()  # payload: {'student_id','session_id','status'}
+fee_due = Signal()  # payload: {'period','due_date','invoice_ids'} - one send per billing run
+attendance_alert = Signal()  # payload: {'session_id','student_ids','status'} - one send per batch
 subject_assigned = Signal()  # payload: {'teacher_id','subject_id','assignment_id'}
-session_created = Signal()
-attendance_recorded = Signal()
+session_created = Signal()  # payload: {'session_id','class_id','date'}
+attendance_recorded = Signal()  # payload: {'session_id','student_ids'} - one send per batch
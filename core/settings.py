@@ -7,6 +7,8 @@ Generated by 'django-admin startproject' using Django 6.0.
 from pathlib import Path
 import os
 
+from .database import database_config
+
 # ---------------------------------------------------------
 # BASE DIRECTORY
 # ---------------------------------------------------------
@@ -47,8 +49,14 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 # ---------------------------------------------------------
 MIDDLEWARE = [
+    # outermost, so its wall time covers every other middleware (academic_core/metrics.py)
+    'academic_core.metrics.RequestMetricsMiddleware',
+
     'django.middleware.security.SecurityMiddleware',
 
+    # per-request query counts / N+1 detection; unloaded when QUERY_BUDGET_MODE is 'off'
+    'academic_core.querybudget.QueryBudgetMiddleware',
+
     # Uncomment these 2 lines if you deploy with Whitenoise later:
     # 'whitenoise.middleware.WhiteNoiseMiddleware',
 
@@ -95,11 +103,47 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # ---------------------------------------------------------
 # DATABASE
 # ---------------------------------------------------------
+# DJANGO_DB_ENGINE=sqlite (default, WAL-tuned) or postgres (persistent or
+# pooled connections); see core/database.py for the other variables and
+# `manage.py check_database` to verify / benchmark the active profile.
 DATABASES = {
+    'default': database_config(BASE_DIR),
+}
+
+
+# ---------------------------------------------------------
+# CACHE (academic_core/caching.py)
+# ---------------------------------------------------------
+# DJANGO_CACHE_BACKEND picks the backend:
+#   locmem : per-process memory (default; fine for runserver / a single worker)
+#   file   : files under DJANGO_CACHE_LOCATION, shared by every worker on the host
+#   db     : a table in the default database (run `manage.py createcachetable` once)
+# Invalidation is by per-model key generations stored in the cache itself, so
+# deployments with several worker processes need 'file' or 'db'.
+CACHE_BACKEND = os.environ.get('DJANGO_CACHE_BACKEND', 'locmem')
+
+_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tuition-sms',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'academic_core_cache',
+    },
+}
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        **_CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': 300,
+        'KEY_PREFIX': 'sms',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
 }
 
 
@@ -143,6 +187,12 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Profile photo derivatives (academic_core/images.py): size name -> longest edge in px.
+# Built when a photo is uploaded and stored under MEDIA_ROOT/derivatives/.
+IMAGE_DERIVATIVE_SIZES = {'thumb': 64, 'small': 160, 'medium': 480}
+IMAGE_DERIVATIVE_FORMAT = 'webp'  # or 'jpeg'
+IMAGE_DERIVATIVE_QUALITY = 80
+
 
 # ---------------------------------------------------------
 # CUSTOM USER MODEL
@@ -160,9 +210,138 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
     ],
+    # Keyset pagination on every viewset; ?page=N switches to offset pagination
+    # (see academic_core/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'academic_core.pagination.ModelOrderedCursorPagination',
+    'PAGE_SIZE': 50,
+}
+
+# Upper bound for ?page_size= on API list endpoints
+API_MAX_PAGE_SIZE = 500
+
+# Items per request on the bulk/ endpoints (academic_core/bulk.py)
+API_BULK_MAX_ITEMS = 500
+
+# Serve API list actions from .values() rows instead of serializer instances
+# (academic_core/fastpath.py); output is identical, set False to compare / debug
+API_FAST_LIST = True
+
+
+# ---------------------------------------------------------
+# REQUEST METRICS (academic_core/metrics.py, scraped at /metrics)
+# ---------------------------------------------------------
+METRICS_ENABLED = True
+# Server-Timing header with total / db / serialize durations on every response
+METRICS_SERVER_TIMING = True
+# the recent-latency summary on /metrics covers this many seconds
+METRICS_WINDOW_SECONDS = 300
+# requests slower than this are logged at WARNING (others at INFO)
+METRICS_SLOW_REQUEST_MS = 1000
+# lets a Prometheus scraper read /metrics with `Authorization: Bearer <token>`;
+# without it the endpoint needs an admin session
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN', '')
+
+
+# ---------------------------------------------------------
+# LOGGING
+# ---------------------------------------------------------
+# DJANGO_LOG_FORMAT=json writes one JSON object per line (core/logformat.py),
+# including the per-request fields from academic_core.requests. That logger
+# only reports slow requests unless DJANGO_REQUEST_LOG_LEVEL=INFO.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+        'json': {'()': 'core.logformat.JsonFormatter'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': os.environ.get('DJANGO_LOG_FORMAT', 'plain'),
+        },
+    },
+    'loggers': {
+        'academic_core': {'handlers': ['console'], 'level': os.environ.get('DJANGO_LOG_LEVEL', 'WARNING')},
+        'academic_core.requests': {
+            'handlers': ['console'],
+            'level': os.environ.get('DJANGO_REQUEST_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+        'accounts': {'handlers': ['console'], 'level': os.environ.get('DJANGO_LOG_LEVEL', 'WARNING')},
+    },
+}
+
+
+# ---------------------------------------------------------
+# QUERY BUDGETS (academic_core/querybudget.py)
+# ---------------------------------------------------------
+# 'off' | 'log' | 'raise'. CI runs the suite with DJANGO_QUERY_BUDGET=raise so
+# a view over its @query_budget or running an N+1 fails the build.
+QUERY_BUDGET_MODE = os.environ.get('DJANGO_QUERY_BUDGET', 'log' if DEBUG else 'off')
+# the same SELECT (different parameters) this many times in one request is an N+1
+QUERY_BUDGET_REPEAT_LIMIT = 3
+# budget for views that declare none (None: only the N+1 check applies)
+QUERY_BUDGET_DEFAULT = None
+
+
+# ---------------------------------------------------------
+# DASHBOARD (academic_core/dashboard.py)
+# ---------------------------------------------------------
+# Home page figures are cached and dropped by signals on every relevant write;
+# the timeout only bounds staleness from raw SQL / writes that skip signals
+DASHBOARD_CACHE_TIMEOUT = 3600
+
+
+# ---------------------------------------------------------
+# GENERATED IDS (academic_core/sequences.py)
+# ---------------------------------------------------------
+# Left blank on the create forms / in an import file, these IDs are assigned
+# from a per-series counter. {n} is the counter (format spec allowed), {year}
+# the current year (the counter restarts each year when it is used).
+ID_SEQUENCE_FORMATS = {
+    'student': 'STU-{year}-{n:05d}',
+    'class': 'C{n:03d}',
+    'subject': 'SUB{n:03d}',
+    'assignment': 'ASG{n:04d}',
 }
 
 
+# ---------------------------------------------------------
+# BILLING (academic_core/billing.py)
+# ---------------------------------------------------------
+# Invoices fall due this many days after the first of the billed month
+BILLING_DUE_DAYS = 10
+# 'term' fee classes are billed in these months
+BILLING_TERM_START_MONTHS = (1, 5, 9)
+
+
+# ---------------------------------------------------------
+# LIVE FEED (academic_core/feed.py, SSE at /api/async/events/ under ASGI)
+# ---------------------------------------------------------
+# recent events kept per process for Last-Event-ID replay after a reconnect
+FEED_BUFFER_SIZE = 1000
+# events queued per open stream; a client further behind gets `event: reset`
+FEED_QUEUE_SIZE = 100
+# open streams per process; more get 503
+FEED_MAX_SUBSCRIBERS = 1000
+# comment line sent on an idle stream so proxies keep it open
+FEED_KEEPALIVE_SECONDS = 15
+# how often the outbox is read for attendance_recorded / session_created
+FEED_OUTBOX_POLL_SECONDS = 1.0
+
+# ---------------------------------------------------------
+# NOTIFICATIONS (outbox + `manage.py run_notification_worker`)
+# ---------------------------------------------------------
+# Where receivers deliver WhatsApp/email messages. Use
+# 'academic_core.transports.LocalMemoryTransport' in tests.
+NOTIFICATION_TRANSPORT = 'academic_core.transports.LoggingTransport'
+NOTIFICATION_MAX_ATTEMPTS = 5
+# retry delay doubles per attempt: 30s, 60s, 120s ... capped at 1h
+NOTIFICATION_RETRY_BASE_SECONDS = 30
+NOTIFICATION_RETRY_MAX_SECONDS = 3600
+
+
 # ---------------------------------------------------------
 # DEFAULT AUTO FIELD
 # ---------------------------------------------------------
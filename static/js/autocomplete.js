@@ -0,0 +1,70 @@
+// static/js/autocomplete.js
+// StudentAutocompleteWidget (academic_core/choices.py): searches the search API
+// while typing and stores the picked student's pk in the hidden input.
+(function () {
+  var DELAY_MS = 200;
+  var MIN_CHARS = 2;
+
+  function setup(box) {
+    var url = box.getAttribute('data-autocomplete-url');
+    var kind = box.getAttribute('data-autocomplete-kind');
+    var hidden = box.querySelector('[data-autocomplete-value]');
+    var input = box.querySelector('[data-autocomplete-input]');
+    var results = box.querySelector('[data-autocomplete-results]');
+    var timer = null;
+    var latest = 0;
+
+    function clear() {
+      results.innerHTML = '';
+    }
+
+    function pick(hit) {
+      hidden.value = hit.student_id;
+      input.value = hit.reg_no + ' - ' + hit.name;
+      clear();
+    }
+
+    function show(hits) {
+      clear();
+      hits.forEach(function (hit) {
+        var item = document.createElement('button');
+        item.type = 'button';
+        item.className = 'list-group-item list-group-item-action';
+        item.textContent = hit.reg_no + ' - ' + hit.name;
+        item.addEventListener('mousedown', function (e) {
+          e.preventDefault();  // keep focus so blur does not close the list first
+          pick(hit);
+        });
+        results.appendChild(item);
+      });
+    }
+
+    function search(term) {
+      var request = ++latest;
+      var query = '?limit=15&kind=' + encodeURIComponent(kind) + '&q=' + encodeURIComponent(term);
+      fetch(url + query, {credentials: 'same-origin', headers: {'Accept': 'application/json'}})
+        .then(function (resp) { return resp.json(); })
+        .then(function (body) {
+          if (request === latest) {  // ignore answers to older keystrokes
+            show(body.results || []);
+          }
+        });
+    }
+
+    input.addEventListener('input', function () {
+      hidden.value = '';
+      clearTimeout(timer);
+      var term = input.value.trim();
+      if (term.length < MIN_CHARS) {
+        clear();
+        return;
+      }
+      timer = setTimeout(function () { search(term); }, DELAY_MS);
+    });
+    input.addEventListener('blur', clear);
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('[data-autocomplete-url]').forEach(setup);
+  });
+})();
@@ -0,0 +1,37 @@
+// static/js/dashboard.js
+// Dashboard widgets: fetches Chart.js data from the dashboard stats endpoint
+// (academic_core:dashboard_stats) and draws it with vendor/chart.js (v2).
+(function () {
+  var script = document.currentScript;
+  var statsUrl = script && script.getAttribute('data-stats-url');
+  if (!statsUrl || typeof Chart === 'undefined') {
+    return;
+  }
+
+  Chart.defaults.global.defaultFontFamily = 'Nunito, -apple-system, system-ui, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif';
+  Chart.defaults.global.defaultFontColor = '#858796';
+
+  var COLORS = ['#4e73df', '#1cc88a', '#36b9cc', '#f6c23e', '#e74a3b'];
+
+  function draw(id, type, data, options) {
+    var canvas = document.getElementById(id);
+    if (!canvas) {
+      return;
+    }
+    new Chart(canvas, {type: type, data: data, options: Object.assign({maintainAspectRatio: false}, options)});
+  }
+
+  fetch(statsUrl, {credentials: 'same-origin', headers: {'Accept': 'application/json'}})
+    .then(function (resp) { return resp.json(); })
+    .then(function (stats) {
+      var perClass = stats.charts.students_per_class;
+      perClass.datasets.forEach(function (ds, i) { ds.backgroundColor = COLORS[i % COLORS.length]; });
+      draw('studentsPerClassChart', 'bar', perClass, {
+        scales: {yAxes: [{ticks: {beginAtZero: true, precision: 0}}]}
+      });
+
+      var status = stats.charts.student_status;
+      status.datasets[0].backgroundColor = [COLORS[1], COLORS[4]];
+      draw('studentStatusChart', 'doughnut', status, {cutoutPercentage: 70, legend: {position: 'bottom'}});
+    });
+})();